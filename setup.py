@@ -10,7 +10,7 @@ setup(
     description="Robot Swarm Visualization Tool",
     packages=["src"],
     author="Ben Chiddy, Hamza Amir, Jonathan Doyle",
-    install_requires=["panda3d"],
+    install_requires=["panda3d", "numpy"],
     python_requires=">=3.5",
     entry_points={"console_scripts": ["roboviz = src.main:run"]},
     long_description=desc
@@ -1,27 +1,39 @@
 """App module. For RoboViz application"""
 
 
-import sys
-import os
+import time
 import atexit
-from pathlib import Path
 
 from direct.showbase.ShowBase import ShowBase
-from panda3d.core import AntialiasAttrib
+from panda3d.core import AntialiasAttrib, loadPrcFileData
 
 from .ui.base import BaseUI
+from .ui.headless import HeadlessUI
 from .logger import Logger
 from .camera import Camera
 from .keybindings import Keybindings
 from .lights import Lights
 from .environment import Environment
+from .metrics import MetricsTable
+from .assets import AssetCache, CACHE_DIR
+from .builder import SCALE
+from .terrain import TERRAIN_MODEL
+from ..blueprint import COMPONENT_TYPES
+from ..config import data_dir
 
 __author__ = "Jonty Doyle"
 __email__ = "dyljon001@myuct.ac.za"
 __date__ = "21 September 2022"
 
-DATA_ENV = "ROBOVIZ_HOME"  # Environment Variable referring to Data Location
-DIR_NAME = ".roboviz"  # Default directory name
+# Renders offscreen, in software, when there is no display
+HEADLESS_CONFIG = """
+window-type offscreen
+load-display p3tinydisplay
+audio-library-name null
+print-pipe-types false
+notify-level-x11display fatal
+notify-level-device fatal
+"""
 
 
 class App(ShowBase):
@@ -29,18 +41,36 @@ class App(ShowBase):
     is attached. Inherits from panda3d ShowBase class (inital render)"""
 
     def __init__(self, args):
+        self.headless = getattr(args, 'headless', False)
+        if self.headless:
+            loadPrcFileData('headless', HEADLESS_CONFIG)
+
         super().__init__(self)
-        self.DATA_DIR = self.__get_data_dir()
+        self.DATA_DIR = data_dir()
         self.logger = Logger(self.DATA_DIR)
         atexit.register(self.logger.write)
 
         # Create RoboViz model manipulation objects
+        self.assets = AssetCache(self.loader, self.DATA_DIR / CACHE_DIR)
+        self.assets.preload([t.model_path for t in COMPONENT_TYPES] +
+                            [TERRAIN_MODEL])
+        self.metrics = MetricsTable(self.assets, SCALE)
         self.lights = Lights(self)
-        self.ui = BaseUI(self)
+        self.ui = HeadlessUI(self) if self.headless else BaseUI(self)
         self.camera = Camera(self)
         self.environment = Environment(self)
         self.bindings = Keybindings(self)
 
+        # Commands only return once their builds finish
+        if self.headless:
+            self.environment.incremental = False
+
+        # Traces builds, writing the last on exit
+        trace = getattr(args, 'trace', None)
+        if trace:
+            self.environment.profiler.tracing = True
+            atexit.register(self.environment.profiler.write, trace)
+
         # Set defaults
         self.__set_defaults()
 
@@ -49,26 +79,46 @@ class App(ShowBase):
         self.bindings.update()
 
     def handle_arguments(self, args):
-        # Prints currently saved models
-        parse = self.ui.console.parse
+        """Runs the commands given as arguments in the console."""
+        for command in self.__commands(args):
+            self.ui.console.parse(command)
+
+    def run_headless(self, args) -> int:
+        """Runs the commands given as arguments, printing the output and
+        time taken (including a frame) of each. Returns the exit status: 1
+        if any command failed."""
+        status = 0
+        for command in self.__commands(args):
+            start = time.perf_counter()
+            output, error = self.environment.parser.parse(command)
+            self.taskMgr.step()
+            seconds = time.perf_counter() - start
+
+            print(f'> {command}\n{output}\n[{seconds:.3f}s]', flush=True)
+            status = max(status, error)
+
+        return status
+
+    def __commands(self, args):
+        """Returns the commands (in order) given as arguments"""
+        commands = []
+        if args.workers:
+            commands.append(f'workers {args.workers}')
+
+        if args.points is not None:
+            commands.append(f'points auto {args.points}')
+        if args.no_points:
+            commands.append('points off')
 
-        if args.list:
-            [print(env) for env in self.environment.envs]
-            sys.exit(0)
         # Opens specified saved model
-        elif args.load:
-            cmd = ["load", args.load]
-            parse(" ".join(cmd))
+        if args.load:
+            commands.append(f'load {args.load}')
         # Sets model parameters if application run from command line.
         elif (args.config and args.position and args.data):
-            cmd = ["open", args.config, args.position, args.data]
-            parse(" ".join(cmd))
-        else:
-            pass
+            commands.append(f'open {args.config} {args.position} '
+                            f'{args.data}')
 
-        if args.cmd:
-            cmd = args.cmd.split(" ")
-            parse(" ".join(cmd))
+        return commands + (args.cmd or [])
 
     def __set_defaults(self):
         """Sets defaults for model rendering"""
@@ -76,21 +126,3 @@ class App(ShowBase):
         self.render.setShaderAuto()
         self.render.setAntialias(AntialiasAttrib.MLine)  # Not sure
 
-    def __get_data_dir(self) -> Path:
-        """Sets data location and returns path."""
-        if DATA_ENV in os.environ:
-            root = Path(os.environ[DATA_ENV])
-            path = root / DIR_NAME
-        else:
-            path = Path.cwd() / DIR_NAME
-
-        path = path.expanduser()
-
-        if not path.is_dir():
-            try:
-                path.mkdir(exist_ok=True)
-                print(f'Created data directory: "{path}"')
-            except FileNotFoundError as e:
-                print(e)
-
-        return path
@@ -0,0 +1,340 @@
+"""Compiles models (egg or STL) into optimised BAM files, cached on disk,
+with a decimated and a box level of detail."""
+
+import os
+import time
+from pathlib import Path
+import numpy as np
+
+# panda3d imports
+from panda3d.core import (Filename, Geom, GeomEnums, GeomNode,
+                          GeomVertexData, GeomVertexFormat, ModelRoot,
+                          NodePath, SceneGraphReducer)
+
+from ..util import file_hash
+from .geometry import box_node, mesh_node, MAX_SHORT_INDEX
+from .mesh import decimate, read_stl, to_model_frame
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+BASE_DIR = Path(__file__).parents[2]
+MODEL_DIR = BASE_DIR / 'assets' / 'models'
+CACHE_DIR = 'cache'  # Location of compiled models in the data directory
+CACHE_VERSION = 3  # Changes when compiled models change form
+
+# Models are coloured by their materials, so only need these columns
+COLUMNS = ('vertex', 'normal')
+
+# Levels of detail of a compiled model (children of its root)
+MESH_LEVELS = ('full', 'decimated', 'box')
+
+
+def unique_rows(data: GeomVertexData):
+    """Returns the unique rows of vertex data (every array, byte for byte)
+    as a list of arrays, with the index of each old row's unique row"""
+    arrays = [np.frombuffer(memoryview(data.getArray(i)), dtype=np.uint8)
+              .reshape(data.getNumRows(), -1)
+              for i in range(data.getNumArrays())]
+    rows = np.hstack(arrays)
+
+    _, first, inverse = np.unique(rows, axis=0, return_index=True,
+                                  return_inverse=True)
+    # Unique rows are kept in their original order
+    order = np.argsort(first)
+    remap = np.empty(len(order), dtype=int)
+    remap[order] = np.arange(len(order))
+    return [array[first[order]] for array in arrays], \
+        remap[inverse.reshape(-1)]
+
+
+def primitive_indices(primitive):
+    """Returns the vertex indices of a (decomposed) primitive"""
+    if not primitive.isIndexed():
+        start = primitive.getFirstVertex()
+        return np.arange(start, start + primitive.getNumVertices())
+
+    dtype = {GeomEnums.NT_uint8: np.uint8, GeomEnums.NT_uint16: np.uint16,
+             GeomEnums.NT_uint32: np.uint32}[primitive.getIndexType()]
+    return np.frombuffer(memoryview(primitive.getVertices()), dtype=dtype)
+
+
+def compact_geom(geom: Geom) -> Geom:
+    """Returns a copy of a Geom with duplicate vertices merged, as simple
+    primitives (e.g. triangles) with the smallest index type that fits"""
+    geom = geom.decompose()
+    data = geom.getVertexData()
+    arrays, remap = unique_rows(data)
+    num_rows = len(arrays[0]) if arrays else 0
+
+    compact = GeomVertexData(data.getName(), data.getFormat(),
+                             Geom.UHStatic)
+    compact.uncleanSetNumRows(num_rows)
+    for i, array in enumerate(arrays):
+        memoryview(compact.modifyArray(i)).cast('B')[:] = array.tobytes()
+
+    if num_rows <= MAX_SHORT_INDEX:
+        index_type, dtype = GeomEnums.NT_uint16, np.uint16
+    else:
+        index_type, dtype = GeomEnums.NT_uint32, np.uint32
+
+    result = Geom(compact)
+    for i in range(geom.getNumPrimitives()):
+        primitive = geom.getPrimitive(i)
+        indices = remap[primitive_indices(primitive)].astype(dtype)
+
+        copy = primitive.makeCopy()
+        copy.clearVertices()
+        copy.setIndexType(index_type)
+        vertices = copy.modifyVertices()
+        vertices.uncleanSetNumRows(len(indices))
+        memoryview(vertices).cast('B')[:] = indices.tobytes()
+        result.addPrimitive(copy)
+
+    return result
+
+
+def mesh_arrays(model: NodePath):
+    """Returns the (n, 3) vertices and (m, 3) triangles of every Geom of a
+    model, relative to the model"""
+    vertices, triangles = [], []
+    count = 0
+    for path in model.findAllMatches('**/+GeomNode'):
+        matrix = np.array(path.getMat(model), dtype=float).reshape(4, 4)
+        for geom in path.node().getGeoms():
+            geom = geom.decompose()
+            data = geom.getVertexData().convertTo(GeomVertexFormat.getV3())
+            points = np.frombuffer(memoryview(data.getArray(0)),
+                                   dtype=np.float32).reshape(-1, 3)
+            vertices.append(points @ matrix[:3, :3] + matrix[3, :3])
+
+            for primitive in geom.getPrimitives():
+                if primitive.getPrimitiveType() == GeomEnums.PT_polygons:
+                    indices = primitive_indices(primitive).reshape(-1, 3)
+                    triangles.append(indices.astype(int) + count)
+
+            count += len(points)
+
+    if not triangles:
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=int)
+
+    return np.concatenate(vertices), np.concatenate(triangles)
+
+
+def make_levels(name, full: NodePath, vertices, triangles) -> NodePath:
+    """Returns a model (a ModelRoot) with a child for each level of detail:
+    the full model, its mesh decimated and the box bounding it"""
+    root = NodePath(ModelRoot(name))
+    full.setName('full')
+    full.reparentTo(root)
+    root.attachNewNode(mesh_node('decimated', *decimate(vertices,
+                                                        triangles)))
+
+    vertices = np.asarray(vertices).reshape(-1, 3)
+    bounds = np.zeros((2, 3))
+    if len(vertices):
+        bounds = np.array([vertices.min(axis=0), vertices.max(axis=0)])
+    root.attachNewNode(box_node('box', bounds))
+    return root
+
+
+def model_memory(model: NodePath):
+    """Returns the bytes of vertex and index data of a model's Geoms"""
+    size = 0
+    for path in model.findAllMatches('**/+GeomNode'):
+        for geom in path.node().getGeoms():
+            data = geom.getVertexData()
+            size += sum(data.getArray(i).getDataSizeBytes()
+                        for i in range(data.getNumArrays()))
+            size += sum(primitive.getVertices().getDataSizeBytes()
+                        for primitive in geom.getPrimitives()
+                        if primitive.isIndexed())
+
+    return size
+
+
+def optimize(model: NodePath):
+    """Optimises a model for drawing: flattens it, drops unused vertex
+    columns and merges duplicate vertices."""
+    model.flattenStrong()
+
+    reducer = SceneGraphReducer()
+    for path in model.findAllMatches('**/+GeomNode'):
+        node: GeomNode = path.node()
+        for i in range(node.getNumGeoms()):
+            vertex_format = node.getGeom(i).getVertexData().getFormat()
+            for j in range(vertex_format.getNumColumns()):
+                name = vertex_format.getColumn(j).getName()
+                if name.getName() not in COLUMNS:
+                    reducer.removeColumn(node, name)
+
+        for i in range(node.getNumGeoms()):
+            node.setGeom(i, compact_geom(node.getGeom(i)))
+
+
+class AssetCache:
+    """
+    Cache of models compiled from egg (or STL) files into optimised BAM
+    files, kept in the data directory. Each compiled model holds its full
+    model with a decimated mesh and a box, one child per level of detail.
+    A model is only compiled again when its source changes: each BAM file
+    is named by the hash of its source, and is checked once per session.
+
+    Models may be preloaded in the background (by the loader's thread),
+    in which case loading one waits only for that model. Fonts are loaded
+    when first used. Hits, misses and load times are kept as statistics.
+
+    Parameters
+    ---------
+    loader: Loader -- The application's model loader.
+    directory: Path -- Location of compiled models.
+    """
+
+    def __init__(self, loader, directory):
+        self.loader = loader
+        self.directory = Path(directory)
+        self.models = {}  # Compiled model of each source used this session
+        self.pending = {}  # Source -> (request, cached, start) of preloads
+        self.fonts = {}
+        self.times = {}  # Seconds taken for each model to be ready
+        self.hits = 0  # Models loaded already compiled
+        self.misses = 0  # Models compiled from their source
+        self.waits = 0  # Loads which waited on a preload
+
+    @property
+    def memory(self):
+        """Returns the bytes of vertex and index data of loaded models"""
+        return sum(model_memory(model) for model in self.models.values())
+
+    def preload(self, sources):
+        """Starts loading models in the background (compiled, or their
+        egg files to be compiled once loaded)."""
+        for source in map(self.__resolve, sources):
+            if source in self.models or source in self.pending:
+                continue
+
+            path = self.cache_path(source)
+            cached = path.is_file()
+            if not cached and source.suffix.lower() == '.stl':
+                continue  # Read (quickly) when needed
+
+            request = self.loader.loadModel(
+                Filename.fromOsSpecific(str(path if cached else source)),
+                noCache=True, callback=self.__receive,
+                extraArgs=[source])
+            self.pending[source] = (request, cached, time.perf_counter())
+
+    def load(self, source, level='full') -> NodePath:
+        """Returns a copy of one level of detail of a model (e.g.
+        '.../egg/Cube', or an STL file), from the cache when it is up to
+        date, compiling it otherwise."""
+        source = self.__resolve(source)
+        if source in self.pending:
+            self.waits += 1
+            self.__receive(self.pending[source][0].result(), source)
+
+        model = self.models.get(source)
+        if model is None:
+            model = self.__get_model(source)
+
+        return NodePath(model.find(level).node().copySubgraph())
+
+    def font(self, path):
+        """Returns a font, loading it the first time it is used"""
+        font = self.fonts.get(path)
+        if font is None:
+            font = self.fonts[path] = self.loader.loadFont(str(path))
+
+        return font
+
+    def cache_path(self, source: Path) -> Path:
+        """Returns where a model is compiled to, given its source's hash"""
+        try:
+            folder = source.parent.relative_to(MODEL_DIR)
+        except ValueError:
+            folder = Path()
+
+        digest = file_hash(source)[:16]
+        name = f'{source.stem}-{digest}-{CACHE_VERSION}.bam'
+        return self.directory / folder / name
+
+    def __resolve(self, source) -> Path:
+        """Returns the full path of a source (an egg file if unnamed)"""
+        source = Path(source)
+        if not source.suffix:
+            source = source.with_suffix('.egg')
+
+        return source.resolve()
+
+    def __receive(self, model, source):
+        """Adds a preloaded model, compiling it if needed (skipped if it
+        was already added, or could not be loaded)."""
+        entry = self.pending.pop(source, None)
+        if entry is None or model is None:
+            return
+
+        _, cached, start = entry
+        if cached:
+            self.hits += 1
+        else:
+            model = self.__save(source, self.__compile(source, model))
+            self.misses += 1
+
+        self.__ready(source, model, start)
+
+    def __ready(self, source, model, start):
+        """Keeps a loaded model for the rest of the session."""
+        self.models[source] = model
+        self.times[source] = time.perf_counter() - start
+
+    def __get_model(self, source: Path) -> NodePath:
+        """Loads a compiled model, compiling (and caching) it if needed"""
+        start = time.perf_counter()
+        path = self.cache_path(source)
+        if path.is_file():
+            model = self.loader.loadModel(Filename.fromOsSpecific(str(path)),
+                                          noCache=True)
+            self.hits += 1
+        else:
+            model = self.__save(source, self.__compile(source))
+            self.misses += 1
+
+        self.__ready(source, model, start)
+        return model
+
+    def __save(self, source: Path, model: NodePath) -> NodePath:
+        """Writes a compiled model to the cache (skipped if read-only)"""
+        path = self.cache_path(source)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            for stale in path.parent.glob(f'{source.stem}-*.bam'):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+
+            # Written under another name first, as workers may share files
+            temporary = path.with_suffix(f'.{os.getpid()}.tmp')
+            if not model.writeBamFile(Filename.fromOsSpecific(
+                    str(temporary))):
+                raise OSError(f'Could not write "{temporary}"')
+            os.replace(temporary, path)
+        except OSError:
+            pass  # Compiled again next session
+
+        return model
+
+    def __compile(self, source: Path, full=None) -> NodePath:
+        """Compiles a model's levels of detail from its source (or its
+        already loaded egg model)."""
+        if source.suffix.lower() == '.stl':
+            vertices, triangles = read_stl(source)
+            vertices = to_model_frame(vertices)
+            full = NodePath(mesh_node('full', vertices, triangles))
+        else:
+            if full is None:
+                full = self.loader.loadModel(
+                    Filename.fromOsSpecific(str(source)), noCache=True)
+            optimize(full)
+            vertices, triangles = mesh_arrays(full)
+
+        return make_levels(source.stem, full, vertices, triangles)
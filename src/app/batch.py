@@ -0,0 +1,185 @@
+"""Combines the geometry of many robots into a few large nodes."""
+
+from collections import defaultdict
+import numpy as np
+
+# panda3d imports
+from panda3d.core import NodePath, Point3
+
+from .lod import LEVELS
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+# Most vertices panda3d collects into one Geom (max-collect-vertices)
+MERGE_VERTICES = 65535
+
+
+def vertices(path):
+    """Returns the number of vertices drawn by the Geoms under a node"""
+    count = 0
+    for node in [path] + list(path.findAllMatches("**/+GeomNode")):
+        if node.node().isGeomNode():
+            for geom in node.node().getGeoms():
+                count += sum(geom.getPrimitive(i).getNumVertices()
+                             for i in range(geom.getNumPrimitives()))
+
+    return count
+
+
+class StaticBatch:
+    """
+    Static batch of the robots in an environment. Robots are grouped by
+    region of the scene partition, copied into one node per region and
+    flattened, so that components sharing a render state (type and colour)
+    are merged into a few large Geoms. Each block is an LODNode, with one
+    flattened copy of its robots per level of detail, placed under its
+    region's node. A level with more vertices per robot than a Geom holds
+    would only be split again, so it is instanced rather than copied. The
+    original robots are detached while batched and restored by remove().
+
+    Parameters
+    ---------
+    base: ShowBase -- A reference to the application root.
+    partition: ScenePartition -- The environment's scene partition.
+    robots: List -- The RobotModels to be batched.
+    detail: LevelOfDetail -- Switch distances of the levels of detail.
+    impostors: Set -- Body classes which may be drawn as impostors.
+    """
+
+    def __init__(self, base, partition, robots, detail, impostors=()):
+        self.base = base
+        self.partition = partition
+        self.robots = list(robots)
+        self.detail = detail
+        self.impostors = set(impostors)
+        self.released = False
+        self.blocks = {}  # Region -> LODNode path of its batch
+        self.centers = []  # Centre of each block
+        self.counts = []  # Number of robots in each block
+        self.tiled = {}  # Region -> whether the block switches to impostors
+        self.__order = []  # Index (in robots) of each robot, block by block
+        self.__merged = {}  # (Body, level) -> whether the level is merged
+        self.__build()
+
+    def __build(self):
+        """Copies robots into per-region nodes and flattens each block."""
+        regions = defaultdict(list)
+        for index, model in enumerate(self.robots):
+            position = model.position
+            key = self.partition.region(position.x, position.y)
+            regions[key].append(index)
+
+        for key, indices in regions.items():
+            i, j = key
+            models = [self.robots[index] for index in indices]
+
+            # A block is only drawn as impostors if all its robots can be
+            tiled = all(m.body_class in self.impostors for m in models)
+            block = self.detail.make(f'block-{i}-{j}', tiled)
+            path = NodePath(block)
+            for level, name in enumerate(LEVELS):
+                self.__build_level(path.attachNewNode(name), models, level)
+
+            for model in models:
+                model.path.detachNode()
+
+            center = np.mean([tuple(m.path.getPos()) for m in models], axis=0)
+            block.setCenter(Point3(*center))
+            path.reparentTo(self.partition.node(key))
+            self.blocks[key] = path
+            self.tiled[key] = tiled
+            self.centers.append(center)
+            self.counts.append(len(models))
+            self.__order.extend(indices)
+
+    def __build_level(self, path, models, level):
+        """Copies one level of detail of each robot into a node and
+        flattens it (instancing the levels too large to merge)."""
+        merged = path.attachNewNode('merged')
+        for model in models:
+            body = model.prototype.levels[level]
+            robot = NodePath(model.id)
+            robot.setPos(model.path.getPos())
+            if self.__merges(model.prototype, level):
+                body.copyTo(robot)
+                robot.reparentTo(merged)
+            else:
+                body.instanceTo(robot)
+                robot.reparentTo(path)
+
+        # Loaded models are ModelRoots, which flattening preserves
+        merged.clearModelNodes()
+        merged.flattenStrong()
+
+    def __merges(self, prototype, level):
+        """Returns whether a level of a body is small enough to merge"""
+        key = (id(prototype), level)
+        if key not in self.__merged:
+            count = vertices(prototype.levels[level])
+            self.__merged[key] = count <= MERGE_VERTICES
+
+        return self.__merged[key]
+
+    @property
+    def size(self):
+        """Returns number of batches"""
+        return len(self.blocks)
+
+    def apply(self, detail):
+        """Updates the level of detail switch distances of each block"""
+        self.detail = detail
+        for key, path in self.blocks.items():
+            detail.apply(path.node(), self.tiled[key])
+
+    def distances(self, point):
+        """Returns the distance of each batched robot from a point (that
+        is, the distance of its block's centre), in the order of robots"""
+        if not self.blocks:
+            return np.zeros(0)
+
+        distances = np.linalg.norm(np.array(self.centers) - point, axis=1)
+        distances = np.repeat(distances, self.counts)
+
+        ordered = np.empty(len(self.robots))
+        ordered[self.__order] = distances
+        return ordered
+
+    @property
+    def tiled_robots(self):
+        """Returns whether each robot's block switches to impostors, in
+        the order of robots"""
+        tiled = np.zeros(len(self.robots), dtype=bool)
+        tiled[self.__order] = np.repeat(list(self.tiled.values()),
+                                        self.counts)
+        return tiled
+
+    def release(self):
+        """Hides the batch and restores the original robots (e.g. to focus
+        a single robot). The batch is kept so it can be restored."""
+        for model in self.robots:
+            self.partition.add(model)
+
+        for path in self.blocks.values():
+            path.detachNode()
+
+        self.released = True
+
+    def restore(self):
+        """Shows the batch again in place of the original robots."""
+        for model in self.robots:
+            model.path.detachNode()
+
+        for key, path in self.blocks.items():
+            path.reparentTo(self.partition.node(key))
+
+        self.released = False
+
+    def remove(self):
+        """Removes the batched geometry and restores the original robots."""
+        self.release()
+        for path in self.blocks.values():
+            path.removeNode()
+
+        self.blocks = {}
@@ -3,9 +3,15 @@
 from pathlib import Path
 
 # Imports to handle robot building
+import numpy as np
 from ..robot import Robot
+from ..blueprint import COMPONENT_TYPES
 from .terrain import Terrain
-from panda3d.core import NodePath
+from panda3d.core import NodePath, Point3, Vec3
+from .layout import Layout
+from .lod import LevelOfDetail
+from .geometry import box_node
+from .profiler import Profiler, clock
 
 __author__ = "Jonty Doyle and Hamza Amir"
 __email__ = "dyljon001@myuct.ac.za"
@@ -13,13 +19,147 @@ __date__ = "21 September 2022"
 
 BASE_DIR = Path(__file__).parents[2]
 COMPONENT_DIR = BASE_DIR / 'assets' / 'models' / 'components' / 'egg'
-TOLERANCE = 0.02  # Offset for slotting two components together
-SLOT_OFFSET = 0.15 + TOLERANCE  # Offset for slotting two components together
 
 # Constants used in robot building
 SCALE = 0.1
 
 
+def collides(bounds, other):
+    """Checks whether two (start, end) bounding boxes overlap in the XY
+    plane. Returns True if they overlap False if not"""
+    r_start, r_end = bounds
+    o_start, o_end = other
+
+    if overlap((r_start.x, r_end.x), (o_start.x, o_end.x)):
+        if overlap((r_start.y, r_end.y), (o_start.y, o_end.y)):
+            return True
+
+    return False
+
+
+def overlap(range1, range2):
+    """Checks whether two (start, end) ranges overlap."""
+    return range1[1] >= range2[0] and range2[1] >= range1[0]
+
+
+def in_bounds(bounds, terrain: Terrain):
+    """Checks whether a (start, end) bounding box lies within the
+    terrain"""
+    start, end = bounds
+    _, terrain_bounds = terrain.bounds
+    x, y, _ = terrain_bounds
+
+    if (-x < start.x < x) and (-x < end.x < x):
+        if (-y < start.y < y) and (-y < end.y < y):
+            return True
+
+    return False
+
+
+class Prototype:
+    """
+    A robot body built once and shared (as a panda3d instance) by every
+    robot with an identical body.
+
+    Parameters
+    ---------
+    path: NodePath -- The built body (an LODNode), centred on the origin.
+    bounds: Tuple -- Bounds of the body (start and end points).
+    """
+
+    def __init__(self, path: NodePath, bounds):
+        self.path = path
+        self.bounds = tuple(Point3(*point) for point in bounds)
+        self.size = self.bounds[1] - self.bounds[0]
+
+    @property
+    def levels(self):
+        """Returns the node of each level of detail of the body (full,
+        decimated, boxes, box and impostor)"""
+        return list(self.path.getChildren())
+
+
+class BodyBuilder:
+    """
+    Builds the components of a robot's body into a Prototype. The transform
+    of each component is found in advance (by its Layout), so each model is
+    placed directly under the body's node, without nesting.
+
+    Parameters
+    ---------
+    base: ShowBase -- A reference to the application root.
+    robot: Robot -- The robot whose body is built.
+    """
+
+    def __init__(self, base, robot: Robot):
+        self.base = base
+        self.robot = robot
+        self.blueprint = robot.blueprint
+        self.layout = Layout(self.blueprint, base.metrics)
+
+    def build(self):
+        """Builds the robot body, at each level of detail, into a
+        prototype"""
+        node = NodePath(LevelOfDetail().make('body'))
+        full = node.attachNewNode('full')
+        for i in range(self.blueprint.size):
+            self.__add_component(i, full)
+
+        self.__build_decimated().reparentTo(node)
+        self.__build_boxes().reparentTo(node)
+        self.__build_box().reparentTo(node)
+        node.attachNewNode('impostor')  # Drawn as a sprite by Impostors
+        return Prototype(node, self.layout.bounds)
+
+    def __build_decimated(self):
+        """Builds the decimated model of each component, flattened into a
+        Geom per component type (and colour)"""
+        path = NodePath('decimated')
+        for i in range(self.blueprint.size):
+            self.__add_component(i, path, 'decimated')
+
+        path.flattenStrong()
+        return path
+
+    def __build_boxes(self):
+        """Builds a box in place of each component, one node per type"""
+        path = NodePath('boxes')
+        types = np.array(self.blueprint.types, dtype=int)
+        for code in np.unique(types):
+            component = COMPONENT_TYPES[code]
+            boxes = self.layout.component_bounds[types == code]
+            box = path.attachNewNode(box_node(component.name, boxes))
+            box.setState(component.state)
+
+        return path
+
+    def __build_box(self):
+        """Builds a single box (coloured as its root) in place of the body"""
+        path = NodePath(box_node('box', self.layout.bounds))
+        if self.blueprint.size > 0:
+            path.setState(self.blueprint.component_type(0).state)
+
+        return path
+
+    def __add_component(self, i, path, level='full'):
+        """Adds a component's model to the body at its place in the layout"""
+        model = self.__fetch_model(i, level)
+        model.setPos(*self.layout.positions[i])
+        model.setH(self.layout.model_headings[i])
+        model.reparentTo(path)
+
+    def __fetch_model(self, i, level):
+        """Fetches a level of detail of the component (compiled) model"""
+        component = self.blueprint.component_type(i)
+        model = self.base.assets.load(component.model_path, level)
+
+        model.setName(self.blueprint.ids[i])
+        model.setScale(SCALE)
+        model.setState(component.state)  # Shared across all robots
+
+        return model
+
+
 class RobotModel:
     """
     Responsible for the construction/render of a single robot, further
@@ -30,139 +170,60 @@ class RobotModel:
     ---------
     base: ShowBase -- A reference to the application root.
     robot: Robot -- The robot to be rendered.
+    prototypes: dict -- Optional cache of built bodies, shared between robots.
+    body_class: int -- The robot's body class (key in the prototypes cache).
+    profiler: Profiler -- Optional profiler timing each phase of the build.
     """
 
-    def __init__(self, base, robot: Robot):
+    def __init__(self, base, robot: Robot, prototypes=None, body_class=None,
+                 profiler=None):
         self.base = base
         self.robot = robot
-
-        self.path = self.__build_path(robot, robot.position)
-        self.bounds = self.path.getTightBounds()
+        profiler = profiler or Profiler()
+
+        start = clock()
+        self.prototype = self.__get_prototype(robot, prototypes, body_class)
+        start = profiler.mark('Fetch', start, robot.id)
+        self.path = self.__build_path(robot, robot.position, self.prototype)
+        start = profiler.mark('Place', start, robot.id)
+        self.bounds = self.__get_bounds(self.prototype)
+        profiler.mark('Bounds', start, robot.id)
         self.position = robot.position
         self.id = robot.id
+        self.body_class = body_class
 
     def collides(self, other):
         """Checks if candidate robot will collide with an already
         rendered robot. Returns True if they overlap False if not"""
-
-        o_start, o_end = other.bounds
-        o_x = (o_start.x, o_end.x)  # x-bounds for other robot
-        o_y = (o_start.y, o_end.y)  # y-bounds for other robot
-
-        r_start, r_end = self.bounds
-        r_x = (r_start.x, r_end.x)  # x-bounds for robot
-        r_y = (r_start.y, r_end.y)  # y-bounds for robot
-
-        if self.__overlap(r_x, o_x) and self.__overlap(r_y, o_y):
-            return True
-
-        return False
+        return collides(self.bounds, other.bounds)
 
     def in_bounds(self, terrain: Terrain):
         """Checks whether candidate robot will be rendered within the defined
         terrain"""
-        start, end = self.bounds
-        _, terrain_bounds = terrain.bounds
-        x, y, _ = terrain_bounds
+        return in_bounds(self.bounds, terrain)
 
-        if (-x < start.x < x) and (-x < end.x < x):
-            if (-y < start.y < y) and (-y < end.y < y):
-                return True
+    def __get_prototype(self, robot: Robot, prototypes, body_class):
+        """Returns the built body of a robot, building it only if no robot
+        with the same body has been built before"""
+        if prototypes is None:
+            return BodyBuilder(self.base, robot).build()
 
-        return False
+        if body_class not in prototypes:
+            prototypes[body_class] = BodyBuilder(self.base, robot).build()
 
-    def __overlap(self, point1, point2):
-        """Checks whether the bounding box of two robots will overlap.
-        Returns True if overlap is going to occur, False if not."""
-        if (point1[1] >= point2[0] and point2[1] >= point1[0]):
-            return True
-        else:
-            return False
-
-    # Returns the orientation according to:
-    # https://robogen.org/docs/building-your-robot/#3D-print
-    def __find_orientation(self, slot):
-        """Returns the orientation according to:
-        https://robogen.org/docs/building-your-robot/#3D-print"""
-        if slot == 0:
-            return 90
-        elif slot == 1:
-            return 270
-        elif slot == 2:
-            return 0
-        elif slot == 3:
-            return 180
-
-    def __build_path(self, robot: Robot, position):
+        return prototypes[body_class]
+
+    def __build_path(self, robot: Robot, position, prototype):
         """Sets node path for robot to be rendered into scene graph"""
         node = NodePath(robot.id)
-        for component in robot.components.get():
-            self.__add_component(component, node)
-
-        size = self.__get_size(node)
+        prototype.path.instanceTo(node)
 
         node.setPos(position)
-        node.setZ(size.z / 2)
+        node.setZ(prototype.size.z / 2)
         return node
 
-    def __add_component(self, data, path):
-        """Base function for adding a component to the scene graph"""
-        component, parent, slot = data
-        component_path = NodePath(component.id)
-        model_path = self.__fetch_model(component, parent, slot)
-        model_path.reparentTo(component_path)
-
-        root = self.robot.components.root
-
-        if component != root:
-            slot_path = self.__build_slot(component, parent, slot)
-            parent_path = path.find(f'**/{parent.id}*')
-            slot_path.reparentTo(parent_path)
-            self.__place_component(component, parent, component_path)
-            component_path.reparentTo(slot_path)
-        else:
-            component_path.reparentTo(path)
-
-    def __fetch_model(self, component, parent, slot):
-        """Fetches the component (egg) model, rotates accordingly"""
-        model = self.base.loader.loadModel(component.model_path)
-
-        model.setScale(SCALE)
-        model.setMaterial(component.material)
-        component.model_size = self.__get_size(model)
-
-        # Rotate only if not always in one direction
-        if not component.is_one_way:
-            model.setH(component.orientation)
-
-        return model
-
-    def __build_slot(self, component, parent, slot):
-        """Creates the slot and rotates accordingly"""
-        slot_path = NodePath(str(slot))
-
-        if parent.is_one_way:
-            slot_path.setH(self.__find_orientation(2))  # Only One slot
-        else:
-            slot_path.setH(self.__find_orientation(slot) + parent.orientation)
-
-        return slot_path
-
-    def __place_component(self, component, parent, path):
-        """Places the component by setting the distance from slot (parent)"""
-        size_difference = (parent.model_size.x - component.model_size.x) / 2 - TOLERANCE
-
-        if parent.has_slot and component.slots_in:
-            path.setX(parent.model_size.x - size_difference - SLOT_OFFSET)
-        elif parent.slots_in and component.has_slot:
-            path.setX(parent.model_size.x - size_difference - SLOT_OFFSET)
-        else:
-            path.setX(parent.model_size.x - size_difference)
-
-        return path
-
-    def __get_size(self, model):
-        """Helper for finding the size of a model"""
-        min, max = model.getTightBounds()
-        size = max - min
-        return size
+    def __get_bounds(self, prototype):
+        """Returns the bounds of the robot, offset from its prototype"""
+        start, end = prototype.bounds
+        offset = Vec3(self.path.getPos())
+        return start + offset, end + offset
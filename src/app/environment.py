@@ -1,18 +1,45 @@
+import math
 import time
 import pickle
+from collections import Counter
 from pathlib import Path
+import numpy as np
+
+# panda3d imports
+from panda3d.core import Point3
 
 # Relative imports
 from ..robot import Robot, RobotData
+from ..config import EnvironmentConfig, saved_environments, ENV_DIR
 from .parser import Parser
-from .builder import RobotModel
+from .builder import RobotModel, collides, in_bounds
+from .layout import Layout
 from .terrain import Terrain
+from .spatial import SpatialGrid, ScenePartition, DIVISIONS
+from .batch import StaticBatch
+from .lod import LevelOfDetail, LEVELS
+from .impostor import Impostors, MAX_CLASSES
+from .points import PointCloud, POINTS_MIN_ROBOTS
+from .paging import (Pager, RobotRecord, PAGE_SIZE, PAGE_RADIUS,
+                     PAGE_BUDGET)
+from .workers import WorkerPool
+from .profiler import Profiler, clock, BUILD, TRACE_FILE
 from .ui.common import Mode
 
 __author__ = "Benjamin Chiddy and Jonty Doyle"
 __email__ = "chdben002@myuct.ac.za"
 __date__ = "21 September 2022"
 
+# Constants used in incremental (time-sliced) builds
+BUILD_TASK = 'build-robots'
+FRAME_BUDGET = 1 / 30  # Time spent building per frame (seconds)
+INCREMENTAL_MIN_ROBOTS = 500
+
+IMPOSTOR_TASK = 'update-impostors'
+PAGE_TASK = 'page-robots'
+
+BODIES_SHOWN = 5  # Most common body classes listed by the bodies command
+
 
 class Environment:
     """Builds and renders either pre-loaded or custom robot models."""
@@ -20,9 +47,30 @@ class Environment:
     def __init__(self, base):
         self.base = base
         self.name = None
-        self.console = base.ui.console
         self.robots = []
-        self.ENV_DIR = base.DATA_DIR / 'environments'
+        self.grid = None  # Spatial index of robots, set during build
+        self.partition = None  # Scene graph regions of robots
+        self.scene = base.render.attachNewNode('robots')
+        self.prototypes = {}  # Built robot bodies, shared between robots
+        self.blueprints = {}  # Compiled robot bodies, by body class
+        self.batching = False  # Whether robots are statically batched
+        self.static_batch = None
+        self.detail = LevelOfDetail()  # Level of detail switch distances
+        self.impostors = None  # Sprites drawn in place of distant robots
+        self.__view = None  # View the impostors were last drawn from
+        self.points_min = POINTS_MIN_ROBOTS  # Drawn as points from (or None)
+        self.point_cloud = None
+        self.paging = False  # Whether robots are built only near the camera
+        self.page_radius = PAGE_RADIUS
+        self.page_budget = PAGE_BUDGET  # MB
+        self.pager = None
+        self.incremental = True  # Whether large builds run as a task
+        self.num_workers = 1  # Processes used to build robot bodies
+        self.pool = None
+        self.__steps = None  # Incremental build in progress
+        self.focused = None  # Id of the robot in focus
+        self.profiler = Profiler()  # Timings of the last build
+        self.ENV_DIR = base.DATA_DIR / ENV_DIR
         self.parser = Parser(self)
         self.logger = base.logger
 
@@ -32,14 +80,12 @@ class Environment:
     @property
     def envs(self):
         """Returns all saved environments"""
-        envs = []
-        try:
-            for env in self.ENV_DIR.iterdir():
-                envs.append(env.stem)
-        except FileNotFoundError:
-            return envs
+        return saved_environments(self.base.DATA_DIR)
 
-        return envs
+    @property
+    def building(self):
+        """Checks whether an incremental build is in progress"""
+        return self.__steps is not None
 
     @property
     def valid(self):
@@ -53,14 +99,26 @@ class Environment:
             return False
 
     def clear(self, *args):
-        """Removes all robots and terrain and closes resets environment.
-        USAGE: clear
+        """Removes all robots and terrain (or the robots of the region
+        containing a point).
+        USAGE: clear [x] [y]
         """
+        if len(args) > 0:
+            return self.__clear_region(*args)
 
-        for robot in self.robots:
-            robot.path.removeNode()
+        self.__cancel_build()
+        self.__stop_paging()
+        self.__unbatch()
+        self.__remove_impostors()
+        self.scene.node().removeAllChildren()  # Every region of robots
 
         self.robots = []
+        self.grid = None
+        self.partition = None
+        self.point_cloud = None
+        self.focused = None
+        self.prototypes = {}
+        self.blueprints = {}
         self.name = None
         self.data = None
         self.config = None
@@ -108,6 +166,10 @@ class Environment:
         for model in self.robots:
             model.path.show()
 
+        if self.static_batch is not None:
+            self.static_batch.restore()
+
+        self.focused = None
         return 'Unfocused'
 
 
@@ -124,11 +186,16 @@ class Environment:
         id_list = [r.robot.id for r in self.robots]
 
         if self.valid and id in id_list:
+            if self.static_batch is not None:
+                self.static_batch.release()
+
             for model in self.robots:
                 model.path.hide()
                 if model.robot.id == id:
                     model.path.show()
 
+            self.focused = id
+
         else:
             return f'ERROR: id [{id}] not Found'
 
@@ -154,15 +221,17 @@ class Environment:
         if env is not None:
             path = self.ENV_DIR / f'{env}.pkl'
 
+            start = clock()
             with path.open('rb') as f:
                 state = pickle.load(f)
 
             name, data, config = state
+            loaded = (start, clock())
 
             self.clear()
-            return self.__build(name, data, config)
+            return self.__build(name, data, config, loaded)
         else:
-            return f'Error: Environment "{name}" not found.'
+            return f'ERROR: Environment "{name}" not found.'
 
     def open(self, *args):
         """Open a model given the configuration file parameters.
@@ -173,40 +242,313 @@ class Environment:
             self.position_path = Path(args[1])
             self.data_path = Path(args[2])
 
+            start = clock()
             config = EnvironmentConfig(self.config_path)
             data = RobotData(self.data_path, self.position_path)
 
-            return self.__build(None, data, config)
+            return self.__build(None, data, config, (start, clock()))
         except IndexError:
             return None
 
     def hide(self, *args):
-        """Hides all rendered objects.
-        USAGE: hide
+        """Hides all rendered objects (or the region containing a point).
+        USAGE: hide [x] [y]
         """
-        try:
-            for robot in self.robots:
-                robot.path.hide()
+        if self.partition is None:
+            return 'ERROR: No Environment to hide'
 
-            self.terrain.path.hide()
+        if len(args) > 0:
+            region = self.__region(*args)
+            if region is None:
+                return f'ERROR: Invalid point "{" ".join(args)}"'
 
-            return 'Environment Hidden'
-        except AttributeError:
-            return 'ERROR: No Environment to hide'
+            self.partition.hide(region)
+            return f'Region {region} Hidden'
+
+        self.scene.hide()
+        self.terrain.path.hide()
+        return 'Environment Hidden'
 
     def show(self, *args):
-        """Show all rendered objects.
-        USAGE: show
+        """Show all rendered objects (or the region containing a point).
+        USAGE: show [x] [y]
+        """
+        if self.partition is None:
+            return 'ERROR: No Environment to show'
+
+        if len(args) > 0:
+            region = self.__region(*args)
+            if region is None:
+                return f'ERROR: Invalid point "{" ".join(args)}"'
+
+            self.partition.show(region)
+            return f'Region {region} Visible'
+
+        if self.focused is not None:
+            self.unfocus()
+
+        self.scene.show()
+        self.partition.show()
+        self.terrain.path.show()
+        return 'Environment Visible'
+
+    def batch(self, *args):
+        """Combines robot geometry into static batches (faster rendering).
+        USAGE: batch [on|off]
+        """
+        try:
+            option = args[0]
+        except IndexError:
+            return None
+
+        if option == 'on':
+            if self.pager is not None:
+                return 'ERROR: Batching is unavailable while paging'
+
+            self.batching = True
+            if self.valid and not self.building:
+                self.__batch()  # Otherwise batched once the build finishes
+            if self.static_batch is not None:
+                return f'Batching On [{self.static_batch.size} Batches]'
+        elif option == 'off':
+            self.batching = False
+            self.__unbatch()
+        else:
+            return f'ERROR: Unknown option "{option}"'
+
+        return f'Batching {option.capitalize()}'
+
+    def cancel(self, *args):
+        """Cancels a build in progress, keeping robots already added.
+        USAGE: cancel
+        """
+        if not self.building:
+            return 'ERROR: No build in progress.'
+
+        self.__cancel_build()
+        return f'Build Cancelled. {self.__finish_build()}'
+
+    def workers(self, *args):
+        """Sets the number of processes used to build robot bodies.
+        USAGE: workers [count]
+        """
+        try:
+            count = int(args[0])
+        except IndexError:
+            return None
+        except ValueError:
+            return f'ERROR: Invalid worker count "{args[0]}"'
+
+        if count < 1:
+            return f'ERROR: Invalid worker count "{count}"'
+
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+        self.num_workers = count
+        if count > 1:
+            self.pool = WorkerPool(count, self.base.assets.directory)
+
+        return f'Building with {count} Worker(s)'
+
+    def lod(self, *args):
+        """Sets level of detail distances (or counts robots at each level).
+        USAGE: lod [near] [middle] [far] [impostor]
         """
+        if len(args) == 0:
+            return self.__lod_counts()
+
+        detail = self.detail
         try:
-            for robot in self.robots:
-                robot.path.show()
+            near = float(args[0])
+            middle = float(args[1]) if len(args) > 1 else detail.middle
+            far = float(args[2]) if len(args) > 2 else detail.far
+            impostor = float(args[3]) if len(args) > 3 else detail.impostor
+        except ValueError:
+            return f'ERROR: Invalid distance(s) "{" ".join(args)}"'
 
-            self.terrain.path.show()
+        if not 0 <= near <= middle <= far <= impostor:
+            return ('ERROR: Distances must be '
+                    '0 <= near <= middle <= far <= impostor')
 
-            return 'Environment Visible'
-        except AttributeError:
-            return 'ERROR: No Environment to show'
+        detail.near = near
+        detail.middle = middle
+        detail.far = far
+        detail.impostor = impostor
+        self.__apply_detail()
+
+        return (f'LOD Distances: Full < {near:g} < Decimated < {middle:g} '
+                f'< Boxes < {far:g} < Box < {impostor:g} < Impostor')
+
+    def points(self, *args):
+        """Draws robots as points (or only at and above a robot count).
+        USAGE: points [on|off|auto] [count]
+        """
+        try:
+            option = args[0]
+        except IndexError:
+            return None
+
+        if option == 'on':
+            self.points_min = 0
+        elif option == 'off':
+            self.points_min = None
+        elif option == 'auto':
+            try:
+                count = int(args[1]) if len(args) > 1 else POINTS_MIN_ROBOTS
+            except ValueError:
+                return f'ERROR: Invalid robot count "{args[1]}"'
+
+            if count < 0:
+                return f'ERROR: Invalid robot count "{count}"'
+            self.points_min = count
+        else:
+            return f'ERROR: Unknown option "{option}"'
+
+        # Redraws the environment if it is now drawn differently
+        drawn = self.point_cloud is not None
+        if self.valid and not self.building and drawn != self.__use_points():
+            name, data, config = self.name, self.data, self.config
+            self.clear()
+            return self.__build(name, data, config)
+
+        if self.points_min is None:
+            return 'Points Off'
+        elif self.points_min == 0:
+            return 'Points On'
+
+        return f'Points On at {self.points_min} Robot(s)'
+
+    def page(self, *args):
+        """Builds robots only near the camera, within a memory budget (MB).
+        USAGE: page [on|off] [radius] [budget]
+        """
+        try:
+            option = args[0]
+        except IndexError:
+            return self.__page_counts()
+
+        if option == 'on':
+            try:
+                radius = float(args[1]) if len(args) > 1 else self.page_radius
+                budget = float(args[2]) if len(args) > 2 else self.page_budget
+            except ValueError:
+                return f'ERROR: Invalid radius/budget "{" ".join(args[1:])}"'
+
+            if radius <= 0 or budget <= 0:
+                return 'ERROR: Radius and budget must be positive'
+
+            self.paging = True
+            self.page_radius = radius
+            self.page_budget = budget
+            if self.pager is not None:
+                self.pager.radius = radius
+                self.pager.budget = budget
+        elif option == 'off':
+            self.paging = False
+        else:
+            return f'ERROR: Unknown option "{option}"'
+
+        # Redraws the environment if it is now built differently
+        paged = self.pager is not None
+        if self.valid and not self.building and paged != self.paging:
+            name, data, config = self.name, self.data, self.config
+            self.clear()
+            return self.__build(name, data, config)
+
+        if not self.paging:
+            return 'Paging Off'
+
+        return (f'Paging On [Radius: {self.page_radius:g}, '
+                f'Budget: {self.page_budget:g} MB]')
+
+    def assets(self, *args):
+        """Shows cache hits, load times and memory of loaded models.
+        USAGE: assets
+        """
+        assets = self.base.assets
+        times = assets.times
+        output = [f'Assets: {len(assets.models)} Loaded, '
+                  f'{len(assets.pending)} Pending, '
+                  f'{len(assets.fonts)} Font(s)',
+                  f'Cache: {assets.hits} Hit(s), {assets.misses} Miss(es), '
+                  f'{assets.waits} Wait(s)']
+
+        if times:
+            slowest = max(times, key=times.get)
+            mean = sum(times.values()) / len(times)
+            output.append(f'Load Time: {mean:.3f}s Mean, '
+                          f'{times[slowest]:.3f}s Max [{slowest.stem}]')
+
+        output.append(f'Memory: {assets.memory / (1024 * 1024):.1f} MB')
+        return ' | '.join(output)
+
+    def stats(self, *args):
+        """Shows the time spent in each phase of the last build.
+        USAGE: stats [trace/save] [on/off/path]
+        """
+        profiler = self.profiler
+        option = args[0] if args else None
+        if option == 'trace':
+            if len(args) < 2 or args[1] not in ('on', 'off'):
+                return 'ERROR: Tracing must be "on" or "off"'
+
+            profiler.tracing = args[1] == 'on'
+            state = 'On' if profiler.tracing else 'Off'
+            return f'Tracing {state} [Applies from the next build]'
+        elif option == 'save':
+            if not profiler.events:
+                return 'ERROR: No trace recorded [Use stats trace on]'
+
+            path = Path(args[1]) if len(args) > 1 else \
+                self.base.DATA_DIR / TRACE_FILE
+            try:
+                profiler.write(path)
+            except OSError as e:
+                return f'ERROR: {e}'
+
+            return f'Saved {len(profiler.events)} Trace Event(s) to "{path}"'
+        elif option is not None:
+            return f'ERROR: Unknown option "{option}"'
+
+        phases = profiler.phases
+        if not phases:
+            return 'ERROR: No environment built.'
+
+        total = profiler.totals.get(BUILD)
+        output = ['Build: In Progress' if total is None else
+                  f'Build: {total:.3f}s']
+        for phase, seconds, count in phases:
+            text = f'{phase}: {seconds:.3f}s'
+            if count > 1:
+                text += f' ({count} x {seconds / count * 1e6:.1f}us)'
+            output.append(text)
+
+        return ' | '.join(output)
+
+    def bodies(self, *args):
+        """Lists the unique robot bodies (body classes) in the environment.
+        USAGE: bodies
+        """
+        if not self.valid:
+            return 'ERROR: No environment loaded.'
+
+        count = self.config.num_robots
+        counts = self.data.class_counts(count)
+        bodies = self.data.bodies(count)
+
+        classes = []
+        for body_class, robots in counts.most_common(BODIES_SHOWN):
+            parts = len(bodies[body_class]['body']['part'])
+            classes.append(f'#{body_class}: {robots} Robot(s), {parts} Parts')
+
+        if len(counts) > BODIES_SHOWN:
+            classes.append('..')
+
+        return (f'{len(counts)} Unique Bodies for {sum(counts.values())} '
+                f'Robot(s) [{len(self.prototypes)} Built] | '
+                f'{" | ".join(classes)}')
 
     def rebuild(self, *args):
         """Rebuilds the environment under the current configuration
@@ -219,93 +561,507 @@ class Environment:
         except AttributeError:
             return 'ERROR: Unable to detect filepaths to rebuild off.'
 
-    def __build(self, name, data, config):
+    def __build(self, name, data, config, loaded=None):
         """Private method which constructs/sets the environment given data
-        and config"""
+        and config (loaded between the given start and end times)"""
         self.base.ui.set_mode(Mode.INTERACTIVE)
+        self.__cancel_build()
 
         if data.valid and config.valid:
             self.data = data
             self.config = config
             self.name = name
 
-            start_time = time.time()  # Start render timer.
-            errors = 0
+            profiler = self.profiler
+            profiler.reset(loaded[0] if loaded else None)
+            if loaded:
+                profiler.add('Load', *loaded)
+            start = clock()
+
+            self.__start_time = time.time()  # Start render timer.
+            self.__errors = 0
             # Add terrain
             self.terrain = Terrain(self.base, self.config)
-            for i in range(self.config.num_robots):
-                data, position = self.data[i]
+            self.grid = SpatialGrid(self.config.x, self.config.y,
+                                    self.config.num_robots)
+            self.partition = ScenePartition(self.grid, self.scene,
+                                            self.__divisions())
+            self.prototypes = {}
+            self.blueprints = {}
+            self.__samples = {}  # Robot data of each body class
+            self.__bounds = {}  # Bounds of each body class
 
-                if position is None:
-                    return f'ERROR: Position not-found/invalid [Robot ID: {i}]'
-                elif data is None:
-                    return f'ERROR: Data not found for Robot ID: {i}'
-                else:
-                    # Build robots
-                    r = Robot(data, position)
-                    errors += self.__add_robot(r)
-
-                # Set Terrain & update lights
-                self.base.lights.update(self.config)
-                self.terrain.path.reparentTo(self.base.render)
+            # Set Terrain & update lights
+            self.base.lights.update(self.config)
+            self.terrain.path.reparentTo(self.base.render)
+            start = profiler.mark('Setup', start)
 
-            # End render timer.
-            self.render_time = round(time.time() - start_time, 3)
-            success = len(self.robots)
+            # Very large environments are drawn without building bodies
+            if self.__use_points():
+                return self.__build_points()
 
-            added_text = f'Added {success} Robot(s) in {self.render_time}s'
-            self.base.ui.set_mode(Mode.INTERACTIVE)
-            self.base.ui.refresh()
+            # Distinct bodies can be built up front in worker processes
+            if self.num_workers > 1:
+                bodies = self.data.bodies(self.config.num_robots)
+                self.prototypes = self.pool.build(bodies)
+                for prototype in self.prototypes.values():
+                    self.detail.apply(prototype.path.node())
+                profiler.mark('Workers', start)
 
-            if errors > 0:
-                error_text = f'{errors} Errors: View Log for Details'
-                output = f'{added_text} [{error_text}]'
+            if self.paging:
+                self.pager = Pager(self.partition, self.__page_robot,
+                                   self.page_radius, self.page_budget)
+                steps = self.__register_robots()
             else:
-                output = added_text
-            return output
+                steps = self.__build_robots()
+
+            large = self.config.num_robots >= INCREMENTAL_MIN_ROBOTS
+
+            # Large builds are spread across frames so the app stays usable
+            if self.incremental and large:
+                self.__steps = steps
+                self.base.taskMgr.add(self.__build_task, BUILD_TASK)
+                count = self.config.num_robots
+                return f'Building {count} Robot(s).. [Escape to Cancel]'
+
+            try:
+                while True:
+                    next(steps)
+            except StopIteration as done:
+                return self.__finish_build(done.value)
 
         elif not data.valid:
-            return 'Error: Invalid Robot .json File.'
+            return 'ERROR: Invalid Robot .json File.'
         elif not config.valid:
-            return 'Error: Invalid Environment Configuration'
+            return 'ERROR: Invalid Environment Configuration'
+
+    def __use_points(self):
+        """Checks whether the environment is drawn as points (paged robots
+        never are)"""
+        if self.points_min is None or self.paging:
+            return False
+
+        return self.config.num_robots >= self.points_min
+
+    def __build_points(self):
+        """Draws every robot as a point, straight from its position."""
+        count = self.config.num_robots
+        positions = self.data.positions
+        if positions is None:
+            positions = np.zeros((0, 3))
+
+        start = clock()
+        self.point_cloud = PointCloud(self.scene, positions[:count])
+        self.profiler.mark('Points', start)
+        self.profiler.mark(BUILD, self.profiler.origin)
+        self.render_time = round(time.time() - self.__start_time, 3)
+        self.base.ui.refresh()
+
+        size = self.point_cloud.size
+        if size < count:
+            return f'ERROR: Position not-found/invalid [Robot ID: {size}]'
+
+        return f'Added {size} Robot(s) as Points in {self.render_time}s'
+
+    def __divisions(self):
+        """Returns the number of scene partition regions along each axis
+        (when paging, each region is a page)"""
+        if not self.paging:
+            return DIVISIONS
+
+        size = 2 * max(self.config.x, self.config.y)
+        return max(1, math.ceil(size / PAGE_SIZE))
+
+    def __register_robots(self):
+        """Generator which registers robots (without building them) for
+        paging, yielding the number of robots processed. Returns an error
+        message if registering fails."""
+        profiler = self.profiler
+        records = self.data.records(self.config.num_robots)
+        start = clock()
+        for i, (data, position, body_class) in enumerate(records):
+            start = profiler.mark('Parse', start)
+            if position is None:
+                return f'ERROR: Position not-found/invalid [Robot ID: {i}]'
+            elif data is None:
+                return f'ERROR: Data not found for Robot ID: {i}'
+
+            if body_class not in self.__bounds:
+                blueprint = Robot(data, None).blueprint
+                layout = Layout(blueprint, self.base.metrics)
+                self.blueprints[body_class] = blueprint
+                self.__samples[body_class] = data
+                self.__bounds[body_class] = layout.bounds
+                start = profiler.mark('Robot', start)
+
+            # Placed as RobotModel places the built robot
+            low, high = self.__bounds[body_class]
+            offset = (position.x, position.y, (high[2] - low[2]) / 2)
+            bounds = (Point3(*(low + offset)), Point3(*(high + offset)))
+            record = RobotRecord(str(data['id']), position, body_class,
+                                 bounds)
+            profiler.mark('Bounds', start, record.id)
+            self.__errors += self.__register_robot(record)
+
+            yield i + 1
+            start = clock()
+
+        return None
+
+    def __register_robot(self, record: RobotRecord):
+        """Registers a robot for paging if it can be placed."""
+        profiler = self.profiler
+        id = record.id
+        start = clock()
+        for other in self.grid.query(record.bounds):
+            if collides(record.bounds, other.bounds):
+                profiler.mark('Collision', start, id)
+                self.logger.error(f'Robot [id = {id}]: collision detected')
+                return 1
+
+        start = profiler.mark('Collision', start, id)
+        if not in_bounds(record.bounds, self.terrain):
+            profiler.mark('Bounds Check', start, id)
+            self.logger.error(f'Robot [id = {id}]: Out of Bounds')
+            return 1
+
+        start = profiler.mark('Bounds Check', start, id)
+        self.logger.log(f'Registered Robot [id = {id}]')
+        self.pager.register(record)
+        self.grid.insert(record, record.bounds)
+        profiler.mark('Register', start, id)
+        return 0
+
+    def __page_robot(self, record: RobotRecord):
+        """Builds a registered robot (as its page comes into range)."""
+        body_class = record.body_class
+        built = body_class in self.prototypes
+        data = dict(self.__samples[body_class], id=record.id)
+        robot = Robot(data, record.position, self.blueprints[body_class])
+        model = RobotModel(self.base, robot, self.prototypes, body_class,
+                           self.profiler)
+
+        if not built:
+            self.detail.apply(model.prototype.path.node())
+
+        if self.focused is not None and model.id != self.focused:
+            model.path.hide()
+
+        return model
+
+    def __page_task(self, task):
+        """Builds and evicts pages of robots around the camera's origin
+        until the frame's time budget is spent."""
+        origin = self.base.camera.currentOrigin
+        self.pager.step(origin, time.time() + FRAME_BUDGET)
+
+        if self.pager.changed:
+            self.pager.changed = False
+            self.robots = self.pager.models
+
+        return task.cont
+
+    def __page_counts(self):
+        """Returns the number of robots and pages built (None if robots
+        are not paged)"""
+        pager = self.pager
+        if pager is None:
+            return None
+
+        output = (f'{pager.size}/{pager.count} Robot(s) Built in '
+                  f'{len(pager.loaded)}/{len(pager.pages)} Pages')
+        if pager.full:
+            output += ' [Budget Full]'
+
+        return output
+
+    def __stop_paging(self):
+        """Removes every paged robot and stops paging."""
+        if self.pager is not None:
+            self.base.taskMgr.remove(PAGE_TASK)
+            self.pager.clear()
+            self.pager = None
+
+    def __build_robots(self):
+        """Generator which builds robots one at a time, yielding the number
+        of robots processed. Returns an error message if building fails."""
+        profiler = self.profiler
+        records = self.data.records(self.config.num_robots)
+        start = clock()
+        for i, (data, position, body_class) in enumerate(records):
+            start = profiler.mark('Parse', start)
+            if position is None:
+                return f'ERROR: Position not-found/invalid [Robot ID: {i}]'
+            elif data is None:
+                return f'ERROR: Data not found for Robot ID: {i}'
+            else:
+                # Build robots
+                blueprint = self.blueprints.get(body_class)
+                r = Robot(data, position, blueprint)
+                self.blueprints[body_class] = r.blueprint
+                profiler.mark('Robot', start, r.id)
+                self.__errors += self.__add_robot(r, body_class)
+
+            yield i + 1
+            start = clock()
+
+        return None
+
+    def __build_task(self, task):
+        """Builds robots until the frame's time budget is spent."""
+        start_time = time.time()
+        try:
+            built = next(self.__steps)  # At least one robot per frame
+            while time.time() - start_time < FRAME_BUDGET:
+                built = next(self.__steps)
+        except StopIteration as done:
+            self.__steps = None
+            output = self.__finish_build(done.value)
+            self.base.ui.console.notify(output, error=('ERROR' in output))
+            return task.done
+
+        count = self.config.num_robots
+        percent = round(100 * built / count)
+        self.base.ui.console.notify(f'Building Robots [{built}/{count}].. '
+                            '[Escape to Cancel]')
+        self.base.ui.bar.progress(f'Building.. {percent}%')
+        return task.cont
 
-    def __add_robot(self, robot: Robot):
+    def __cancel_build(self):
+        """Stops an incremental build in progress (keeping built robots)."""
+        if self.__steps is not None:
+            self.base.taskMgr.remove(BUILD_TASK)
+            self.__steps.close()
+            self.__steps = None
+            self.base.ui.bar.progress(None)
+
+    def __finish_build(self, error=None):
+        """Completes a build, returning its summary (or error)."""
+        self.base.ui.bar.progress(None)
+        if self.pager is not None:
+            self.base.taskMgr.add(self.__page_task, PAGE_TASK)
+
+        if error is not None:
+            return error
+
+        start = clock()
+        if self.pager is None:
+            self.__build_impostors()
+        if self.batching and self.pager is None:
+            self.__batch()
+        self.profiler.mark('Finish', start)
+        self.profiler.mark(BUILD, self.profiler.origin)
+
+        # End render timer.
+        self.render_time = round(time.time() - self.__start_time, 3)
+        success = len(self.robots)
+
+        added_text = f'Added {success} Robot(s) in {self.render_time}s'
+        if self.pager is not None:
+            added_text = (f'Registered {self.pager.count} Robot(s) for '
+                          f'Paging in {self.render_time}s')
+        self.base.ui.refresh()
+
+        if self.__errors > 0:
+            error_text = f'{self.__errors} Errors: View Log for Details'
+            output = f'{added_text} [{error_text}]'
+        else:
+            output = added_text
+        return output
+
+    def __region(self, *args):
+        """Returns the scene partition region containing an (x, y) point
+        given as command arguments (None if invalid)"""
+        try:
+            x, y = (float(arg) for arg in args[:2])
+        except ValueError:
+            return None
+
+        return self.partition.region(x, y)
+
+    def __clear_region(self, *args):
+        """Removes the robots of the region containing an (x, y) point given
+        as command arguments, from the scene and from the spatial grid (so
+        they are no longer queried or collided with)."""
+        if self.partition is None:
+            return 'ERROR: No Environment to clear'
+        elif self.building:
+            return 'ERROR: Cannot clear a region while building'
+        elif self.point_cloud is not None:
+            return 'ERROR: Cannot clear a region of points'
+
+        region = self.__region(*args)
+        if region is None:
+            return f'ERROR: Invalid point "{" ".join(args)}"'
+
+        # Batches and impostors are rebuilt without the region's robots
+        batched = self.static_batch is not None
+        drawn = self.impostors is not None
+        self.__unbatch()
+        self.__remove_impostors()
+
+        if self.pager is not None:
+            removed = self.pager.remove(region)
+            self.robots = self.pager.models
+        else:
+            removed = [model for model in self.robots
+                       if self.partition.region(model.position.x,
+                                                model.position.y) == region]
+            ids = {id(model) for model in removed}
+            self.robots = [model for model in self.robots
+                           if id(model) not in ids]
+
+        for item in removed:
+            self.grid.remove(item, item.bounds)
+        self.partition.remove(region)
+
+        if drawn:
+            self.__build_impostors()
+        if batched:
+            self.__batch()
+
+        # A focused robot is shown alone (unbatched) unless it was removed
+        if any(item.id == self.focused for item in removed):
+            self.unfocus()
+        elif self.focused is not None and self.static_batch is not None:
+            self.static_batch.release()
+        self.base.ui.refresh()
+
+        return f'Region {region} Cleared [{len(removed)} Robot(s) Removed]'
+
+    def __lod_counts(self):
+        """Returns the number of robots drawn at each level of detail"""
+        camera = np.array(self.base.cam.getPos(self.base.render))
+        distances, tiled = self.__distances(camera)
+
+        counts = self.detail.counts(distances, tiled)
+        levels = [f'{name}: {count}' for name, count in zip(LEVELS, counts)]
+        return f'Robots at each LOD | {" | ".join(levels)}'
+
+    def __distances(self, camera):
+        """Returns the distance of each robot from the camera (as its level
+        of detail is chosen) and whether it can be drawn as an impostor"""
+        batch = self.static_batch
+        if batch is not None and not batch.released:
+            return batch.distances(camera), batch.tiled_robots
+
+        if self.impostors is None:
+            positions = [tuple(model.path.getPos()) for model in self.robots]
+            positions = np.array(positions).reshape(-1, 3)
+            return np.linalg.norm(positions - camera, axis=1), False
+
+        # Positions of the robots (in order) are kept by the impostors
+        offsets = self.impostors.positions - camera
+        distances = np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+        return distances, self.impostors.tiled
+
+    def __apply_detail(self):
+        """Applies the level of detail distances to every robot body."""
+        drawn = set()
+        if self.impostors is not None:
+            drawn = self.impostors.classes_drawn
+
+        for body_class, prototype in self.prototypes.items():
+            self.detail.apply(prototype.path.node(), body_class in drawn)
+
+        if self.static_batch is not None:
+            self.static_batch.apply(self.detail)
+
+        self.__view = None  # Impostors are redrawn
+
+    def __build_impostors(self):
+        """Renders the most common bodies into an impostor atlas, and draws
+        distant robots with them from then on."""
+        self.__remove_impostors()
+        if not self.robots:
+            return
+
+        counts = Counter(model.body_class for model in self.robots)
+        prototypes = {body_class: self.prototypes[body_class]
+                      for body_class, _ in counts.most_common(MAX_CLASSES)
+                      if body_class in self.prototypes}
+
+        self.impostors = Impostors(self.base, self.partition, self.robots,
+                                   prototypes)
+        self.__apply_detail()
+        self.base.taskMgr.add(self.__impostor_task, IMPOSTOR_TASK)
+
+    def __remove_impostors(self):
+        """Stops drawing impostors."""
+        if self.impostors is not None:
+            self.base.taskMgr.remove(IMPOSTOR_TASK)
+            self.impostors.clear()
+            self.impostors = None
+            self.__view = None
+
+    def __impostor_task(self, task):
+        """Redraws the impostors whenever the view changes."""
+        camera = self.base.cam
+        batch = self.static_batch
+        view = (tuple(map(tuple, camera.getMat(self.base.render))),
+                self.focused, batch, batch is not None and batch.released)
+
+        if view != self.__view:
+            self.__view = view
+            distances, tiled = self.__distances(np.array(
+                camera.getPos(self.base.render)))
+            far = (distances > self.detail.impostor) & tiled
+            if self.focused is not None:  # Only the focused robot is shown
+                far &= [m.id == self.focused for m in self.robots]
+
+            self.impostors.update(camera, far)
+
+        return task.cont
+
+    def __batch(self):
+        """Replaces the individual robots with a static batch of them."""
+        self.__unbatch()
+        if self.robots:
+            drawn = set()
+            if self.impostors is not None:
+                drawn = self.impostors.classes_drawn
+
+            self.static_batch = StaticBatch(self.base, self.partition,
+                                            self.robots, self.detail, drawn)
+        self.__view = None
+
+    def __unbatch(self):
+        """Restores the individual robots if they are batched."""
+        if self.static_batch is not None:
+            self.static_batch.remove()
+            self.static_batch = None
+            self.__view = None
+
+    def __add_robot(self, robot: Robot, body_class):
         """Initialises a RobotBuilder to add a robot to the scene."""
-        candidate = RobotModel(self.base, robot)
+        profiler = self.profiler
+        built = body_class in self.prototypes
+        candidate = RobotModel(self.base, robot, self.prototypes,
+                               body_class, profiler)
         id = candidate.id
 
-        for robot in self.robots:
+        if not built:
+            self.detail.apply(candidate.prototype.path.node())
+
+        # Only robots sharing a grid cell can possibly overlap
+        start = clock()
+        for robot in self.grid.query(candidate.bounds):
             if candidate.collides(robot):
+                profiler.mark('Collision', start, id)
                 self.logger.error(f'Robot [id = {id}]: collision detected')
                 return 1
 
+        start = profiler.mark('Collision', start, id)
         if not candidate.in_bounds(self.terrain):
+            profiler.mark('Bounds Check', start, id)
             self.logger.error(f'Robot [id = {id}]: Out of Bounds')
             return 1
         else:
+            start = profiler.mark('Bounds Check', start, id)
             self.logger.log(f'Added Robot [id = {id}]')
-            candidate.path.reparentTo(self.base.render)
+            self.partition.add(candidate)
             self.robots.append(candidate)
+            self.grid.insert(candidate, candidate.bounds)
+            profiler.mark('Reparent', start, id)
             return 0
 
-
-class EnvironmentConfig:
-    """Holds attributes pertaining to the config spec provided"""
-
-    def __init__(self, path):
-        self.valid = True
-        self.__parse_config(path)
-
-    def __parse_config(self, path: Path):
-        """Parses config txt file defining model to be rendered"""
-        if path.is_file():
-            with path.open('r') as f:
-                data = f.read().split('\n')
-                try:
-                    self.x = float(data[0])
-                    self.y = float(data[1])
-                    self.num_robots = int(data[2])
-                except (IndexError, ValueError):
-                    self.valid = False
-        else:
-            self.valid = False
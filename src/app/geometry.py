@@ -0,0 +1,144 @@
+"""Generates simple geometry (e.g. boxes) directly from NumPy arrays."""
+
+import numpy as np
+
+# panda3d imports
+from panda3d.core import (Geom, GeomNode, GeomTriangles, GeomVertexData,
+                          GeomVertexFormat, GeomEnums)
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+# Corners of each face of a unit cube (counter-clockwise from outside)
+FACES = np.array([
+    [(1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)],  # +X
+    [(0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0)],  # -X
+    [(0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0)],  # +Y
+    [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)],  # -Y
+    [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)],  # +Z
+    [(0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)],  # -Z
+], dtype=np.float32)
+NORMALS = np.repeat(np.array([(1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0),
+                              (0, 0, 1), (0, 0, -1)], dtype=np.float32),
+                    4, axis=0)
+CORNERS = FACES.reshape(-1, 3)
+
+# Two triangles per face
+TRIANGLES = (np.arange(6)[:, None] * 4 +
+             np.array([0, 1, 2, 0, 2, 3])).reshape(-1)
+MAX_SHORT_INDEX = 0xffff
+
+# Corners of a quad, as multiples of its right and up vectors (counter-
+# clockwise when facing it), and their texture coordinates
+QUAD = np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=np.float32)
+QUAD_UVS = (QUAD + 1) / 2
+QUAD_TRIANGLES = np.array([0, 1, 2, 0, 2, 3])
+
+
+def box_node(name, boxes) -> GeomNode:
+    """Returns a GeomNode of solid (lit) boxes, from an (n, 2, 3) array of
+    box bounds (start and end corners). All boxes form a single Geom."""
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 2, 3)
+    start, size = boxes[:, 0], boxes[:, 1] - boxes[:, 0]
+    num_boxes = len(boxes)
+    num_vertices = num_boxes * len(CORNERS)
+
+    # Interleaved vertex positions and normals
+    vertices = np.empty((num_boxes, len(CORNERS), 6), dtype=np.float32)
+    vertices[..., :3] = start[:, None] + CORNERS * size[:, None]
+    vertices[..., 3:] = NORMALS
+
+    data = GeomVertexData(name, GeomVertexFormat.getV3n3(), Geom.UHStatic)
+    data.uncleanSetNumRows(num_vertices)
+    memoryview(data.modifyArray(0)).cast('B')[:] = vertices.tobytes()
+
+    offsets = np.arange(num_boxes)[:, None] * len(CORNERS)
+    geom = Geom(data)
+    geom.addPrimitive(index_triangles(TRIANGLES + offsets, num_vertices))
+    node = GeomNode(name)
+    node.addGeom(geom)
+    return node
+
+
+def mesh_node(name, vertices, triangles) -> GeomNode:
+    """Returns a GeomNode of a flat shaded (lit) mesh, from its (n, 3)
+    vertices and (m, 3) vertex indices of each triangle. Corners of a
+    triangle share its normal, so are only shared with coplanar ones."""
+    vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 3)
+    corners = vertices[np.asarray(triangles, dtype=int).reshape(-1, 3)]
+
+    normals = np.cross(corners[:, 1] - corners[:, 0],
+                       corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = normals / np.maximum(lengths, 1e-12)
+
+    # Interleaved vertex positions and normals, without repeats
+    rows = np.empty((len(corners), 3, 6), dtype=np.float32)
+    rows[..., :3] = corners
+    rows[..., 3:] = normals[:, None]
+    rows, indices = np.unique(rows.reshape(-1, 6), axis=0,
+                              return_inverse=True)
+
+    data = GeomVertexData(name, GeomVertexFormat.getV3n3(), Geom.UHStatic)
+    data.uncleanSetNumRows(len(rows))
+    memoryview(data.modifyArray(0)).cast('B')[:] = rows.tobytes()
+
+    geom = Geom(data)
+    geom.addPrimitive(index_triangles(indices, len(rows)))
+    node = GeomNode(name)
+    node.addGeom(geom)
+    return node
+
+
+def sprite_node(name, centers, radii, right, up, uvs, tile_size,
+                usage=Geom.UHStatic) -> GeomNode:
+    """Returns a GeomNode of textured quads (sprites) facing a camera, from
+    the (n, 3) centres and (n,) radii of the quads, the camera's right and
+    up vectors, and the (n, 2) lower-left texture coordinates of each
+    sprite's tile (of the given size in texture coordinates)"""
+    centers = np.asarray(centers, dtype=np.float32).reshape(-1, 3)
+    radii = np.asarray(radii, dtype=np.float32).reshape(-1, 1, 1)
+    num_sprites = len(centers)
+    num_vertices = num_sprites * len(QUAD)
+
+    # Offset of each corner from the centre of a unit quad
+    corners = (QUAD[:, :1] * np.asarray(right, dtype=np.float32) +
+               QUAD[:, 1:] * np.asarray(up, dtype=np.float32))
+
+    # Interleaved vertex positions and texture coordinates
+    vertices = np.empty((num_sprites, len(QUAD), 5), dtype=np.float32)
+    vertices[..., :3] = centers[:, None] + corners * radii
+    vertices[..., 3:] = (np.asarray(uvs, dtype=np.float32)[:, None] +
+                         QUAD_UVS * np.asarray(tile_size, dtype=np.float32))
+
+    data = GeomVertexData(name, GeomVertexFormat.getV3t2(), usage)
+    data.uncleanSetNumRows(num_vertices)
+    memoryview(data.modifyArray(0)).cast('B')[:] = vertices.tobytes()
+
+    offsets = np.arange(num_sprites)[:, None] * len(QUAD)
+    geom = Geom(data)
+    geom.addPrimitive(index_triangles(QUAD_TRIANGLES + offsets,
+                                      num_vertices, usage))
+    node = GeomNode(name)
+    node.addGeom(geom)
+    return node
+
+
+def index_triangles(indices, num_vertices,
+                    usage=Geom.UHStatic) -> GeomTriangles:
+    """Returns a GeomTriangles primitive from an array of vertex indices
+    (three per triangle)"""
+    # Index type depends on the number of vertices
+    if num_vertices > MAX_SHORT_INDEX:
+        index_type, dtype = GeomEnums.NT_uint32, np.uint32
+    else:
+        index_type, dtype = GeomEnums.NT_uint16, np.uint16
+
+    indices = np.asarray(indices).astype(dtype).reshape(-1)
+    triangles = GeomTriangles(usage)
+    triangles.setIndexType(index_type)
+    array = triangles.modifyVertices()
+    array.uncleanSetNumRows(indices.size)
+    memoryview(array).cast('B')[:] = indices.tobytes()
+    return triangles
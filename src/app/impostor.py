@@ -0,0 +1,301 @@
+"""Draws distant robots as camera-facing sprites (impostors)."""
+
+import math
+import numpy as np
+
+# panda3d imports
+from panda3d.core import (AmbientLight, Camera, DirectionalLight,
+                          FrameBufferProperties, Geom, GraphicsOutput,
+                          GraphicsPipe, LightAttrib, NodePath,
+                          OrthographicLens, RenderState, Texture,
+                          TextureAttrib, TransparencyAttrib, Vec3,
+                          WindowProperties)
+
+from .geometry import sprite_node
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+# Constants used in rendering the atlas
+TILE_SIZE = 64  # Pixels along each side of a view of a body
+HEADINGS = 8  # Views around each body
+PITCHES = 4  # Views from level with each body to above it
+VIEWS = HEADINGS * PITCHES
+MAX_CLASSES = 32  # Most common bodies drawn as impostors
+
+# Strength and direction (heading, pitch) of each light, as in Lights
+AMBIENT = 0.2
+DIRECT = ((0.8, (0, -90)), (0.6, (45, -45)))
+
+
+def view_buckets(directions):
+    """Returns the heading and pitch bucket of each of an (n, 3) array of
+    directions (from a body towards the camera)"""
+    directions = np.asarray(directions, dtype=float).reshape(-1, 3)
+    x, y, z = directions.T
+
+    azimuth = np.degrees(np.arctan2(y, x))
+    headings = np.round(azimuth / (360 / HEADINGS)).astype(int) % HEADINGS
+
+    elevation = np.degrees(np.arctan2(z, np.hypot(x, y)))
+    pitches = np.floor(elevation / (90 / PITCHES)).astype(int)
+    return headings, np.clip(pitches, 0, PITCHES - 1)
+
+
+def view_direction(heading, pitch):
+    """Returns the (unit) direction from a body to the camera at the
+    centre of a view bucket"""
+    azimuth = math.radians(heading * 360 / HEADINGS)
+    elevation = math.radians((pitch + 0.5) * 90 / PITCHES)
+    return Vec3(math.cos(azimuth) * math.cos(elevation),
+                math.sin(azimuth) * math.cos(elevation),
+                math.sin(elevation))
+
+
+class ImpostorAtlas:
+    """
+    A texture holding a view of each body, from every view bucket, packed
+    as square tiles. All tiles are rendered in a single frame, by an
+    offscreen buffer with a display region (and orthographic camera) per
+    tile, and copied to RAM so the software renderer can use them too.
+
+    Parameters
+    ---------
+    base: ShowBase -- A reference to the application root.
+    prototypes: dict -- Built bodies (Prototypes) to render, by body class.
+    """
+
+    def __init__(self, base, prototypes: dict):
+        self.base = base
+        self.texture = Texture('impostors')
+        self.index = {}  # Body class -> index of its first tile / VIEWS
+        self.centers = np.zeros((0, 3))  # Centre of each body's bounds
+        self.radii = np.zeros(0)  # Radius of each body's bounds
+        self.columns = self.rows = 1
+
+        prototypes = self.__fit(dict(prototypes))
+        if prototypes:
+            self.__render(prototypes)
+
+    @property
+    def tile_size(self):
+        """Returns the size of a tile in texture coordinates"""
+        return 1 / self.columns, 1 / self.rows
+
+    def uvs(self, classes, directions):
+        """Returns the lower-left texture coordinates of the tile viewing
+        each body (atlas index) from each (n, 3) direction"""
+        headings, pitches = view_buckets(directions)
+        tiles = np.asarray(classes) * VIEWS + pitches * HEADINGS + headings
+        return np.column_stack([tiles % self.columns,
+                                tiles // self.columns]) * self.tile_size
+
+    def __fit(self, prototypes):
+        """Sizes the atlas, dropping bodies which do not fit in a texture.
+        Returns the bodies to render."""
+        window = self.base.win
+        if window is None:
+            return {}
+
+        limit = window.getGsg().getMaxTextureDimension()
+        while prototypes:
+            tiles = len(prototypes) * VIEWS
+            self.columns = max(HEADINGS, 2 ** math.ceil(math.log2(
+                math.sqrt(tiles))))
+            self.rows = 2 ** math.ceil(math.log2(
+                math.ceil(tiles / self.columns)))
+            if max(self.columns, self.rows) * TILE_SIZE <= limit:
+                break
+            prototypes.popitem()
+
+        return prototypes
+
+    def __render(self, prototypes):
+        """Renders every view of every body into the texture."""
+        width, height = self.columns * TILE_SIZE, self.rows * TILE_SIZE
+        buffer = self.__make_buffer(width, height)
+        if buffer is None:
+            return
+
+        centers, radii = [], []
+        for i, (body_class, prototype) in enumerate(prototypes.items()):
+            start, end = prototype.bounds
+            center = (start + end) / 2
+            radius = max((end - start).length() / 2, 1e-3)
+            scene = self.__make_scene(prototype)
+
+            for view in range(VIEWS):
+                tile = i * VIEWS + view
+                self.__add_view(buffer, scene, tile, center, radius)
+
+            self.index[body_class] = i
+            centers.append(tuple(center))
+            radii.append(radius)
+
+        self.base.graphicsEngine.renderFrame()
+        self.base.graphicsEngine.removeWindow(buffer)
+        self.__make_opaque()
+        self.centers = np.array(centers)
+        self.radii = np.array(radii)
+
+    def __make_opaque(self):
+        """Makes every pixel covered by a body opaque, since robot colours
+        carry their own alpha (which the main scene ignores)."""
+        image = self.texture.modifyRamImage()
+        pixels = np.frombuffer(memoryview(image), dtype=np.uint8)
+        pixels = pixels.reshape(-1, 4)
+        pixels[:, 3] = np.where(pixels.any(axis=1), 255, 0)
+
+    def __make_buffer(self, width, height):
+        """Returns an offscreen buffer which copies to the texture (None if
+        not supported)"""
+        properties = FrameBufferProperties()
+        properties.setRgbColor(True)
+        properties.setRgbaBits(8, 8, 8, 8)
+        properties.setDepthBits(16)
+
+        buffer = self.base.graphicsEngine.makeOutput(
+            self.base.pipe, 'impostor-buffer', -100, properties,
+            WindowProperties.size(width, height),
+            GraphicsPipe.BFRefuseWindow, self.base.win.getGsg(),
+            self.base.win)
+        if buffer is None:
+            return None
+
+        buffer.addRenderTexture(self.texture, GraphicsOutput.RTMCopyRam)
+        buffer.setClearColor((0, 0, 0, 0))  # Transparent around bodies
+        buffer.setClearColorActive(True)
+        return buffer
+
+    def __make_scene(self, prototype):
+        """Returns a scene of the body's full model, with its own lights."""
+        scene = NodePath('impostor-scene')
+        prototype.levels[0].instanceTo(scene)
+
+        ambient = scene.attachNewNode(AmbientLight('ambient'))
+        ambient.node().setColor((AMBIENT, AMBIENT, AMBIENT, 1))
+        scene.setLight(ambient)
+
+        for strength, (heading, pitch) in DIRECT:
+            light = DirectionalLight('direct')
+            light.setColor((strength, strength, strength, 1))
+            direct = scene.attachNewNode(light)
+            direct.setHpr(heading, pitch, 0)
+            scene.setLight(direct)
+
+        return scene
+
+    def __add_view(self, buffer, scene, tile, center, radius):
+        """Adds the display region and camera of one tile."""
+        view = tile % VIEWS
+        column, row = tile % self.columns, tile // self.columns
+        left, bottom = column / self.columns, row / self.rows
+        region = buffer.makeDisplayRegion(left, left + 1 / self.columns,
+                                          bottom, bottom + 1 / self.rows)
+
+        lens = OrthographicLens()
+        lens.setFilmSize(2 * radius, 2 * radius)
+        lens.setNearFar(radius, 3 * radius)
+
+        camera = scene.attachNewNode(Camera(f'view-{view}', lens))
+        direction = view_direction(view % HEADINGS, view // HEADINGS)
+        camera.setPos(center + direction * 2 * radius)
+        camera.lookAt(center)
+        region.setCamera(camera)
+
+
+class Impostors:
+    """
+    Draws robots beyond the impostor distance as sprites facing the
+    camera, textured with the atlas tile of their body seen from the
+    camera's direction. The sprites of each scene partition region form a
+    single Geom under the region's node, so hidden regions hide their
+    sprites, and sprites are culled a region at a time.
+
+    Parameters
+    ---------
+    base: ShowBase -- A reference to the application root.
+    partition: ScenePartition -- The environment's scene partition.
+    robots: List -- The RobotModels which may be drawn as impostors.
+    prototypes: dict -- Built bodies (Prototypes) to render, by body class.
+    """
+
+    def __init__(self, base, partition, robots, prototypes: dict):
+        self.base = base
+        self.partition = partition
+        self.atlas = ImpostorAtlas(base, prototypes)
+        self.nodes = []  # Sprites of each region
+        self.count = 0  # Number of robots drawn as sprites
+
+        robots = list(robots)
+        positions = [tuple(model.path.getPos()) for model in robots]
+        self.positions = np.array(positions).reshape(-1, 3)
+        self.classes = np.array([self.atlas.index.get(model.body_class, -1)
+                                 for model in robots], dtype=int)
+
+        keys = [partition.region(model.position.x, model.position.y)
+                for model in robots]
+        self.regions = sorted(set(keys))
+        codes = {key: code for code, key in enumerate(self.regions)}
+        self.codes = np.array([codes[key] for key in keys], dtype=int)
+
+        self.state = RenderState.make(
+            TextureAttrib.make(self.atlas.texture),
+            TransparencyAttrib.make(TransparencyAttrib.MBinary),
+            LightAttrib.makeAllOff())
+
+    @property
+    def classes_drawn(self):
+        """Returns the body classes which can be drawn as impostors"""
+        return set(self.atlas.index)
+
+    @property
+    def tiled(self):
+        """Returns whether each robot's body can be drawn as an impostor"""
+        return self.classes >= 0
+
+    def update(self, camera: NodePath, far):
+        """Draws the robots flagged as far (and tiled) as sprites facing the
+        camera."""
+        self.clear()
+        selected = np.flatnonzero(np.asarray(far) & self.tiled)
+        self.count = len(selected)
+        if self.count == 0:
+            return
+
+        render = self.base.render
+        quat = camera.getQuat(render)
+        eye = np.array(camera.getPos(render))
+        right, up = tuple(quat.getRight()), tuple(quat.getUp())
+
+        classes = self.classes[selected]
+        centers = self.positions[selected] + self.atlas.centers[classes]
+        uvs = self.atlas.uvs(classes, eye - centers)
+        radii = self.atlas.radii[classes]
+
+        # Sorted by region so each region's sprites are contiguous
+        codes = self.codes[selected]
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(self.regions)
+                                                         + 1))
+        for code, key in enumerate(self.regions):
+            part = order[bounds[code]:bounds[code + 1]]
+            if len(part) == 0:
+                continue
+
+            i, j = key
+            node = sprite_node(f'impostors-{i}-{j}', centers[part],
+                               radii[part], right, up, uvs[part],
+                               self.atlas.tile_size, Geom.UHStream)
+            path = self.partition.node(key).attachNewNode(node)
+            path.setState(self.state)
+            self.nodes.append(path)
+
+    def clear(self):
+        """Removes all sprites."""
+        for path in self.nodes:
+            path.removeNode()
+
+        self.nodes = []
+        self.count = 0
@@ -37,16 +37,17 @@ class Keybindings:
             'shift-r': environment.rebuild,
 
             # UI & Environment
-            'control-l': ui.console.clear,
-            'shift-enter': ui.console.focus,
-            'i': ui.console.focus,
+            'control-l': self.__clear_console,
+            'shift-enter': self.__focus_console,
+            'i': self.__focus_console,
             'q': ui.exit,
             'x': environment.clear,
+            'escape': self.__handle_cancel,
         }
 
         self.COMMAND = {
             'escape': self.__handle_exit,
-            'tab': ui.console.complete,
+            'tab': self.__complete_command,
         }
 
         self.BINDINGS = [self.INTERACTIVE, self.COMMAND]
@@ -73,6 +74,21 @@ class Keybindings:
             self.base.ignore(key)
             self.base.ignore(f'{key}-repeat')
 
+    # The console is only built once used
+    def __clear_console(self):
+        self.base.ui.console.clear()
+
+    def __focus_console(self):
+        self.base.ui.console.focus()
+
+    def __complete_command(self):
+        self.base.ui.console.complete()
+
+    def __handle_cancel(self):
+        """Cancels a build in progress (reporting to the console)"""
+        if self.base.environment.building:
+            self.base.ui.console.parse('cancel')
+
     def __handle_exit(self):
         ui = self.base.ui
         if ui.console.has_focus:
@@ -0,0 +1,125 @@
+"""Computes where each component of a robot body is placed."""
+
+import numpy as np
+
+from ..blueprint import Blueprint, COMPONENT_TYPES
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+TOLERANCE = 0.02  # Offset for slotting two components together
+SLOT_OFFSET = 0.15 + TOLERANCE  # Offset for slotting two components together
+
+# Heading of each parent slot according to:
+# https://robogen.org/docs/building-your-robot/#3D-print
+SLOT_HEADINGS = np.array([90, 270, 0, 180])
+ONE_WAY_SLOT = 2  # One way components only have one slot
+
+# Flags of each component type, indexed by type code
+SLOTS_IN = np.array([t.slots_in for t in COMPONENT_TYPES])
+HAS_SLOT = np.array([t.has_slot for t in COMPONENT_TYPES])
+ONE_WAY = np.array([t.is_one_way for t in COMPONENT_TYPES])
+
+
+class Layout:
+    """
+    Transforms of the components of a body relative to its root component,
+    found arithmetically from its blueprint. Each component is offset from
+    its parent along the heading of the parent's slot, so the components
+    of a tree at the same depth are all placed at once. The bounds of the
+    body follow from the (stored) bounds of each component's model.
+
+    Parameters
+    ---------
+    blueprint: Blueprint -- The compiled body.
+    metrics: MetricsTable -- Metrics of each component type's model.
+    """
+
+    def __init__(self, blueprint: Blueprint, metrics):
+        self.size = blueprint.size
+        types = np.array(blueprint.types, dtype=int)
+        parents = np.array(blueprint.parents, dtype=int)
+        slots = np.array(blueprint.slots, dtype=int)
+        orientations = np.array(blueprint.orientations, dtype=float)
+
+        models = [metrics.get(t.name, t.model_path).bounds
+                  for t in COMPONENT_TYPES]
+        model_bounds = np.array([[tuple(p) for p in b] for b in models])
+        self.model_bounds = model_bounds[types].reshape(-1, 2, 3)
+        self.sizes = self.model_bounds[:, 1] - self.model_bounds[:, 0]
+        self.headings = np.zeros(self.size)  # Heading of each component
+        self.positions = np.zeros((self.size, 3))
+
+        if self.size > 0:
+            self.__place(types, parents, slots, orientations)
+
+        # Models of one way components are not rotated by their orientation
+        self.model_headings = np.where(ONE_WAY[types], self.headings,
+                                       self.headings + orientations)
+        self.component_bounds = self.__get_component_bounds()
+        self.bounds = self.__get_bounds()
+
+    def __place(self, types, parents, slots, orientations):
+        """Finds the heading and position of each (non-root) component."""
+        child = parents >= 0
+        parents = np.where(child, parents, 0)
+        one_way = ONE_WAY[types][parents]
+
+        # Heading of the parent's slot (relative to the parent)
+        slot_headings = np.where(
+            one_way, SLOT_HEADINGS[ONE_WAY_SLOT],
+            SLOT_HEADINGS[np.where(child, slots, 0) % 4] +
+            orientations[parents])
+
+        # Distance from the parent along the heading of its slot
+        width = self.sizes[:, 0]
+        parent_width = width[parents]
+        difference = (parent_width - width) / 2 - TOLERANCE
+        slotted = ((HAS_SLOT[types][parents] & SLOTS_IN[types]) |
+                   (SLOTS_IN[types][parents] & HAS_SLOT[types]))
+        offsets = parent_width - difference - slotted * SLOT_OFFSET
+
+        # Parents precede children, so each depth only needs the last
+        depths = np.zeros(self.size, dtype=int)
+        for i in range(1, self.size):
+            depths[i] = depths[parents[i]] + 1
+
+        for depth in range(1, depths.max() + 1):
+            level = np.flatnonzero(depths == depth)
+            above = parents[level]
+            self.headings[level] = self.headings[above] + slot_headings[level]
+
+            radians = np.radians(self.headings[level])
+            self.positions[level] = self.positions[above]
+            self.positions[level, 0] += offsets[level] * np.cos(radians)
+            self.positions[level, 1] += offsets[level] * np.sin(radians)
+
+    def __get_component_bounds(self):
+        """Returns the (size, 2, 3) bounds of each component, from the
+        bounds of its model rotated to its heading"""
+        start, end = self.model_bounds[:, 0], self.model_bounds[:, 1]
+        center = (start + end) / 2
+        extent = (end - start) / 2
+
+        radians = np.radians(self.model_headings)
+        cos, sin = np.cos(radians), np.sin(radians)
+        x, y = center[:, 0], center[:, 1]
+        center = np.column_stack([x * cos - y * sin, x * sin + y * cos,
+                                  center[:, 2]]) + self.positions
+
+        # Extents of the box (about its centre) once rotated
+        cos, sin = np.abs(cos), np.abs(sin)
+        x, y = extent[:, 0], extent[:, 1]
+        extent = np.column_stack([x * cos + y * sin, x * sin + y * cos,
+                                  extent[:, 2]])
+
+        return np.stack([center - extent, center + extent], axis=1)
+
+    def __get_bounds(self):
+        """Returns the (2, 3) bounds of the body"""
+        if self.size == 0:
+            return np.zeros((2, 3))
+
+        return np.array([self.component_bounds[:, 0].min(axis=0),
+                         self.component_bounds[:, 1].max(axis=0)])
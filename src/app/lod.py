@@ -0,0 +1,82 @@
+"""Level of detail (LOD) at which robots are drawn."""
+
+import numpy as np
+
+# panda3d imports
+from panda3d.core import LODNode
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+# Default switch distances (from the camera)
+NEAR = 150  # Robots are drawn in full up to this distance
+MIDDLE = 300  # Components are drawn decimated up to this distance
+FAR = 600  # Components are drawn as boxes up to this distance
+IMPOSTOR = 1000  # Robots are drawn as (at least) a box up to this distance
+MAX_DISTANCE = 1e6
+
+# Levels of detail, in order of distance
+LEVELS = ('Full', 'Decimated', 'Boxes', 'Box', 'Impostor')
+BOX_LEVEL = LEVELS.index('Box')
+
+
+class LevelOfDetail:
+    """
+    Distances at which robots switch between levels of detail: their full
+    component models, decimated component models, a box per component, a
+    single box per robot and, beyond that, an impostor (a sprite drawn by
+    Impostors, so the level itself is empty). Bodies without an impostor
+    stay boxes instead.
+
+    Parameters
+    ---------
+    near: float -- Distance beyond which components are drawn decimated.
+    middle: float -- Distance beyond which components are drawn as boxes.
+    far: float -- Distance beyond which robots are drawn as a single box.
+    impostor: float -- Distance beyond which robots are drawn as sprites.
+    """
+
+    def __init__(self, near=NEAR, middle=MIDDLE, far=FAR,
+                 impostor=IMPOSTOR):
+        self.near = near
+        self.middle = middle
+        self.far = far
+        self.impostor = impostor
+
+    def switches(self, impostor=False):
+        """Returns the (in, out) switch distances of each level (the
+        impostor level is never switched in unless enabled)"""
+        switches = [(self.near, 0), (self.middle, self.near),
+                    (self.far, self.middle)]
+        if impostor:
+            return switches + [(self.impostor, self.far),
+                               (MAX_DISTANCE, self.impostor)]
+
+        return switches + [(MAX_DISTANCE, self.far),
+                           (MAX_DISTANCE, MAX_DISTANCE)]
+
+    def make(self, name, impostor=False) -> LODNode:
+        """Returns a new LODNode with a switch for each level"""
+        node = LODNode(name)
+        for switch_in, switch_out in self.switches(impostor):
+            node.addSwitch(switch_in, switch_out)
+
+        return node
+
+    def apply(self, node: LODNode, impostor=False):
+        """Updates the switch distances of an LODNode"""
+        for i, (switch_in, switch_out) in enumerate(self.switches(impostor)):
+            node.setSwitch(i, switch_in, switch_out)
+
+    def levels(self, distances, impostor=False):
+        """Returns the level drawn at each of an array of distances. Whether
+        impostors are enabled may be given per distance."""
+        levels = np.searchsorted([self.near, self.middle, self.far,
+                                  self.impostor], distances, side='right')
+        return np.where(impostor, levels, np.minimum(levels, BOX_LEVEL))
+
+    def counts(self, distances, impostor=False):
+        """Returns the number of distances drawn at each level"""
+        levels = self.levels(distances, impostor)
+        return np.bincount(levels, minlength=len(LEVELS))
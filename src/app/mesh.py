@@ -0,0 +1,125 @@
+"""Reads and simplifies triangle meshes (e.g. Robogen STL components)."""
+
+import numpy as np
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+# Binary STL: an 80 byte header and triangle count, then each triangle
+STL_HEADER = 84
+STL_TRIANGLE = np.dtype([('normal', '<f4', 3), ('vertices', '<f4', (3, 3)),
+                         ('attribute', '<u2')])
+
+# Robogen meshes are in mm (as are the egg models), but are modelled with
+# their mounting face along z: model axes (x, y, z) are STL axes (z, x, y)
+STL_AXES = (2, 0, 1)
+STL_SCALE = 1.0
+
+DECIMATE_CELLS = 12  # Clusters along the longest side of a decimated mesh
+REGULARIZATION = 1e-3  # Pull of a cluster's vertex towards their mean
+
+
+def weld(corners):
+    """Returns the unique vertices of an (n, 3, 3) array of triangle corners
+    and the (n, 3) vertex indices of each triangle"""
+    corners = np.asarray(corners, dtype=np.float32).reshape(-1, 3)
+    vertices, indices = np.unique(corners, axis=0, return_inverse=True)
+    return vertices, indices.reshape(-1, 3)
+
+
+def read_stl(path):
+    """Returns the (welded) vertices and triangles of an STL file, binary
+    or ASCII"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    count = int.from_bytes(data[80:STL_HEADER], 'little')
+    if len(data) == STL_HEADER + count * STL_TRIANGLE.itemsize:
+        triangles = np.frombuffer(data, STL_TRIANGLE, count, STL_HEADER)
+        return weld(triangles['vertices'])
+
+    # ASCII files list each corner as 'vertex x y z'
+    lines = data.decode('ascii', 'replace').split('\n')
+    corners = [line.split()[1:4] for line in lines
+               if line.strip().startswith('vertex')]
+    if not corners or len(corners) % 3:
+        raise ValueError(f'Invalid STL file "{path}"')
+
+    return weld(np.array(corners, dtype=np.float32))
+
+
+def to_model_frame(vertices, axes=STL_AXES, scale=STL_SCALE):
+    """Returns STL vertices in the frame of the egg models: axes reordered
+    (a rotation, so triangles keep their winding), scaled and centred on
+    the origin"""
+    vertices = np.asarray(vertices, dtype=np.float32)[:, list(axes)] * scale
+    if len(vertices) == 0:
+        return vertices
+
+    center = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+    return vertices - center
+
+
+def plane_quadrics(vertices, triangles):
+    """Returns the (n, 4, 4) error quadric of the plane of each triangle,
+    weighted by its area"""
+    a, b, c = (vertices[triangles[:, i]] for i in range(3))
+    normals = np.cross(b - a, c - a)
+    areas = np.linalg.norm(normals, axis=1)
+    normals = normals / np.maximum(areas, 1e-12)[:, None]
+
+    planes = np.column_stack([normals, -np.sum(normals * a, axis=1)])
+    return areas[:, None, None] / 2 * planes[:, :, None] * planes[:, None]
+
+
+def decimate(vertices, triangles, cells=DECIMATE_CELLS):
+    """
+    Simplifies a mesh by vertex clustering: vertices are grouped in a grid
+    of cubic cells, and each group is replaced by the point of least
+    quadric error to the planes of its triangles (their summed quadrics).
+    Triangles which collapse, or repeat another, are removed. Returns the
+    new vertices and triangles.
+    """
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    triangles = np.asarray(triangles, dtype=int).reshape(-1, 3)
+    if len(triangles) == 0:
+        return vertices, triangles
+
+    start = vertices.min(axis=0)
+    size = max((vertices.max(axis=0) - start).max() / cells, 1e-6)
+    keys = np.floor((vertices - start) / size).astype(int)
+    _, clusters = np.unique(keys, axis=0, return_inverse=True)
+    clusters = clusters.reshape(-1)
+    num_clusters = clusters.max() + 1
+
+    # Quadric of each cluster, from the triangles around its vertices
+    quadrics = plane_quadrics(vertices, triangles)
+    summed = np.zeros((num_clusters, 4, 4))
+    for i in range(3):
+        np.add.at(summed, clusters[triangles[:, i]], quadrics)
+
+    counts = np.bincount(clusters, minlength=num_clusters)[:, None]
+    means = np.zeros((num_clusters, 3))
+    np.add.at(means, clusters, vertices)
+    means /= counts
+
+    # Least error point, pulled slightly towards the mean so flat (or
+    # empty) clusters are still solvable
+    A, b = summed[:, :3, :3], summed[:, :3, 3]
+    weight = REGULARIZATION * (np.trace(A, axis1=1, axis2=2) + 1e-12)
+    A = A + weight[:, None, None] * np.eye(3)
+    points = np.linalg.solve(A, (weight[:, None] * means - b)[..., None])
+
+    collapsed = clusters[triangles]
+    a, b, c = collapsed.T
+    collapsed = collapsed[(a != b) & (b != c) & (a != c)]
+
+    # A triangle repeats another if it has the same corners, in any order
+    _, first = np.unique(np.sort(collapsed, axis=1), axis=0,
+                         return_index=True)
+    collapsed = collapsed[np.sort(first)]
+
+    # Only clusters still used by a triangle are kept
+    used, remap = np.unique(collapsed, return_inverse=True)
+    return points[used, :, 0], remap.reshape(-1, 3)
@@ -0,0 +1,109 @@
+"""Precomputed per-component-type model metrics used in robot building."""
+
+import json
+from pathlib import Path
+
+# panda3d imports
+from panda3d.core import Point3
+
+from ..util import file_hash
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+BASE_DIR = Path(__file__).parents[2]
+COMPONENT_DIR = BASE_DIR / 'assets' / 'models' / 'components' / 'egg'
+METRICS_FILE = 'metrics.json'  # Stored alongside the component models
+
+
+class ModelMetrics:
+    """
+    Measurements of a single (scaled) component model.
+
+    Parameters
+    ---------
+    start: Point3 -- Minimum corner of the model's bounds.
+    end: Point3 -- Maximum corner of the model's bounds.
+    """
+
+    def __init__(self, start, end):
+        self.bounds = (Point3(*start), Point3(*end))
+        self.size = self.bounds[1] - self.bounds[0]
+        self.center = (self.bounds[0] + self.bounds[1]) / 2
+
+    def to_dict(self):
+        """Returns metrics as a JSON serialisable dictionary"""
+        start, end = self.bounds
+        return {'start': list(start), 'end': list(end)}
+
+
+class MetricsTable:
+    """
+    Table of model metrics for each component type. Each model is only
+    measured (getTightBounds) when its model file changes; results are stored
+    on disk next to the models and checked against the file's hash.
+
+    Parameters
+    ---------
+    assets: AssetCache -- The application's (compiled) models.
+    scale: float -- Scale applied to every component model.
+    directory: Path -- Location of the component models.
+    """
+
+    def __init__(self, assets, scale, directory=COMPONENT_DIR):
+        self.assets = assets
+        self.scale = scale
+        self.directory = Path(directory)
+        self.path = self.directory / METRICS_FILE
+        self.table = self.__read()
+        self.metrics = {}  # Metrics verified during this session
+
+    def __read(self):
+        """Reads the stored table, returning an empty table if invalid"""
+        try:
+            with self.path.open('r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def __write(self):
+        """Writes the table to disk (skipped if the location is read-only)"""
+        try:
+            with self.path.open('w') as f:
+                json.dump(self.table, f, indent=1, sort_keys=True)
+        except OSError:
+            pass
+
+    def __measure(self, source):
+        """Loads and measures a component model."""
+        model = self.assets.load(source)
+        model.setScale(self.scale)
+        start, end = model.getTightBounds()
+        return ModelMetrics(start, end)
+
+    def get(self, name, source=None) -> ModelMetrics:
+        """Returns metrics for a component type (e.g. 'FixedBrick'), whose
+        model is its egg file in the directory unless another source (e.g.
+        an STL file) is given."""
+        if name in self.metrics:
+            return self.metrics[name]
+
+        source = Path(source or self.directory / name)
+        if not source.suffix:
+            source = source.with_suffix('.egg')
+
+        digest = file_hash(source)
+        entry = self.table.get(name)
+
+        if entry and entry['hash'] == digest and entry['scale'] == self.scale:
+            metrics = ModelMetrics(entry['start'], entry['end'])
+        else:
+            metrics = self.__measure(source)
+            entry = metrics.to_dict()
+            entry.update({'hash': digest, 'scale': self.scale})
+            self.table[name] = entry
+            self.__write()
+
+        self.metrics[name] = metrics
+        return metrics
@@ -0,0 +1,147 @@
+"""Builds robots only while they are near the camera (paged world mode)."""
+
+import time
+from collections import OrderedDict, defaultdict
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+# Constants used in paging robots
+PAGE_SIZE = 500  # Width of each page (scene partition region)
+PAGE_RADIUS = 1000  # Pages within this distance of the camera are built
+PAGE_BUDGET = 64  # Memory (MB) of built robots kept before evicting pages
+ROBOT_MEMORY = 4.5 * 1024  # Estimated memory of a built robot (bytes)
+
+
+class RobotRecord:
+    """
+    A robot registered but not built. Holds only what is needed to check
+    where it can be placed and to build it later.
+
+    Parameters
+    ---------
+    id: str -- The robot's id.
+    position: Vec3 -- Position of the robot.
+    body_class: int -- The robot's body class.
+    bounds: Tuple -- Bounds of the robot once built (start and end points).
+    """
+
+    __slots__ = ('id', 'position', 'body_class', 'bounds')
+
+    def __init__(self, id, position, body_class, bounds):
+        self.id = id
+        self.position = position
+        self.body_class = body_class
+        self.bounds = bounds
+
+
+class Pager:
+    """
+    Pages robots in and out of the scene, a scene partition region (page)
+    at a time. Pages within a radius of the camera's origin are built,
+    nearest first, a few robots per frame. Once the robots built would
+    exceed the memory budget, the least recently used pages out of range
+    are evicted.
+
+    Parameters
+    ---------
+    partition: ScenePartition -- The environment's scene partition.
+    build: Callable -- Builds a RobotModel from a RobotRecord.
+    radius: float -- Distance from the camera within which pages are built.
+    budget: float -- Memory (MB) of the robots which may be built at once.
+    """
+
+    def __init__(self, partition, build, radius=PAGE_RADIUS,
+                 budget=PAGE_BUDGET):
+        self.partition = partition
+        self.build = build
+        self.radius = radius
+        self.budget = budget
+        self.pages = defaultdict(list)  # Region -> RobotRecords
+        self.loaded = OrderedDict()  # Region -> RobotModels (LRU first)
+        self.count = 0  # Number of registered robots
+        self.size = 0  # Number of built robots
+        self.full = False  # Whether the budget stopped a page being built
+        self.changed = False  # Whether robots were built or evicted
+
+    @property
+    def capacity(self):
+        """Returns the number of robots which may be built at once"""
+        return int(self.budget * 1024 * 1024 // ROBOT_MEMORY)
+
+    @property
+    def models(self):
+        """Returns every built robot"""
+        return [model for models in self.loaded.values() for model in models]
+
+    def register(self, record: RobotRecord):
+        """Adds a robot to the page of the region containing it."""
+        position = record.position
+        key = self.partition.region(position.x, position.y)
+        self.partition.node(key)  # Pages are found by their regions
+        self.pages[key].append(record)
+        self.count += 1
+
+    def step(self, origin, until):
+        """Builds robots of the pages in range of a point (the camera's
+        origin), until the given time."""
+        wanted = self.partition.within(origin.x, origin.y, self.radius)
+        for key in reversed(wanted):  # Nearest page is used most recently
+            if key in self.loaded:
+                self.loaded.move_to_end(key)
+
+        self.full = not self.__reserve(0, set(wanted))  # Budget may shrink
+        for key in wanted:
+            page = self.pages[key]
+            models = self.loaded.get(key)
+            if models is None:
+                if not self.__reserve(len(page), set(wanted)):
+                    self.full = True
+                    return
+
+                models = self.loaded[key] = []
+
+            while len(models) < len(page):
+                if time.time() >= until:
+                    return
+
+                model = self.build(page[len(models)])
+                self.partition.add(model)
+                models.append(model)
+                self.size += 1
+                self.changed = True
+
+    def evict(self, key):
+        """Removes the built robots of a page."""
+        models = self.loaded.pop(key, [])
+        for model in models:
+            model.path.removeNode()
+
+        self.size -= len(models)
+        self.changed = True
+
+    def remove(self, key):
+        """Removes a page (and its built robots) for good, returning the
+        records of its robots."""
+        self.evict(key)
+        records = self.pages.pop(key, [])
+        self.count -= len(records)
+        return records
+
+    def clear(self):
+        """Removes every built robot."""
+        for key in list(self.loaded):
+            self.evict(key)
+
+    def __reserve(self, count, wanted):
+        """Evicts pages out of range, least recently used first, until
+        count more robots fit in the budget. Returns whether they fit."""
+        while self.size + count > self.capacity:
+            key = next((k for k in self.loaded if k not in wanted), None)
+            if key is None:
+                return False
+
+            self.evict(key)
+
+        return True
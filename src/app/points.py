@@ -0,0 +1,99 @@
+"""Draws every robot as a single point (an overview of very large swarms)."""
+
+import numpy as np
+
+# panda3d imports
+from panda3d.core import (Geom, GeomEnums, GeomNode, GeomPoints,
+                          GeomVertexArrayFormat, GeomVertexData,
+                          GeomVertexFormat, InternalName, LightAttrib,
+                          RenderModeAttrib, RenderState)
+
+from ..robot import COLORS
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+# Constants used in drawing points
+POINT_SIZE = 3  # Pixels
+POINT_HEIGHT = 1  # Points are raised above the terrain
+POINTS_MIN_ROBOTS = 50000  # Larger environments are drawn as points
+PALETTE = np.array([(r, g, b, 255) for r, g, b, _ in COLORS.values()],
+                   dtype=np.uint8)  # Opaque robot colours
+
+
+def make_format():
+    """Returns the (registered) vertex format of a point cloud: positions
+    as packed float triples, as positions are stored, and colours as bytes,
+    each in an array of its own so both are copied in whole"""
+    positions = GeomVertexArrayFormat()
+    positions.addColumn(InternalName.getVertex(), 3,
+                        GeomEnums.NT_float32, GeomEnums.C_point)
+    colors = GeomVertexArrayFormat()
+    colors.addColumn(InternalName.getColor(), 4,
+                     GeomEnums.NT_uint8, GeomEnums.C_color)
+
+    vertex_format = GeomVertexFormat()
+    vertex_format.addArray(positions)
+    vertex_format.addArray(colors)
+    return GeomVertexFormat.registerFormat(vertex_format)
+
+
+POINT_FORMAT = make_format()
+
+
+def robot_colors(count, rng=None):
+    """Returns an (n, 4) array of colours picked, as a Robot picks its
+    colour, at random from the robot colours"""
+    rng = rng or np.random.default_rng()
+    return PALETTE[rng.integers(len(PALETTE), size=count)]
+
+
+def points_node(name, positions, colors) -> GeomNode:
+    """Returns a GeomNode with a point (one vertex of a single GeomPoints)
+    at each of an (n, 3) array of positions, coloured by an (n, 4) array
+    of RGBA bytes"""
+    positions = np.ascontiguousarray(positions, dtype=np.float32)
+    colors = np.ascontiguousarray(colors, dtype=np.uint8)
+    num_points = len(positions)
+
+    data = GeomVertexData(name, POINT_FORMAT, Geom.UHStatic)
+    data.uncleanSetNumRows(num_points)
+    memoryview(data.modifyArray(0)).cast('B')[:] = positions.tobytes()
+    memoryview(data.modifyArray(1)).cast('B')[:] = colors.tobytes()
+
+    points = GeomPoints(Geom.UHStatic)
+    points.addConsecutiveVertices(0, num_points)
+
+    geom = Geom(data)
+    geom.addPrimitive(points)
+    node = GeomNode(name)
+    node.addGeom(geom)
+    return node
+
+
+class PointCloud:
+    """
+    The robots of an environment drawn as points, straight from their
+    positions, without building any robot bodies.
+
+    Parameters
+    ---------
+    parent: NodePath -- Node under which the points are placed.
+    positions: Array -- An (n, 3) array of robot positions.
+    """
+
+    def __init__(self, parent, positions):
+        positions = np.asarray(positions).reshape(-1, 3)
+        self.size = len(positions)
+
+        node = points_node('points', positions, robot_colors(self.size))
+        self.path = parent.attachNewNode(node)
+        self.path.setZ(POINT_HEIGHT)
+        self.path.setState(RenderState.make(
+            RenderModeAttrib.make(RenderModeAttrib.MPoint, POINT_SIZE),
+            LightAttrib.makeAllOff()))
+
+    def remove(self):
+        """Removes the points."""
+        self.path.removeNode()
@@ -0,0 +1,88 @@
+"""Times the phases of building an environment, for statistics and traces."""
+
+import os
+import json
+import time
+from collections import Counter, defaultdict
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+# Phases of a build, in the order they are shown ('Load' reads the files
+# as a whole, 'Parse' reads each robot's record from them)
+PHASES = ('Load', 'Parse', 'Setup', 'Workers', 'Robot', 'Fetch', 'Place',
+          'Bounds', 'Collision', 'Bounds Check', 'Reparent', 'Register',
+          'Points', 'Finish')
+BUILD = 'Build'  # Span of a whole build (traced, not shown as a phase)
+MAX_EVENTS = 1000000  # Trace events kept (each about 100 bytes)
+TRACE_FILE = 'trace.json'  # Default trace location (in the data directory)
+
+clock = time.perf_counter
+
+
+class Profiler:
+    """
+    Sums the time spent in each phase of a build, and how often each phase
+    ran. Phases are timed by marking their end: marking returns the time,
+    which starts the next phase. While tracing, every phase is also kept
+    as an event, to be written as a Chrome trace (trace-event JSON).
+    """
+
+    def __init__(self):
+        self.tracing = False
+        self.reset()
+
+    def reset(self, origin=None):
+        """Clears all timings (and events), starting again from a time."""
+        self.origin = clock() if origin is None else origin
+        self.totals = defaultdict(float)  # Phase -> seconds
+        self.counts = Counter()  # Phase -> times run
+        self.events = []  # (phase, start, end, robot id) while tracing
+        self.dropped = 0  # Events not kept (over MAX_EVENTS)
+
+    def add(self, phase, start, end, id=None):
+        """Adds a phase which ran from start to end (of a robot)."""
+        self.totals[phase] += end - start
+        self.counts[phase] += 1
+        if self.tracing:
+            if len(self.events) < MAX_EVENTS:
+                self.events.append((phase, start, end, id))
+            else:
+                self.dropped += 1
+
+    def mark(self, phase, start, id=None):
+        """Ends a phase started at the given time. Returns the time now."""
+        now = clock()
+        self.add(phase, start, now, id)
+        return now
+
+    @property
+    def phases(self):
+        """Returns (phase, seconds, count) of each phase run, in order"""
+        order = [phase for phase in PHASES if phase in self.totals]
+        order += [phase for phase in self.totals
+                  if phase not in PHASES and phase != BUILD]
+        return [(phase, self.totals[phase], self.counts[phase])
+                for phase in order]
+
+    def trace(self):
+        """Returns the events as a Chrome trace (complete events, in
+        microseconds from the origin)"""
+        pid = os.getpid()
+        events = []
+        for phase, start, end, id in self.events:
+            event = {'name': phase, 'cat': 'build', 'ph': 'X', 'pid': pid,
+                     'tid': 0, 'ts': (start - self.origin) * 1e6,
+                     'dur': (end - start) * 1e6}
+            if id is not None:
+                event['args'] = {'robot': id}
+            events.append(event)
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'dropped': self.dropped}}
+
+    def write(self, path):
+        """Writes the events to a Chrome trace file."""
+        with open(path, 'w') as f:
+            json.dump(self.trace(), f)
@@ -0,0 +1,187 @@
+"""Spatial index used to find robots near a given region of the terrain."""
+
+import math
+from collections import defaultdict
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+# Constants used in sizing grid cells
+MIN_CELL_SIZE = 10
+DIVISIONS = 16  # Scene partition regions (at most) along each axis
+
+
+class SpatialGrid:
+    """
+    A uniform grid over the XY plane of the terrain. Each item is stored
+    in every cell its bounding box touches, so that only items in nearby
+    cells have to be tested against a candidate.
+
+    Parameters
+    ---------
+    x: float -- Half-width of the terrain (EnvironmentConfig.x)
+    y: float -- Half-depth of the terrain (EnvironmentConfig.y)
+    count: int -- Expected number of items, used to size the cells.
+    """
+
+    def __init__(self, x, y, count):
+        self.x = x
+        self.y = y
+        self.size = self.__cell_size(x, y, count)
+        self.cells = defaultdict(list)
+
+    def __cell_size(self, x, y, count):
+        """Returns a cell size giving roughly one item per cell."""
+        area = (2 * x) * (2 * y)
+        size = math.sqrt(area / max(count, 1))
+        return max(size, MIN_CELL_SIZE)
+
+    def cell(self, x, y):
+        """Returns the (column, row) of the cell containing a point."""
+        i = math.floor((x + self.x) / self.size)
+        j = math.floor((y + self.y) / self.size)
+        return i, j
+
+    def span(self, bounds):
+        """Returns all cells touched by a (start, end) bounding box."""
+        start, end = bounds
+        i_start, j_start = self.cell(start.x, start.y)
+        i_end, j_end = self.cell(end.x, end.y)
+
+        return [(i, j) for i in range(i_start, i_end + 1)
+                for j in range(j_start, j_end + 1)]
+
+    def insert(self, item, bounds):
+        """Adds an item to every cell its bounding box touches."""
+        for key in self.span(bounds):
+            self.cells[key].append(item)
+
+    def remove(self, item, bounds):
+        """Removes an item previously inserted with the same bounds."""
+        for key in self.span(bounds):
+            try:
+                self.cells[key].remove(item)
+            except ValueError:
+                pass
+
+    def query(self, bounds):
+        """Returns items in cells touched by the bounding box (no repeats)."""
+        seen = set()
+        items = []
+        for key in self.span(bounds):
+            for item in self.cells.get(key, ()):
+                if id(item) not in seen:
+                    seen.add(id(item))
+                    items.append(item)
+
+        return items
+
+    def clear(self):
+        """Removes all items from the grid."""
+        self.cells = defaultdict(list)
+
+
+class ScenePartition:
+    """
+    Partitions the scene graph into a grid of region nodes over the
+    terrain, each a square block of SpatialGrid cells. Robots are parented
+    to the region containing them, so a region out of view is culled in a
+    single test, and regions can be hidden, shown or removed as a whole.
+
+    Parameters
+    ---------
+    grid: SpatialGrid -- The environment's spatial index.
+    parent: NodePath -- Node under which regions are placed (e.g. render).
+    divisions: int -- Maximum number of regions along each axis.
+    """
+
+    def __init__(self, grid: SpatialGrid, parent, divisions=DIVISIONS):
+        self.grid = grid
+        self.path = parent.attachNewNode('partition')
+        self.regions = {}  # (column, row) -> NodePath
+
+        # Regions are aligned to (a whole number of) grid cells
+        size = 2 * max(grid.x, grid.y) / divisions
+        self.cells = max(1, math.ceil(size / grid.size))
+        self.size = self.cells * grid.size
+
+    def region(self, x, y):
+        """Returns the (column, row) of the region containing a point."""
+        i, j = self.grid.cell(x, y)
+        return i // self.cells, j // self.cells
+
+    def span(self, bounds):
+        """Returns all existing regions touched by a bounding box."""
+        start, end = bounds
+        i_start, j_start = self.region(start.x, start.y)
+        i_end, j_end = self.region(end.x, end.y)
+
+        return [key for key in self.regions
+                if i_start <= key[0] <= i_end and j_start <= key[1] <= j_end]
+
+    def bounds(self, key):
+        """Returns the (x, y) start and end corners of a region."""
+        i, j = key
+        start = (i * self.size - self.grid.x, j * self.size - self.grid.y)
+        return start, (start[0] + self.size, start[1] + self.size)
+
+    def within(self, x, y, radius):
+        """Returns all existing regions within a distance of a point,
+        nearest first."""
+        i_start, j_start = self.region(x - radius, y - radius)
+        i_end, j_end = self.region(x + radius, y + radius)
+
+        distances = {}
+        for i in range(i_start, i_end + 1):
+            for j in range(j_start, j_end + 1):
+                if (i, j) not in self.regions:
+                    continue
+
+                # Distance to the nearest point of the region
+                (x_start, y_start), (x_end, y_end) = self.bounds((i, j))
+                dx = max(x_start - x, 0, x - x_end)
+                dy = max(y_start - y, 0, y - y_end)
+                distance = math.hypot(dx, dy)
+                if distance <= radius:
+                    distances[(i, j)] = distance
+
+        return sorted(distances, key=distances.get)
+
+    def node(self, key):
+        """Returns the node of a region (creating it if needed)."""
+        if key not in self.regions:
+            i, j = key
+            self.regions[key] = self.path.attachNewNode(f'region-{i}-{j}')
+
+        return self.regions[key]
+
+    def add(self, model):
+        """Places a robot (RobotModel) under the node of its region."""
+        position = model.position
+        model.path.reparentTo(self.node(self.region(position.x, position.y)))
+
+    def hide(self, key=None):
+        """Hides all regions (or only the given region)."""
+        if key is None:
+            self.path.hide()
+        elif key in self.regions:
+            self.regions[key].hide()
+
+    def show(self, key=None):
+        """Shows all regions (or only the given region)."""
+        if key is None:
+            self.path.show()
+            for region in self.regions.values():
+                region.show()
+        elif key in self.regions:
+            self.regions[key].show()
+
+    def remove(self, key=None):
+        """Removes all regions (or only the given region), along with every
+        robot in them."""
+        if key is None:
+            self.path.removeNode()
+            self.regions = {}
+        elif key in self.regions:
+            self.regions.pop(key).removeNode()
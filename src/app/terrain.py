@@ -12,6 +12,7 @@ __date__ = "21 September 2022"
 # Constants
 BASE_DIR = Path(__file__).parents[2]
 MODEL_DIR = BASE_DIR / 'assets' / 'models' / 'terrain' / 'egg'
+TERRAIN_MODEL = MODEL_DIR / 'Cube'
 SKY_SCALE = 50
 GROUND_HEIGHT = 2
 
@@ -37,7 +38,7 @@ class Terrain:
         m.setSpecular(c.lighten(0.2))
 
         # Defines size of terrain based on config file
-        model = self.base.loader.loadModel(f'{MODEL_DIR}/Cube')
+        model = self.base.assets.load(TERRAIN_MODEL)
         model.setScale(config.x, config.y, GROUND_HEIGHT)
         model.setZ(-GROUND_HEIGHT / 2)
 
@@ -5,7 +5,6 @@ from direct.gui.OnscreenText import OnscreenText
 from panda3d.core import TextNode
 from pathlib import Path
 
-from .create import Create
 from .common import Mode
 
 __author__ = "Jonty Doyle"
@@ -51,10 +50,27 @@ class Bar:
                                     fg=self.base.COLORS['red']
                                     )
 
+        self.__progress = OnscreenText(text='',
+                                       parent=self.app.a2dTopLeft,
+                                       pos=(0.07, -0.18),
+                                       scale=0.04,
+                                       align=TextNode.ALeft,
+                                       font=self.base.FONT_MONO_ITALIC,
+                                       fg=self.base.COLORS['bg-dark'])
+
     def unfocus(self):
         """Show all items in the bar"""
         self.save_entry['focus'] = False
 
+    def progress(self, text):
+        """Shows progress of a long running task under the bar (or hides
+        it if text is None)."""
+        if text is None:
+            self.__progress.hide()
+        else:
+            self.__progress.setText(text)
+            self.__progress.show()
+
     def load_menu(self):
         """Switchs to the model menu screen."""
         pass
@@ -50,15 +50,8 @@ class BaseUI:
             'none': Color((0, 0, 0, 0)).value
         }
 
-        load_font = self.base.loader.loadFont
-        # Fonts for menu system.
-        FONT_PATH = self.ASSET_DIR / 'fonts'
-        self.FONT_REGULAR = load_font(f'{FONT_PATH}/regular.ttf')
-        self.FONT_ITALIC = load_font(f'{FONT_PATH}/italic.ttf')
-        self.FONT_LIGHT = load_font(f'{FONT_PATH}/light.ttf')
-        self.FONT_HEAVY = load_font(f'{FONT_PATH}/heavy.ttf')
-        self.FONT_MONO = load_font(f'{FONT_PATH}/mono.ttf')
-        self.FONT_MONO_ITALIC = load_font(f'{FONT_PATH}/mono-italic.ttf')
+        # Fonts for menu system (loaded when first used).
+        self.FONT_PATH = self.ASSET_DIR / 'fonts'
 
         # Container for main menu objects.
         self.frame = DirectFrame(frameColor=self.COLORS['none'],
@@ -66,8 +59,51 @@ class BaseUI:
                                  pos=(0, 0, 0),
                                  parent=self.base.aspect2d)
 
-        self.console = Console(self)
-        self.bar = Bar(self)
+        # Built when first used
+        self.__console = None
+        self.__bar = None
+
+    @property
+    def console(self):
+        if self.__console is None:
+            self.__console = Console(self)
+
+        return self.__console
+
+    @property
+    def bar(self):
+        if self.__bar is None:
+            self.__bar = Bar(self)
+            self.__bar.refresh()
+
+        return self.__bar
+
+    @property
+    def FONT_REGULAR(self):
+        return self.__font('regular')
+
+    @property
+    def FONT_ITALIC(self):
+        return self.__font('italic')
+
+    @property
+    def FONT_LIGHT(self):
+        return self.__font('light')
+
+    @property
+    def FONT_HEAVY(self):
+        return self.__font('heavy')
+
+    @property
+    def FONT_MONO(self):
+        return self.__font('mono')
+
+    @property
+    def FONT_MONO_ITALIC(self):
+        return self.__font('mono-italic')
+
+    def __font(self, name):
+        return self.base.assets.font(self.FONT_PATH / f'{name}.ttf')
 
     def set_mode(self, mode: Mode):
         self.mode = mode
@@ -75,7 +111,9 @@ class BaseUI:
         self.base.bindings.update()
 
     def refresh(self):
-        self.bar.refresh()
+        # The bar shows the latest state once built
+        if self.__bar is not None:
+            self.__bar.refresh()
 
     def exit(self):
         """Exits application entirely"""
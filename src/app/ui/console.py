@@ -79,6 +79,15 @@ class Console:
         self.output.setText(text)
         self.output.show()
 
+    def notify(self, text, error=False):
+        """Shows a message (e.g. progress) without disturbing user input."""
+        if error:
+            self.output['fg'] = self.base.COLORS['red']
+        else:
+            self.output['fg'] = self.base.COLORS['bg-dark']
+
+        self.output.setText(text)
+
     def log(self, text):
         """Logs a message to RoboViz Logger."""
         self.indicator.hide()
@@ -0,0 +1,56 @@
+"""Stands in for the user interface when RoboViz runs without a display.
+Nothing is drawn: command output is printed by the application instead."""
+
+import sys
+
+from .common import Mode
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+
+class HeadlessConsole:
+    """Console of a headless application (messages only go to the log)"""
+
+    def __init__(self, base):
+        self.app = base.base
+
+    def print(self, text, error=False):
+        pass
+
+    def notify(self, text, error=False):
+        pass
+
+    def log(self, text):
+        self.app.logger.log(text)
+
+    def clear(self):
+        pass
+
+
+class HeadlessBar:
+    """Bar of a headless application (progress is not shown)"""
+
+    def progress(self, text):
+        pass
+
+
+class HeadlessUI:
+    """User interface of a headless application"""
+
+    def __init__(self, base):
+        self.base = base
+        self.mode = Mode.INTERACTIVE
+        self.console = HeadlessConsole(self)
+        self.bar = HeadlessBar()
+
+    def set_mode(self, mode: Mode):
+        self.mode = mode
+
+    def refresh(self):
+        pass
+
+    def exit(self):
+        """Exits application entirely"""
+        sys.exit(0)
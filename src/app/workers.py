@@ -0,0 +1,89 @@
+"""Builds robot bodies in parallel using headless worker processes."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# panda3d imports
+from direct.showbase.Loader import Loader
+from panda3d.core import NodePath
+
+from ..robot import Robot
+from ..component import MATERIALS
+from .builder import BodyBuilder, Prototype, SCALE
+from .metrics import MetricsTable
+from .assets import AssetCache
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+
+class WorkerBase:
+    """Stands in for the application (ShowBase) inside a worker process.
+    Provides only what is needed to build robots, without a window.
+
+    Parameters
+    ---------
+    cache: Path -- Location of compiled models (shared with the app).
+    """
+
+    def __init__(self, cache):
+        self.loader = Loader(self)
+        self.assets = AssetCache(self.loader, cache)
+        self.metrics = MetricsTable(self.assets, SCALE)
+
+
+worker_base = None  # Set in each worker process on start-up
+
+
+def init_worker(cache):
+    """Initialises a worker process"""
+    global worker_base
+    worker_base = WorkerBase(cache)
+
+
+def build_body(data):
+    """Builds a robot body, returning it as a BAM stream with its bounds"""
+    robot = Robot(data, None)
+    prototype = BodyBuilder(worker_base, robot).build()
+    start, end = prototype.bounds
+
+    return prototype.path.encodeToBamStream(), tuple(start), tuple(end)
+
+
+class WorkerPool:
+    """
+    Pool of worker processes which build robot bodies. Each body is
+    returned as a serialised (BAM) subtree with its bounds, so the
+    application only has to decode it.
+
+    Parameters
+    ---------
+    size: int -- Number of worker processes.
+    cache: Path -- Location of compiled models.
+    """
+
+    def __init__(self, size, cache):
+        self.size = size
+        context = multiprocessing.get_context('spawn')
+        self.executor = ProcessPoolExecutor(size, mp_context=context,
+                                            initializer=init_worker,
+                                            initargs=(cache,))
+
+    def build(self, bodies):
+        """Builds a dict of bodies (body class -> robot data) in parallel,
+        returning a dict of body class -> Prototype"""
+        keys = list(bodies)
+        results = self.executor.map(build_body, [bodies[k] for k in keys])
+
+        prototypes = {}
+        for key, (bam, start, end) in zip(keys, results):
+            path = NodePath.decodeFromBamStream(bam)
+            MATERIALS.share(path)
+            prototypes[key] = Prototype(path, (start, end))
+
+        return prototypes
+
+    def close(self):
+        """Stops all worker processes"""
+        self.executor.shutdown(cancel_futures=True)
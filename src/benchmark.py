@@ -0,0 +1,264 @@
+"""Benchmarks building the stress test environments. Each size is opened by
+a headless RoboViz process, so its time and peak memory are its own."""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import platform
+import tempfile
+import argparse
+import statistics
+import subprocess
+import numpy as np
+from pathlib import Path
+
+from .positions import save_binary
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+BASE_DIR = Path(__file__).parents[1]
+STRESS_DIR = BASE_DIR / 'config' / 'stress'
+
+# Robot data built by each suite of stress configs
+SUITES = {
+    'single': BASE_DIR / 'data' / 'cart.json',
+    'multiple': BASE_DIR / 'data' / 'multiple-robots.json',
+}
+
+# Spacing of each suite's grid of robots (as in its positions files)
+GRID_SPACING = {'single': 40, 'multiple': 60}
+
+REPEATS = 3  # Runs of each size
+TOLERANCE = 0.2  # Fraction slower/larger than the baseline allowed
+SCALING_LIMIT = 1.2  # Largest exponent of build time over robot count
+MIN_TIME = 0.05  # Builds faster than this (seconds) are too noisy to scale
+
+ADDED = re.compile(r'Added (\d+) Robot\(s\)')
+ERRORS = re.compile(r'(\d+) Errors')
+TIMING = re.compile(r'^\[(\d+\.\d+)s\]$', re.MULTILINE)
+
+# Provides command line help for user.
+parser = argparse.ArgumentParser(
+    description="Benchmarks building the RoboViz stress test environments.")
+parser.add_argument("-s", "--suites", metavar=(""), nargs='+',
+                    choices=list(SUITES), default=list(SUITES),
+                    help="stress config suites (single, multiple)")
+parser.add_argument("-n", "--sizes", metavar=(""), nargs='+', type=int,
+                    help="robot counts to run (by default all)",
+                    default=None)
+parser.add_argument("-r", "--repeats", metavar=(""), type=int,
+                    help="runs of each size", default=REPEATS)
+parser.add_argument("-o", "--output", metavar=(""),
+                    help="results file (.json)", default=None)
+parser.add_argument("-b", "--baseline", metavar=(""),
+                    help="results file to compare against", default=None)
+parser.add_argument("-t", "--tolerance", metavar=(""), type=float,
+                    help="fraction slower or larger than the baseline "
+                         "allowed", default=TOLERANCE)
+
+
+def cases(suites, sizes=None):
+    """Returns (suite, size, config, positions, data) for each stress config,
+    smallest first (positions is None if it has no positions file)"""
+    found = []
+    for suite in suites:
+        folder = STRESS_DIR / suite
+        for config in folder.glob('config*.txt'):
+            size = int(config.stem[len('config'):])
+            positions = folder / f'positions{size}.txt'
+            if sizes is None or size in sizes:
+                found.append((suite, size, config,
+                              positions if positions.is_file() else None,
+                              SUITES[suite]))
+
+    return sorted(found, key=lambda case: (case[0], case[1]))
+
+
+def grid_positions(count, spacing):
+    """Returns the positions of count robots on a square grid centred on the
+    origin, laid out as the stress test positions files are"""
+    side = math.ceil(math.sqrt(count))
+    start = -(side // 2) * spacing
+    index = np.arange(count)
+    return np.column_stack((start + index // side * spacing,
+                            start + index % side * spacing,
+                            np.zeros(count)))
+
+
+def parse_output(text):
+    """Returns the robots added, collision/bounds errors and build time
+    (seconds) of a headless open command's output"""
+    start = max(text.find('> open'), 0)  # After any earlier commands
+    added = ADDED.search(text, start)
+    errors = ERRORS.search(text, start)
+    timing = TIMING.search(text, start)
+    return (int(added.group(1)) if added else 0,
+            int(errors.group(1)) if errors else 0,
+            float(timing.group(1)) if timing else None)
+
+
+def measure(config, positions, data, *options):
+    """Opens an environment in a headless process (given any other roboviz
+    options). Returns its output, the process' wall time (seconds) and peak
+    memory (MB), and exit status. Robots are always built, never drawn as
+    points, however many there are."""
+    command = [sys.executable, '-m', 'src.main', '-H', *options,
+               '--no-points', '-c', str(config), '-p', str(positions),
+               '-d', str(data)]
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=BASE_DIR, text=True,
+                               stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL)
+    output = process.stdout.read()
+    process.stdout.close()
+
+    # Peak memory of the process itself is only reported on POSIX
+    if not hasattr(os, 'wait4'):
+        process.wait()
+        return output, time.perf_counter() - start, None, process.returncode
+
+    _, status, usage = os.wait4(process.pid, 0)
+    seconds = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    # ru_maxrss is in kilobytes (bytes on macOS)
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return output, seconds, usage.ru_maxrss / scale, process.returncode
+
+
+def run_case(suite, size, config, positions, data, repeats):
+    """Returns the result of building a stress config repeatedly"""
+    times, totals, memory = [], [], []
+    robots = errors = status = 0
+    for _ in range(repeats):
+        output, seconds, rss, status = measure(config, positions, data)
+        robots, errors, build = parse_output(output)
+        if status or build is None:
+            break
+
+        times.append(build)
+        totals.append(seconds)
+        if rss is not None:
+            memory.append(rss)
+
+    return {
+        'suite': suite,
+        'size': size,
+        'robots': robots,
+        'errors': errors,
+        'status': status,
+        'times': times,
+        'time': statistics.median(times) if times else None,
+        'process': statistics.median(totals) if totals else None,
+        'rss': max(memory) if memory else None,
+    }
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Returns a message for each result slower, or using more memory, than
+    its baseline result by more than the tolerance"""
+    previous = {(r['suite'], r['size']): r for r in baseline}
+    flags = []
+    for result in results:
+        old = previous.get((result['suite'], result['size']))
+        if old is None or result['time'] is None:
+            continue  # Failed runs are reported on their own
+
+        name = f'{result["suite"]} {result["size"]}'
+        for key, unit in (('time', 's'), ('rss', ' MB')):
+            if old.get(key) and result[key] is not None and \
+                    result[key] > old[key] * (1 + tolerance):
+                change = result[key] / old[key] - 1
+                flags.append(f'{name}: {key} {old[key]:.3f}{unit} -> '
+                             f'{result[key]:.3f}{unit} (+{change:.0%})')
+
+    return flags
+
+
+def scaling(results, limit=SCALING_LIMIT):
+    """Returns a message for each pair of consecutive sizes (of a suite)
+    whose build time grows faster than robots ** limit"""
+    flags = []
+    suites = {}
+    for result in results:
+        if result['time'] is not None and result['robots'] > 0:
+            suites.setdefault(result['suite'], []).append(result)
+
+    for suite, runs in suites.items():
+        runs = sorted(runs, key=lambda r: r['robots'])
+        for small, large in zip(runs, runs[1:]):
+            if small['time'] < MIN_TIME or large['robots'] == small['robots']:
+                continue
+
+            exponent = math.log(large['time'] / small['time']) / \
+                math.log(large['robots'] / small['robots'])
+            if exponent > limit:
+                flags.append(f'{suite} {small["size"]} -> {large["size"]}: '
+                             f'time grows as robots^{exponent:.2f}')
+
+    return flags
+
+
+def report(result):
+    """Returns a line summarising a result"""
+    name = f'{result["suite"]} {result["size"]}'
+    if result['time'] is None:
+        return f'{name}: ERROR: exited with status {result["status"]}'
+
+    rss = 'n/a' if result['rss'] is None else f'{result["rss"]:.1f} MB'
+    return (f'{name}: {result["robots"]} Robot(s) | '
+            f'Build: {result["time"]:.3f}s | '
+            f'Process: {result["process"]:.3f}s | '
+            f'Peak RSS: {rss}')
+
+
+def run():
+    """Runs the benchmarks, writing and comparing their results"""
+    args = parser.parse_args()
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for suite, size, config, positions, data in cases(args.suites,
+                                                          args.sizes):
+            # Sizes without a positions file are laid out on a grid
+            if positions is None:
+                positions = Path(directory) / f'{suite}{size}.bin'
+                save_binary(grid_positions(size, GRID_SPACING[suite]),
+                            positions)
+                print(f'{suite} {size}: No positions file, using a grid')
+
+            results.append(run_case(suite, size, config, positions, data,
+                                    max(args.repeats, 1)))
+            print(report(results[-1]), flush=True)
+
+    flags = [report(result) for result in results
+             if result['time'] is None]
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        flags += compare(results, baseline, args.tolerance)
+
+    warnings = scaling(results)
+    for flag in flags:
+        print(f'REGRESSION: {flag}')
+    for warning in warnings:
+        print(f'SUPERLINEAR: {warning}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': platform.python_version(),
+                       'platform': platform.platform(),
+                       'repeats': args.repeats,
+                       'results': results,
+                       'regressions': flags,
+                       'superlinear': warnings}, f, indent=2)
+
+    sys.exit(1 if flags else 0)
+
+
+if __name__ == '__main__':
+    run()
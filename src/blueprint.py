@@ -0,0 +1,129 @@
+"""Compiled (flat) representation of a robot body"""
+
+from collections import defaultdict
+
+from .component import ComponentTree
+from .component import CoreComponent, FixedBrick
+from .component import ActiveHinge, PassiveHinge
+from .component import ActiveWheel, PassiveWheel, ActiveWheg
+from .component import IrSensor, TouchSensor, LightSensor
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+# Component classes, indexed by type code (new types go last, so codes
+# stored in body classes stay the same)
+TYPES = (CoreComponent, FixedBrick, ActiveHinge, PassiveHinge, ActiveWheel,
+         PassiveWheel, IrSensor, TouchSensor, LightSensor, ActiveWheg)
+TYPE_CODES = {t.__name__: code for code, t in enumerate(TYPES)}
+
+
+class ComponentType:
+    """
+    Properties shared by every component of a type, read once from a
+    sample component rather than for each component built.
+
+    Parameters
+    ---------
+    cls: type -- The Component subclass.
+    """
+
+    def __init__(self, cls):
+        sample = cls({'id': cls.__name__, 'root': False, 'orientation': 0},
+                     None)
+        self.name = cls.__name__
+        self.model_path = sample.model_path
+        self.state = sample.state
+        self.slots_in = sample.slots_in
+        self.has_slot = sample.has_slot
+        self.is_one_way = sample.is_one_way
+        self.is_terminal = sample.is_terminal
+
+
+COMPONENT_TYPES = tuple(ComponentType(t) for t in TYPES)
+
+
+class Blueprint:
+    """
+    A robot body compiled into flat arrays, one entry per component in
+    preorder (the order of ComponentTree.get), so the root is always first
+    and parents always precede their children. Compiled once per unique
+    body and shared by every robot built from it.
+
+    Parameters
+    ---------
+    body: dict -- The body of a robot (parsed from JSON).
+    """
+
+    def __init__(self, body: dict):
+        self.body = body
+        self.ids = []
+        self.types = []  # Type codes (index in TYPES)
+        self.parents = []  # Index of parent (-1 for the root)
+        self.slots = []  # Slot of parent (-1 for the root)
+        self.orientations = []  # Degrees
+        self.__parts = []
+        self.__compile(body)
+
+        self.size = len(self.ids)
+        self.index = {id: i for i, id in enumerate(self.ids)}
+
+    def __compile(self, body):
+        """Orders the components of a body (in linear time)."""
+        parts = {}
+        for part in body['part']:
+            if part['type'] in TYPE_CODES:
+                parts[part['id']] = part
+
+        children = defaultdict(dict)
+        for connection in body['connection']:
+            src = connection['src']
+            dest = connection['dest']
+            if src not in parts:
+                continue
+            elif dest in parts:
+                children[src][connection['srcSlot']] = dest
+            else:
+                print(f'No connection found for {src} -> {dest}')
+
+        root = next((id for id, p in parts.items() if p['root']), None)
+        if root is None:
+            return
+
+        seen = set()
+        stack = [(root, -1, -1)]
+        while stack:
+            id, parent, slot = stack.pop()
+            if id in seen:
+                continue
+
+            seen.add(id)
+            part = parts[id]
+            index = len(self.ids)
+            self.ids.append(id)
+            self.types.append(TYPE_CODES[part['type']])
+            self.parents.append(parent)
+            self.slots.append(slot)
+            self.orientations.append(part['orientation'] * 90)
+            self.__parts.append(part)
+
+            # Reversed, so children are popped in connection order
+            for slot, child in reversed(list(children[id].items())):
+                stack.append((child, index, slot))
+
+    def component_type(self, i) -> ComponentType:
+        """Returns the type of the i-th component"""
+        return COMPONENT_TYPES[self.types[i]]
+
+    def tree(self, robot) -> ComponentTree:
+        """Builds the body's components as a ComponentTree"""
+        components = []
+        for i, part in enumerate(self.__parts):
+            component = TYPES[self.types[i]](part, robot)
+            if self.parents[i] >= 0:
+                parent = components[self.parents[i]]
+                parent.children[self.slots[i]] = component
+            components.append(component)
+
+        return ComponentTree({c.id: c for c in components})
@@ -3,7 +3,7 @@
 # Imports for model rendering
 from pathlib import Path
 from collections import defaultdict
-from panda3d.core import Material
+from panda3d.core import Material, MaterialAttrib, RenderState
 
 # Helps with component colouring.
 from .util import Color
@@ -14,6 +14,86 @@ __date__ = "21 September 2022"
 
 BASE_DIR = Path(__file__).parents[1]
 COMPONENT_DIR = BASE_DIR / 'assets' / 'models' / 'components' / 'egg'
+STL_DIR = BASE_DIR / 'assets' / 'models' / 'components' / '.robogen-stl'
+
+
+class MaterialRegistry:
+    """
+    Stores a single Material (and RenderState) per component type and
+    colour, shared by every component of every robot. Sharing state lets
+    panda3d's state cache (and flattening) treat identical components as
+    the same.
+    """
+
+    def __init__(self):
+        self.materials = {}
+        self.states = {}
+        self.shared = {}  # Materials by value
+
+    def __make_material(self, color):
+        """Returns specifics for component rendering in panda3d model."""
+        c = Color(color)
+        m = Material()  # Class which handles rendering in panda3d
+
+        m.setShininess(8)
+        m.setRefractiveIndex(0.8)
+        m.setDiffuse(c.darken(0.9))
+        m.setEmission(c.darken(0.6))
+        m.setSpecular(c.lighten(1.2))
+
+        return m
+
+    def get(self, name, color):
+        """Returns the shared Material for a component type and colour."""
+        key = (name, tuple(color))
+        if key not in self.materials:
+            material = self.__make_material(color)
+            self.materials[key] = self.shared.setdefault(
+                self.__value(material), material)
+
+        return self.materials[key]
+
+    def __value(self, material):
+        """Returns a hashable representation of a material's properties"""
+        return (tuple(material.getDiffuse()), tuple(material.getEmission()),
+                tuple(material.getSpecular()), material.getShininess(),
+                material.getRefractiveIndex())
+
+    def share(self, path):
+        """Replaces materials under a node path (in node and Geom states)
+        with equal shared ones. Used for models read from BAM, which
+        creates new Materials."""
+        for node in [path] + list(path.findAllMatches('**')):
+            if node.hasMaterial():
+                node.setMaterial(self.__share(node.getMaterial()))
+
+            if node.node().isGeomNode():
+                geom_node = node.node()
+                for i in range(geom_node.getNumGeoms()):
+                    state = geom_node.getGeomState(i)
+                    if state.hasAttrib(MaterialAttrib):
+                        material = state.getAttrib(MaterialAttrib)
+                        if material.isOff():
+                            continue
+                        shared = self.__share(material.getMaterial())
+                        geom_node.setGeomState(i, state.setAttrib(
+                            MaterialAttrib.make(shared)))
+
+    def __share(self, material):
+        """Returns the shared Material equal to a material"""
+        return self.shared.setdefault(self.__value(material), material)
+
+    def state(self, name, color):
+        """Returns the shared RenderState for a component type and colour."""
+        key = (name, tuple(color))
+        if key not in self.states:
+            material = self.get(name, color)
+            self.states[key] = RenderState.make(MaterialAttrib.make(material))
+
+        return self.states[key]
+
+
+MATERIALS = MaterialRegistry()
 
 
 class ComponentTree:
@@ -38,31 +118,33 @@ class ComponentTree:
                 return component
         return None
 
-    def __get(self, node, list, parent=None, slot=None):
-        """Returns all child components of a specified parent as a list.
-        Searches recursively appending a list at each tree level."""
-        data = (node, parent, slot)
-        list.append(data)
+    def get(self):
+        """Returns (component, parent, slot) for all components as a list,
+        in preorder (each parent before its children)."""
+        if self.root is None:
+            return []
 
-        for slot, child in node.children.items():
-            self.__get(child, list, node, slot)
-        return list
+        components = []
+        stack = [(self.root, None, None)]
+        while stack:
+            node, parent, slot = stack.pop()
+            components.append((node, parent, slot))
 
-    def get(self):
-        """Public accesor for get method.
-        Returns all child components of a specified parent as a list."""
-        list = []
-        return self.__get(self.root, list)
+            # Reversed, so children are popped in order
+            for slot, child in reversed(list(node.children.items())):
+                stack.append((child, node, slot))
+
+        return components
 
     def find_node(self, node, id):
-        """Returns a specified component by searching tree recursively."""
-        if node.id == id:
-            return node
+        """Returns a specified component by searching the subtree of node."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.id == id:
+                return node
 
-        for _, child in node.children.items():
-            return_node = self.find_node(child, id)
-            if return_node:
-                return return_node
+            stack.extend(reversed(list(node.children.values())))
 
         return None
 
@@ -99,7 +181,6 @@ class Component:
         self.orientation = data['orientation'] * 90
         self.children = defaultdict(None)  # List of children.
         self.model_path = f'{COMPONENT_DIR}/{type(self).__name__}'  # Location of egg files.
-        self.model_size = None  # Set during build
 
     @property
     def slots_in(self):
@@ -110,7 +191,7 @@ class Component:
             return True
         elif 'Sensor' in name:
             return True
-        elif 'Wheel' in name:
+        elif 'Wheel' in name or 'Wheg' in name:
             return True
         else:
             return False
@@ -143,23 +224,19 @@ class Component:
             return True
         elif 'Sensor' in name:
             return True
-        elif 'Wheel' in name:
+        elif 'Wheel' in name or 'Wheg' in name:
             return True
         else:
             return False
 
     def get_material(self, robot):
-        """Returns specifics for component rendering in panda3d model."""
-        c = Color(self.color)
-        m = Material()  # Class which handles rendering in panda3d
+        """Returns the (shared) material used to render the component."""
+        return MATERIALS.get(type(self).__name__, self.color)
 
-        m.setShininess(8)
-        m.setRefractiveIndex(0.8)
-        m.setDiffuse(c.darken(0.9))
-        m.setEmission(c.darken(0.6))
-        m.setSpecular(c.lighten(1.2))
-
-        return m
+    @property
+    def state(self):
+        """Returns the (shared) render state of the component."""
+        return MATERIALS.state(type(self).__name__, self.color)
 
     def set_pos(self, x, y):
         """Sets x, y positions of a robot"""
@@ -276,6 +353,24 @@ class PassiveWheel(Component):
         self.TERMINAL = True
 
 
+class ActiveWheg(Component):
+    """Defines Active Rotation Wheg type component, which has no egg model
+    so is compiled from its Robogen STL mesh.
+    Inherits from Component class.
+
+    Parameters
+    ---------
+    robot: Robot -- The robot to which it is a member of.
+    """
+
+    def __init__(self, data, robot):
+        super().__init__(data)
+        self.model_path = f'{STL_DIR}/ActiveRotation_Wheg.stl'
+        self.color = (46, 62, 184, 100)  # Sets ActiveWheg to blue
+        self.material = super().get_material(robot)
+        self.TERMINAL = True
+
+
 # -- Sensors
 
 
@@ -323,5 +418,5 @@ class LightSensor(Component):
     def __init__(self, data, robot):
         super().__init__(data)
         self.color = (112, 28, 186, 100)  # Sets to purple
-        self.material = self.__get_material(robot)
+        self.material = super().get_material(robot)
         self.TERMINAL = True
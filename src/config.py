@@ -0,0 +1,67 @@
+"""Environment configuration and data directory handling, kept free of
+panda3d so query-only commands start without it."""
+
+import os
+from pathlib import Path
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+DATA_ENV = "ROBOVIZ_HOME"  # Environment Variable referring to Data Location
+DIR_NAME = ".roboviz"  # Default directory name
+ENV_DIR = 'environments'  # Location of saved environments (in data dir)
+
+
+def data_dir(create=True) -> Path:
+    """Returns the data location, creating it if needed."""
+    if DATA_ENV in os.environ:
+        root = Path(os.environ[DATA_ENV])
+        path = root / DIR_NAME
+    else:
+        path = Path.cwd() / DIR_NAME
+
+    path = path.expanduser()
+
+    if create and not path.is_dir():
+        try:
+            path.mkdir(exist_ok=True)
+            print(f'Created data directory: "{path}"')
+        except FileNotFoundError as e:
+            print(e)
+
+    return path
+
+
+def saved_environments(directory: Path):
+    """Returns the names of the environments saved in a data directory"""
+    envs = []
+    try:
+        for env in (directory / ENV_DIR).iterdir():
+            envs.append(env.stem)
+    except FileNotFoundError:
+        return envs
+
+    return envs
+
+
+class EnvironmentConfig:
+    """Holds attributes pertaining to the config spec provided"""
+
+    def __init__(self, path):
+        self.valid = True
+        self.__parse_config(path)
+
+    def __parse_config(self, path: Path):
+        """Parses config txt file defining model to be rendered"""
+        if path.is_file():
+            with path.open('r') as f:
+                data = f.read().split('\n')
+                try:
+                    self.x = float(data[0])
+                    self.y = float(data[1])
+                    self.num_robots = int(data[2])
+                except (IndexError, ValueError):
+                    self.valid = False
+        else:
+            self.valid = False
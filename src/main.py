@@ -2,9 +2,11 @@
 
 import sys
 import argparse
+from pathlib import Path
 
-# Imports application module
-from .app import App
+# The application (panda3d) and numpy are only imported when needed, so
+# query-only commands start quickly
+from .config import EnvironmentConfig, data_dir, saved_environments
 
 __author__ = "Jonty Doyle, Hamza Amir and Benjamin Chiddy"
 __email__ = "dyljon001@myuct.ac.za"
@@ -31,14 +33,98 @@ parser.add_argument("-L", "--load",
                     metavar=(""),
                     help="load specified saved model",
                     default=None)
-parser.add_argument("-C", "--cmd", metavar=(""),
-                    help="Run a (single) roboviz command remotely", default=None)
+parser.add_argument("-w", "--workers", metavar=(""), type=int,
+                    help="number of processes used to build robots",
+                    default=None)
+parser.add_argument("-n", "--points", metavar=(""), type=int, nargs='?',
+                    help="draw robots as points (at or above a robot count)",
+                    const=0, default=None)
+parser.add_argument("-N", "--no-points", action='store_true',
+                    help="never draw robots as points (overrides -n)",
+                    default=False)
+parser.add_argument("-P", "--convert", metavar=(""), nargs='+',
+                    help="convert a positions file (.txt) to binary (.bin)",
+                    default=None)
+parser.add_argument("-V", "--validate", action='store_true',
+                    help="check the config, position and data files "
+                         "(without rendering)", default=None)
+parser.add_argument("-C", "--cmd", metavar=(""), action='append',
+                    help="run a roboviz command (repeat for more)",
+                    default=None)
+parser.add_argument("-T", "--trace", metavar=(""),
+                    help="write a (Chrome) trace of the last build's "
+                         "phases on exit", default=None)
+parser.add_argument("-H", "--headless", action='store_true',
+                    help="run the commands without a display, printing "
+                         "their output (exits with 1 on any error)",
+                    default=False)
 
 
 def run():
     """Starts panda3d application starting with user interface"""
     args = parser.parse_args()
+    if args.convert:
+        if len(args.convert) > 2:
+            parser.error("--convert takes a positions file and output path")
+        convert(*args.convert)
+        return
+    elif args.list:
+        [print(env) for env in saved_environments(data_dir(create=False))]
+        return
+    elif args.validate:
+        if not (args.config and args.position and args.data):
+            parser.error("--validate takes a config, position and data file")
+        validate(Path(args.config), Path(args.position), Path(args.data))
+        return
+
+    from .app import App
+
     app = App(args)
+    if args.headless:
+        sys.exit(app.run_headless(args))
 
     app.handle_arguments(args)
     app.run()
+
+
+def convert(path, output=None):
+    """Converts a text positions file to the binary format"""
+    from . import positions
+
+    try:
+        output = positions.convert(path, output)
+    except OSError as e:
+        sys.exit(f'ERROR: {e}')
+
+    print(f'Converted {path} -> {output}')
+
+
+def validate(config_path, position_path, data_path):
+    """Checks an environment's files as building it would, without opening
+    a window. Exits with an error if the environment cannot be built."""
+    from .robot import RobotData  # Needs panda3d.core (but no window)
+
+    config = EnvironmentConfig(config_path)
+    if not config.valid:
+        sys.exit('ERROR: Invalid Environment Configuration')
+
+    data = RobotData(data_path, position_path)
+    if not data.valid:
+        sys.exit('ERROR: Invalid Robot .json File.')
+
+    classes = set()
+    records = data.records(config.num_robots)
+    for i, (robot, position, body_class) in enumerate(records):
+        if position is None:
+            sys.exit(f'ERROR: Position not-found/invalid [Robot ID: {i}]')
+        elif robot is None:
+            sys.exit(f'ERROR: Data not found for Robot ID: {i}')
+
+        classes.add(body_class)
+
+    print(f'Valid: {config.num_robots} Robot(s), '
+          f'{len(classes)} Body Class(es)')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,117 @@
+"""Reading, writing and converting robot position files"""
+
+import codecs
+import struct
+from pathlib import Path
+
+import numpy as np
+
+__author__ = "Jonty Doyle"
+__email__ = "dyljon001@myuct.ac.za"
+__date__ = "18 October 2026"
+
+# Binary positions format: an (optional) header of magic, robot count and
+# extents (min x, min y, max x, max y), followed by float32 x/y/z triples.
+MAGIC = b'RVP1'
+HEADER = struct.Struct('<4sI4f')
+BINARY_SUFFIX = '.bin'  # Given to converted files (not used to detect them)
+DTYPE = np.dtype('<f4')
+SAMPLE = 4096  # Bytes read to tell a headerless binary file from text
+
+
+def is_binary(path: Path):
+    """Checks whether a positions file is in the binary format, from its
+    content rather than its name: it starts with the magic header, or its
+    first bytes aren't (NUL free) UTF-8 text"""
+    with open(path, 'rb') as f:
+        sample = f.read(SAMPLE)
+
+    if sample[:len(MAGIC)] == MAGIC or b'\0' in sample:
+        return True
+
+    # Unless the whole file was read, a character may be cut off at the end
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        decoder.decode(sample, final=len(sample) < SAMPLE)
+    except UnicodeDecodeError:
+        return True
+
+    return False
+
+
+def load_text(path: Path):
+    """Parses a text positions file (one 'x y z' per line) into an array.
+    Lines which aren't valid positions are skipped."""
+    positions = []
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                x, y, z = line.split()
+                positions.append((float(x), float(y), float(z)))
+            except ValueError:
+                pass
+
+    return np.array(positions, dtype=DTYPE).reshape(-1, 3)
+
+
+def load_binary(path: Path):
+    """Memory maps a binary positions file as a read-only (n, 3) array
+    (None if its header counts more positions than it holds). No positions
+    are read until they are accessed."""
+    size = Path(path).stat().st_size
+
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+
+    if header[:len(MAGIC)] == MAGIC and len(header) == HEADER.size:
+        _, count, *_ = HEADER.unpack(header)
+        offset = HEADER.size
+    else:
+        count = size // (3 * DTYPE.itemsize)
+        offset = 0
+
+    if offset + count * 3 * DTYPE.itemsize > size:
+        return None
+    elif count == 0:
+        return np.empty((0, 3), dtype=DTYPE)
+
+    return np.memmap(path, dtype=DTYPE, mode='r', offset=offset,
+                     shape=(count, 3))
+
+
+def load(path: Path):
+    """Loads a positions file (text or binary) as an (n, 3) array (None if
+    it can't be read as either)"""
+    try:
+        if is_binary(path):
+            return load_binary(path)
+        else:
+            return load_text(path)
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+def save_binary(positions, path: Path):
+    """Writes an (n, 3) array of positions in the binary format"""
+    positions = np.ascontiguousarray(positions, dtype=DTYPE).reshape(-1, 3)
+
+    if len(positions) > 0:
+        start = positions[:, :2].min(axis=0)
+        end = positions[:, :2].max(axis=0)
+    else:
+        start = end = (0, 0)
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(positions), *start, *end))
+        f.write(positions.tobytes())
+
+
+def convert(path: Path, output=None):
+    """Converts a text positions file to the binary format, returning the
+    path of the binary file (by default alongside the text file)"""
+    path = Path(path)
+    if output is None:
+        output = path.with_suffix(BINARY_SUFFIX)
+
+    save_binary(load_text(path), output)
+    return Path(output)
@@ -1,14 +1,17 @@
 """Collection of classes which handle the creation of Robots"""
 
 from pathlib import Path
-import importlib
 import random
 import json
+import re
+import hashlib
+from collections import Counter, defaultdict
 from json import JSONDecodeError
 
 # panda3d imports
 from panda3d.core import Vec3
-from .component import ComponentTree
+from .blueprint import Blueprint
+from . import positions as position_files
 
 # Utils for robot customisation
 from .util import Color, print_err
@@ -18,6 +21,44 @@ __author__ = "Jonty Doyle & Hamza Amir"
 __email__ = "dyljon001@myuct.ac.za"
 __date__ = "21 September 2022"
 
+# Constants used when streaming large data files
+STREAM_MIN_SIZE = 8 * 1024 * 1024  # Larger data files are streamed
+CHUNK_SIZE = 64 * 1024
+SWARM_START = re.compile(r'"swarm"\s*:\s*\[')
+SEPARATOR = re.compile(r'[\s,]*')
+
+# Colours a robot may be given (RGBA)
+COLORS = {
+    'Blue': (46, 62, 184, 100),
+    'Green': (50, 168, 68, 100),
+    'Red': (168, 60, 50, 100),
+    'Orange': (245, 129, 47, 100),
+    'Purple': (112, 28, 186, 100),
+}
+
+
+def body_hash(body):
+    """Returns a hash of the structure of a robot body (component types,
+    orientations and connections). Ids are ignored, so bodies which are
+    built identically share a hash."""
+    types = {part['id']: (part['type'], part['orientation'])
+             for part in body['part']}
+    roots = [part['id'] for part in body['part'] if part.get('root')]
+    children = defaultdict(dict)
+    for connection in body['connection']:
+        children[connection['src']][connection['srcSlot']] = connection['dest']
+
+    def canonical(id, seen):
+        """Returns the structure of the subtree rooted at a component"""
+        seen.add(id)
+        slots = tuple((slot, canonical(child, seen))
+                      for slot, child in sorted(children[id].items())
+                      if child in types and child not in seen)
+        return types[id], slots
+
+    structure = canonical(roots[0], set()) if roots else None
+    return hashlib.sha1(repr(structure).encode()).hexdigest()
+
 
 class Robot:
     """
@@ -32,55 +73,36 @@ class Robot:
     ---------
     data: dict -- A dict of JSON decoded data, specified by Robogen
     position: tuple -- A tuple resembling its x,y point in the environment.
+    blueprint: Blueprint -- Compiled body shared with identical robots
+                            (compiled from data if not provided).
     """
 
-    def __init__(self, data, position):
+    def __init__(self, data, position, blueprint=None):
         try:
             self.id = str(data['id'])
             self.color = self.__pick_color()
             self.brain = data['brain']
-            self.components = self.__build_tree(data['body'])
+            self.body = data['body']
+            self.blueprint = blueprint or Blueprint(self.body)
             self.position = position
+            self.__components = None
         except TypeError:
             print_err(f'Incorrect data passed to Robot constructor: {data}')
 
-    def __build_tree(self, data):
-        """Returns a tree rooted at the CoreComponent based on input JSON"""
-
-        component_module = importlib.import_module('.component', package='src')
-        components = {}
-        for component in data['part']:
-            try:
-                ComponentType = getattr(component_module, component['type'])
-                c = ComponentType(component, self)
-                components[c.id] = c
-            except AttributeError:
-                pass
-
-        for id, component in components.items():
-            for connection in data['connection']:
-                src = connection["src"]
-                dest = connection["dest"]
-                slot = connection["srcSlot"]
-
-                if id == src:
-                    try:
-                        component.children[slot] = components[dest]
-                    except KeyError:
-                        print(f'No connection found for {src} -> {dest}')
+    @property
+    def components(self):
+        """Returns a tree rooted at the CoreComponent (built on first use)"""
+        if self.__components is None:
+            blueprint = self.blueprint
+            if blueprint.body is not self.body:
+                # Shared blueprint of an identical body, but with other ids
+                blueprint = Blueprint(self.body)
+            self.__components = blueprint.tree(self)
 
-        return ComponentTree(components)
+        return self.__components
 
     def __pick_color(self):
         """Randomly picks a color attribute to pass to components."""
-        COLORS = {
-            'Blue': (46, 62, 184, 100),
-            'Green': (50, 168, 68, 100),
-            'Red': (168, 60, 50, 100),
-            'Orange': (245, 129, 47, 100),
-            'Purple': (112, 28, 186, 100),
-        }
-
         options = list(COLORS.values())
         choice = random.choice(options)
         return Color(choice)
@@ -90,6 +112,56 @@ class Robot:
         return f'id: {self.id} \nparts: {self.components}'
 
 
+class SwarmStream:
+    """
+    Iterates over the robot records in the "swarm" array of a JSON file.
+    The file is read in chunks and each record decoded on its own, so only
+    one record is held in memory at a time.
+
+    Parameters
+    ---------
+    path: Path -- Path to data (.json) file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __iter__(self):
+        """Yields robot records, raising JSONDecodeError if malformed."""
+        decoder = json.JSONDecoder()
+
+        with open(self.path) as f:
+            buffer = f.read(CHUNK_SIZE)
+            match = SWARM_START.search(buffer)
+            while match is None:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    raise JSONDecodeError('No "swarm" array', buffer, 0)
+                buffer += chunk
+                match = SWARM_START.search(buffer)
+
+            index = match.end()
+            while True:
+                index = SEPARATOR.match(buffer, index).end()
+
+                if index < len(buffer) and buffer[index] == ']':
+                    return
+
+                try:
+                    record, end = decoder.raw_decode(buffer, index)
+                except JSONDecodeError:
+                    # Record is (probably) cut off by the end of the buffer
+                    chunk = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        raise
+                    buffer = buffer[index:] + chunk
+                    index = 0
+                    continue
+
+                yield record
+                index = end
+
+
 class RobotData:
     """
     Parses, stores and retrieves Robot data required for constructing a
@@ -99,41 +171,65 @@ class RobotData:
     ---------
     data_path: Path -- Path to data (.json) file.
     position_path: Path -- Path to position file.
+    stream: bool -- Stream robots from the data file rather than loading
+                    it whole (by default, only large swarm files).
     """
 
-    def __init__(self, data_path: Path, position_path: Path):
+    # Defaults for environments saved before streaming/body classes
+    stream = False
+    classes = None
+    __body_ids = None
+
+    def __init__(self, data_path: Path, position_path: Path, stream=None):
         self.valid = True
         self.data_path = data_path
         self.position_path = position_path
-        self.__robot_data = self.__load_data(data_path)
+        self.stream = self.__use_stream(data_path, stream)
+        self.classes = {}  # Body hash -> body class id
+
+        if self.stream:
+            self.__robot_data = None
+        else:
+            self.__robot_data = self.__load_data(data_path)
+            self.__intern()
+
         self.__position_data = self.__load_positions(position_path)
 
+    @property
+    def positions(self):
+        """Returns robot positions as an (n, 3) array (None if not found)"""
+        return self.__position_data
+
     @property
     def heterogenous(self):
         """Checks if model to be rendered is a swarm as defined in JSON file"""
-        if 'swarm' not in self.__robot_data:
+        if self.stream:
+            return False
+        elif 'swarm' not in self.__robot_data:
             return True
         else:
             return False
 
     def __load_positions(self, path):
-        """Parses robots positions based on positions txt file"""
-        positions = []
+        """Loads robot positions from a text or (memory mapped) binary
+        positions file (None if not found or invalid)"""
         if path.is_file():
-            with path.open('r') as f:
-                data = f.read().split('\n')
+            return position_files.load(path)
         else:
             return None
 
-        for position in data:
-            try:
-                if len(position) != 0:
-                    x, y, z = tuple(position.split(' '))
-                    positions.append(Vec3(int(x), int(y), int(z)))
-            except ValueError:
-                pass
+    def __use_stream(self, path, stream):
+        """Checks whether a data file should be streamed (only files with a
+        swarm array can be)"""
+        if stream is False or not path.is_file():
+            return False
+        elif stream is None and path.stat().st_size < STREAM_MIN_SIZE:
+            return False
 
-        return positions
+        with path.open('r') as f:
+            head = f.read(CHUNK_SIZE)
+
+        return SWARM_START.search(head) is not None
 
     def __load_data(self, path):
         """Parses robot data from inputted JSON file"""
@@ -150,13 +246,104 @@ class RobotData:
 
         return data
 
+    def __iter_data(self):
+        """Yields the data of each robot in the data file once"""
+        if self.stream:
+            try:
+                yield from SwarmStream(self.data_path)
+            except JSONDecodeError:
+                self.valid = False
+        elif self.heterogenous:
+            yield self.__robot_data
+        else:
+            yield from self.__robot_data['swarm']
+
+    def __intern(self):
+        """Finds the body class of each robot in the data file, replacing
+        equal bodies (ids included) with a single shared body"""
+        self.__body_ids = []
+        bodies = {}
+        if not self.valid:
+            return
+
+        for data in self.__iter_data():
+            body_id = self.body_class(data)
+            # Bodies of a class may differ in ids, which brains refer to
+            key = json.dumps(data['body'], sort_keys=True)
+            data['body'] = bodies.setdefault(key, data['body'])
+            self.__body_ids.append(body_id)
+
+    def body_class(self, data):
+        """Returns the id of a robot's body class, shared by all robots
+        with a structurally identical body"""
+        if self.classes is None:
+            self.classes = {}
+
+        key = body_hash(data['body'])
+        return self.classes.setdefault(key, len(self.classes))
+
+    def __position(self, value):
+        """Returns the position of a robot (None if not found)"""
+        try:
+            return Vec3(*self.__position_data[value])
+        except (IndexError, TypeError):
+            return None
+
+    def records(self, count, repeat=True):
+        """Yields (data, position, body class) for each of the first count
+        robots, one at a time. If there is less robot data than count, the
+        data repeats (or stops if repeat is False)."""
+        if self.__body_ids is None and not self.stream:
+            self.__intern()
+
+        i = 0
+        while i < count:
+            j = -1
+            for j, data in enumerate(self.__iter_data()):
+                if self.stream:
+                    key = self.body_class(data)
+                else:
+                    key = self.__body_ids[j]
+
+                yield data, self.__position(i), key
+                i += 1
+                if i == count:
+                    return
+
+            if j < 0 or not self.valid:
+                yield None, self.__position(i), None
+                return
+            elif not repeat:
+                return
+
+    def bodies(self, count):
+        """Returns the distinct bodies (by body class) of the first count
+        robots, each paired with the data of a robot using it"""
+        bodies = {}
+        for data, _, key in self.records(count, repeat=False):
+            if data is not None:
+                bodies.setdefault(key, data)
+
+        return bodies
+
+    def class_counts(self, count):
+        """Returns the number of the first count robots in each body class"""
+        counts = Counter()
+        for data, _, key in self.records(count):
+            if data is not None:
+                counts[key] += 1
+
+        return counts
+
     def __getitem__(self, value):
         """Returns robot and its position from parsed inputs for rendering"""
+        if self.stream:
+            for data, position, _ in self.records(value + 1):
+                pass
+            return data, position
+
         if self.valid:
-            try:
-                position = self.__position_data[value]
-            except IndexError:
-                position = None
+            position = self.__position(value)
 
         if self.heterogenous:
             data = self.__robot_data
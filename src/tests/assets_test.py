@@ -0,0 +1,201 @@
+import json
+import shutil
+import numpy as np
+import pytest
+from pathlib import Path
+from direct.showbase.EventManagerGlobal import eventMgr
+from direct.showbase.Loader import Loader
+from panda3d.core import EventQueue, GeomEnums
+
+from ..app.assets import (AssetCache, compact_geom, primitive_indices,
+                          MESH_LEVELS)
+from ..app.geometry import box_node
+from ..app.metrics import MetricsTable, COMPONENT_DIR, METRICS_FILE
+from ..util import file_hash
+
+CUBE_PATH = Path("assets/models/terrain/egg/Cube.egg")
+STL_DIR = Path("assets/models/components/.robogen-stl")
+
+
+def make_cache(tmp_path):
+    return AssetCache(Loader(None), tmp_path / "cache")
+
+
+def process_events():
+    """Delivers queued events (e.g. finished loads), as each frame does"""
+    queue = EventQueue.getGlobalEventQueue()
+    while not queue.isQueueEmpty():
+        eventMgr.processEvent(queue.dequeueEvent())
+
+
+class TestCompactGeom:
+
+    def test_merges_duplicates(self):
+        bounds = np.array([[(0, 0, 0), (1, 1, 1)]] * 2)
+        geom = box_node("boxes", bounds).getGeom(0)
+        compact = compact_geom(geom)
+
+        rows = geom.getVertexData().getNumRows()
+        assert compact.getVertexData().getNumRows() == rows // 2
+
+        primitive = compact.getPrimitive(0)
+        assert primitive.getIndexType() == GeomEnums.NT_uint16
+        assert primitive.getNumVertices() == \
+            geom.getPrimitive(0).getNumVertices()
+        assert primitive_indices(primitive).max() < rows // 2
+
+    def test_same_triangles(self):
+        bounds = np.array([[(0, 0, 0), (1, 2, 3)], [(4, 4, 4), (5, 5, 5)]])
+        geom = box_node("boxes", bounds).getGeom(0)
+        compact = compact_geom(geom)
+
+        def triangles(geom):
+            data = geom.getVertexData()
+            stride = data.getFormat().getArray(0).getStride() // 4
+            rows = np.frombuffer(memoryview(data.getArray(0)), np.float32)
+            rows = rows.reshape(-1, stride)
+            indices = primitive_indices(geom.getPrimitive(0))
+            return rows[indices].reshape(-1, 3 * stride)
+
+        assert np.array_equal(triangles(geom), triangles(compact))
+
+
+class TestAssetCache:
+
+    def test_compiles_once(self, tmp_path):
+        cache = make_cache(tmp_path)
+        model = cache.load(CUBE_PATH.with_suffix(""))
+        path = cache.cache_path(CUBE_PATH.resolve())
+        assert path.is_file()
+        assert model.getTightBounds() is not None
+
+        # A new session uses the compiled model
+        modified = path.stat().st_mtime_ns
+        make_cache(tmp_path).load(CUBE_PATH)
+        assert path.stat().st_mtime_ns == modified
+
+    def test_optimised(self, tmp_path):
+        source = COMPONENT_DIR / "IrSensor.egg"
+        model = make_cache(tmp_path).load(source)
+        original = Loader(None).loadModel(str(source), noCache=True)
+        assert model.getTightBounds() == original.getTightBounds()
+
+        geoms = model.findAllMatches("**/+GeomNode")
+        assert geoms.getNumPaths() == 1
+        vertex_format = geoms[0].node().getGeom(0).getVertexData().getFormat()
+        names = [vertex_format.getColumn(i).getName().getName()
+                 for i in range(vertex_format.getNumColumns())]
+        assert names == ["vertex", "normal"]
+
+    def test_rebuilds_on_change(self, tmp_path):
+        source = tmp_path / "Cube.egg"
+        shutil.copy(CUBE_PATH, source)
+        cache = make_cache(tmp_path)
+        cache.load(source)
+        old = cache.cache_path(source)
+
+        with source.open("a") as f:
+            f.write("\n")
+        cache = make_cache(tmp_path)
+        cache.load(source)
+        new = cache.cache_path(source)
+
+        assert new != old and new.is_file() and not old.exists()
+
+    def test_levels(self, tmp_path):
+        cache = make_cache(tmp_path)
+        source = STL_DIR / "ActiveRotation_Wheg.stl"
+        full, decimated, box = (cache.load(source, level)
+                                for level in MESH_LEVELS)
+        assert cache.cache_path(source.resolve()).is_file()
+
+        def faces(path):
+            return path.node().getGeom(0).getPrimitive(0).getNumFaces()
+
+        assert faces(box) == 12
+        assert 12 < faces(decimated) < faces(full)
+        for a, b in zip(box.getTightBounds(), full.getTightBounds()):
+            assert a.almostEqual(b, 1e-4)
+
+    def test_stl_frame(self, tmp_path):
+        # Robogen meshes are turned into the frame (and size) of the eggs
+        cache = make_cache(tmp_path)
+        for name, stl in (("IrSensor", "IrSensor"),
+                          ("LightSensor", "LightSensor_External")):
+            start, end = cache.load(STL_DIR / f"{stl}.stl").getTightBounds()
+            egg_start, egg_end = cache.load(COMPONENT_DIR / name)\
+                .getTightBounds()
+            assert (end - start).almostEqual(egg_end - egg_start, 0.1)
+            assert (start + end).almostEqual((0, 0, 0), 1e-4)
+
+    def test_preload_wait(self, tmp_path):
+        cache = make_cache(tmp_path)
+        cache.preload([CUBE_PATH])
+        assert len(cache.pending) == 1
+
+        # Loading waits for the preload, which is then compiled
+        model = cache.load(CUBE_PATH)
+        assert model.getTightBounds() is not None
+        assert (cache.waits, cache.misses, cache.hits) == (1, 1, 0)
+        assert cache.pending == {}
+
+        # The preload's own callback is then ignored
+        process_events()
+        assert len(cache.models) == 1 and cache.misses == 1
+
+    def test_preload_callback(self, tmp_path):
+        make_cache(tmp_path).load(CUBE_PATH)
+        cache = make_cache(tmp_path)
+        cache.preload([CUBE_PATH, CUBE_PATH])
+        (request, cached, _), = cache.pending.values()
+        assert cached
+
+        request.result()
+        process_events()
+        assert cache.pending == {} and cache.hits == 1
+        assert cache.memory > 0
+
+        cache.load(CUBE_PATH)
+        assert cache.waits == 0 and cache.hits == 1
+
+    def test_font(self, tmp_path):
+        cache = make_cache(tmp_path)
+        path = Path("assets/fonts/light.ttf")
+        assert cache.fonts == {}
+        assert cache.font(path) is cache.font(path)
+        assert len(cache.fonts) == 1
+
+
+class TestMetricsTable:
+
+    def test_invalidated(self, tmp_path):
+        directory = tmp_path / "egg"
+        directory.mkdir()
+        source = directory / "IrSensor.egg"
+        shutil.copy(COMPONENT_DIR / source.name, source)
+        cache = make_cache(tmp_path)
+
+        size = MetricsTable(cache, 0.1, directory).get("IrSensor").size
+        stored = json.loads((directory / METRICS_FILE).read_text())
+        assert stored["IrSensor"]["hash"] == file_hash(source)
+        assert stored["IrSensor"]["scale"] == 0.1
+
+        # Unchanged metrics are read back without loading the model (a
+        # table without assets fails if it has to measure)
+        assert MetricsTable(None, 0.1, directory).get("IrSensor").size == \
+            size
+
+        # A new scale is measured again
+        scaled = MetricsTable(cache, 0.2, directory).get("IrSensor").size
+        assert scaled.almostEqual(size * 2, 1e-4)
+        with pytest.raises(AttributeError):
+            MetricsTable(None, 0.1, directory).get("IrSensor")
+
+        # As is a changed model
+        with source.open("a") as f:
+            f.write("\n")
+        with pytest.raises(AttributeError):
+            MetricsTable(None, 0.2, directory).get("IrSensor")
+        table = MetricsTable(cache, 0.2, directory)
+        assert table.get("IrSensor").size.almostEqual(scaled, 1e-4)
+        assert table.table["IrSensor"]["hash"] == file_hash(source)
@@ -0,0 +1,114 @@
+import json
+import numpy as np
+import pytest
+from pathlib import Path
+from panda3d.core import NodePath, Point3
+
+from ..robot import Robot
+from ..app.batch import StaticBatch, vertices, MERGE_VERTICES
+from ..app.builder import RobotModel
+from ..app.lod import LevelOfDetail, LEVELS
+from ..app.spatial import SpatialGrid, ScenePartition
+from ..app.workers import WorkerBase
+
+STARFISH_PATH = Path("data/starfish.json")
+POSITIONS = [(0, 0), (10, 0), (600, 600), (-600, 0)]
+
+
+@pytest.fixture(scope="module")
+def base(tmp_path_factory):
+    return WorkerBase(tmp_path_factory.mktemp("cache"))
+
+
+def make_batch(base, impostors=()):
+    """Batches a starfish at each position, returning the batch"""
+    with STARFISH_PATH.open() as f:
+        data = json.load(f)
+
+    partition = ScenePartition(SpatialGrid(1000, 1000, 100),
+                               NodePath('render'), divisions=8)
+    prototypes = {}
+    models = []
+    for i, (x, y) in enumerate(POSITIONS):
+        robot = Robot(dict(data, id=str(i)), Point3(x, y, 0))
+        models.append(RobotModel(base, robot, prototypes, 0))
+        partition.add(models[-1])
+
+    return StaticBatch(base, partition, models, LevelOfDetail(), impostors)
+
+
+def geoms(path):
+    """Counts the Geoms under a node"""
+    return sum(node.node().getNumGeoms()
+               for node in [path] + list(path.findAllMatches("**"))
+               if node.node().isGeomNode())
+
+
+def batched(batch):
+    """Returns whether each robot is drawn by the batch (not on its own)"""
+    return [not model.path.hasParent() for model in batch.robots]
+
+
+class TestStaticBatch:
+
+    def test_build(self, base):
+        batch = make_batch(base, impostors={0})
+        assert batch.size == 3
+        assert batched(batch) == [True] * 4
+        assert sorted(batch.counts) == [1, 1, 2]
+
+        for key, path in batch.blocks.items():
+            assert path.getParent() == batch.partition.node(key)
+            assert [child.getName() for child in path.getChildren()] == \
+                list(LEVELS)
+        assert batch.tiled_robots.tolist() == [True] * 4
+
+        # Robots sharing a block are as far as its centre
+        distances = batch.distances(np.array((5, 0, 0)))
+        assert distances[0] == distances[1] < distances[2]
+        assert distances[3] == pytest.approx(605, abs=1)
+
+    def test_levels(self, base):
+        batch = make_batch(base)
+        prototype = batch.robots[0].prototype
+        full, decimated = prototype.levels[:2]
+        assert vertices(full) > MERGE_VERTICES >= vertices(decimated)
+
+        # Full bodies are too large to merge, so are instanced
+        block = batch.blocks[batch.partition.region(0, 0)]
+        robots = block.getChild(0).findAllMatches('*/full')
+        assert len(robots) == 2
+        assert all(robot.node().this == full.node().this for robot in robots)
+        assert vertices(block.getChild(0)) == 2 * vertices(full)
+
+        # Decimated bodies are merged, drawn by fewer Geoms than apart
+        merged = block.getChild(1).find('merged')
+        assert geoms(merged) < 2 * geoms(decimated)
+        assert vertices(merged) == 2 * vertices(decimated)
+        assert not batch.tiled_robots.any()
+
+    def test_release_restore(self, base):
+        batch = make_batch(base)
+        batch.release()
+        assert batch.released
+        assert batched(batch) == [False] * 4
+        assert all(not path.hasParent() for path in batch.blocks.values())
+        for model in batch.robots:
+            region = batch.partition.region(model.position.x,
+                                            model.position.y)
+            assert model.path.getParent() == batch.partition.node(region)
+
+        batch.restore()
+        assert not batch.released
+        assert batched(batch) == [True] * 4
+        assert all(path.hasParent() for path in batch.blocks.values())
+
+    def test_remove(self, base):
+        batch = make_batch(base)
+        blocks = list(batch.blocks.values())
+        batch.remove()
+
+        assert batch.size == 0
+        assert batched(batch) == [False] * 4
+        assert all(path.isEmpty() for path in blocks)
+        assert batch.distances(np.zeros(3)).size == 0
@@ -0,0 +1,100 @@
+import json
+import pytest
+from pathlib import Path
+
+from ..blueprint import Blueprint, TYPES
+from ..robot import Robot
+
+DATA_PATH = Path("data")
+ROBOT_PATHS = [DATA_PATH / "starfish.json", DATA_PATH / "cart.json",
+               DATA_PATH / "tank.json", DATA_PATH / "robot.json"]
+
+
+def load(path):
+    with path.open() as f:
+        return json.load(f)
+
+
+def preorder(body):
+    """Reference (recursive) preorder of (id, parent id, slot)"""
+    connections = body["connection"]
+    root = next(p["id"] for p in body["part"] if p["root"])
+    order = []
+
+    def visit(id, parent, slot):
+        order.append((id, parent, slot))
+        for c in connections:
+            if c["src"] == id:
+                visit(c["dest"], id, c["srcSlot"])
+
+    visit(root, None, -1)
+    return order
+
+
+class TestBlueprint:
+
+    @pytest.mark.parametrize("path", ROBOT_PATHS)
+    def test_preorder(self, path):
+        body = load(path)["body"]
+        blueprint = Blueprint(body)
+        parents = [blueprint.ids[p] if p >= 0 else None
+                   for p in blueprint.parents]
+
+        assert list(zip(blueprint.ids, parents, blueprint.slots)) == \
+            preorder(body)
+
+    @pytest.mark.parametrize("path", ROBOT_PATHS)
+    def test_parts(self, path):
+        body = load(path)["body"]
+        blueprint = Blueprint(body)
+
+        for part in body["part"]:
+            i = blueprint.index[part["id"]]
+            assert TYPES[blueprint.types[i]].__name__ == part["type"]
+            assert blueprint.orientations[i] == part["orientation"] * 90
+            assert blueprint.parents[i] < i
+
+    def test_children(self):
+        blueprint = Blueprint(load(ROBOT_PATHS[0])["body"])
+        children = [j for j, parent in enumerate(blueprint.parents)
+                    if parent == 0]
+
+        assert len(children) == 4
+        assert len({blueprint.slots[j] for j in children}) == 4
+
+    def test_unknown_type(self):
+        body = load(ROBOT_PATHS[0])["body"]
+        body["part"][1]["type"] = "Unknown"
+        blueprint = Blueprint(body)
+
+        assert body["part"][1]["id"] not in blueprint.ids
+        assert blueprint.size < len(body["part"])
+
+
+class TestRobotTree:
+
+    @pytest.mark.parametrize("path", ROBOT_PATHS)
+    def test_matches_blueprint(self, path):
+        robot = Robot(load(path), None)
+        components = robot.components.get()
+
+        assert [c.id for c, _, _ in components] == robot.blueprint.ids
+        for i, (component, parent, slot) in enumerate(components):
+            if parent is not None:
+                assert parent.children[slot] is component
+                assert robot.blueprint.index[parent.id] == \
+                    robot.blueprint.parents[i]
+
+    def test_shared_blueprint(self):
+        data = load(ROBOT_PATHS[0])
+        other = json.loads(json.dumps(data))
+        for part in other["body"]["part"]:
+            part["id"] = "Other" + part["id"]
+        for connection in other["body"]["connection"]:
+            connection["src"] = "Other" + connection["src"]
+            connection["dest"] = "Other" + connection["dest"]
+
+        # Ids are the robot's own, even with a blueprint from another robot
+        robot = Robot(other, None, Robot(data, None).blueprint)
+        ids = [c.id for c, _, _ in robot.components.get()]
+        assert ids == ["Other" + id for id in robot.blueprint.ids]
@@ -0,0 +1,104 @@
+import copy
+import json
+import pickle
+from pathlib import Path
+
+from ..robot import RobotData, body_hash
+
+DATA_PATH = Path("data")
+POSITION_PATH = Path("config/100robots/positions.txt")
+
+
+def load_body(name):
+    with (DATA_PATH / name).open() as f:
+        return json.load(f)["body"]
+
+
+def rename(body, suffix):
+    """Returns a copy of body with every component id changed"""
+    body = copy.deepcopy(body)
+    for part in body["part"]:
+        part["id"] += suffix
+    for connection in body["connection"]:
+        connection["src"] += suffix
+        connection["dest"] += suffix
+    return body
+
+
+class TestBodyHash:
+
+    def test_ignores_ids(self):
+        body = load_body("starfish.json")
+        assert body_hash(body) == body_hash(rename(body, "-copy"))
+
+    def test_ignores_order(self):
+        body = load_body("starfish.json")
+        shuffled = copy.deepcopy(body)
+        shuffled["part"].reverse()
+        shuffled["connection"].reverse()
+        assert body_hash(body) == body_hash(shuffled)
+
+    def test_orientation(self):
+        body = load_body("starfish.json")
+        rotated = copy.deepcopy(body)
+        rotated["part"][-1]["orientation"] += 1
+        assert body_hash(body) != body_hash(rotated)
+
+    def test_topology(self):
+        body = load_body("starfish.json")
+        moved = copy.deepcopy(body)
+        moved["connection"][0]["srcSlot"] += 1
+        assert body_hash(body) != body_hash(moved)
+
+    def test_different_bodies(self):
+        assert body_hash(load_body("starfish.json")) != \
+            body_hash(load_body("cart.json"))
+
+
+class TestBodyClasses:
+
+    def test_heterogeneous(self):
+        data = RobotData(DATA_PATH / "Hetro-60robots.json", POSITION_PATH)
+        counts = data.class_counts(60)
+
+        assert len(counts) == 4
+        assert sum(counts.values()) == 60
+        assert set(data.bodies(60)) == set(counts)
+
+    def test_interned(self):
+        data = RobotData(DATA_PATH / "Hetro-60robots.json", POSITION_PATH)
+        bodies = {}
+        for robot, _, body_class in data.records(60):
+            key = json.dumps(robot["body"], sort_keys=True)
+            assert bodies.setdefault(key, robot["body"]) is robot["body"]
+
+    def test_interned_ids(self, tmp_path):
+        with (DATA_PATH / "Hetro-60robots.json").open() as f:
+            first = json.load(f)["swarm"][0]
+        renamed = dict(copy.deepcopy(first), id="renamed")
+        renamed["body"] = rename(first["body"], "-copy")
+        path = tmp_path / "renamed.json"
+        path.write_text(json.dumps({"swarm": [first, renamed]}))
+
+        data = RobotData(path, POSITION_PATH)
+        (a, _, a_class), (b, _, b_class) = data.records(2)
+        assert a_class == b_class  # Same shape, so one body class
+        assert a["body"] is not b["body"]
+        assert b["body"] == renamed["body"]  # Ids (used by brains) kept
+
+    def test_stream(self):
+        path = DATA_PATH / "multiHetrobots-60.json"
+        loaded = RobotData(path, POSITION_PATH, stream=False)
+        streamed = RobotData(path, POSITION_PATH, stream=True)
+        assert streamed.class_counts(100) == loaded.class_counts(100)
+
+    def test_saved_before_classes(self):
+        data = RobotData(DATA_PATH / "Hetro-60robots.json", POSITION_PATH)
+        expected = [c for _, _, c in data.records(60)]
+
+        # Environments saved before body classes lack their attributes
+        del data.classes
+        del data._RobotData__body_ids
+        data = pickle.loads(pickle.dumps(data))
+
+        assert [c for _, _, c in data.records(60)] == expected
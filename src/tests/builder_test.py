@@ -0,0 +1,67 @@
+import json
+from pathlib import Path
+
+from ..robot import Robot, RobotData
+from ..app.builder import BodyBuilder, RobotModel
+from ..app.workers import WorkerBase
+
+DATA_PATH = Path("data/Hetro-60robots.json")
+POSITION_PATH = Path("config/100robots/positions.txt")
+CART_PATH = Path("data/cart.json")
+
+
+class TestRobotModel:
+
+    def test_shared_prototype(self, tmp_path):
+        base = WorkerBase(tmp_path)
+        prototypes = {}
+        models = [RobotModel(base, Robot(data, position), prototypes, key)
+                  for data, position, key in
+                  RobotData(DATA_PATH, POSITION_PATH).records(8)]
+
+        classes = {model.body_class for model in models}
+        assert 1 < len(classes) < len(models)
+        assert set(prototypes) == classes
+
+        for model in models:
+            prototype = prototypes[model.body_class]
+            assert model.prototype is prototype
+
+            # Each robot is an instance of its body, not a copy
+            assert model.path.getNumChildren() == 1
+            assert model.path.getChild(0).node().this == \
+                prototype.path.node().this
+
+            # Bounds are the body's bounds, moved to the robot
+            offset = model.path.getPos()
+            for point, body in zip(model.bounds, prototype.bounds):
+                assert point.almostEqual(body + offset, 1e-4)
+
+        for key, prototype in prototypes.items():
+            count = sum(model.body_class == key for model in models)
+            assert prototype.path.node().getNumParents() == count
+
+
+class TestBodyBuilder:
+
+    def test_stl_component(self, tmp_path):
+        base = WorkerBase(tmp_path)
+        with CART_PATH.open() as f:
+            data = json.load(f)
+        wheel = BodyBuilder(base, Robot(data, None)).build()
+
+        wheels = [part for part in data["body"]["part"]
+                  if part["type"] == "ActiveWheel"]
+        for part in wheels:
+            part["type"] = "ActiveWheg"
+        wheg = BodyBuilder(base, Robot(data, None)).build()
+        boxes = [child.getName() for child in wheg.levels[2].getChildren()]
+        assert "ActiveWheg" in boxes and "ActiveWheel" not in boxes
+
+        # Whegs (compiled from STL) are mounted on the same faces as wheels
+        def face(body, id):
+            start, end = body.levels[0].find(id).getTightBounds()
+            return min(abs(start.x), abs(end.x))
+
+        for part in wheels:
+            assert abs(face(wheg, part["id"]) - face(wheel, part["id"])) < 0.1
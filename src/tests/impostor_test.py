@@ -0,0 +1,68 @@
+import json
+import numpy as np
+from pathlib import Path
+from panda3d.core import NodePath
+
+from ..robot import Robot
+from ..app.builder import BodyBuilder
+from ..app.geometry import sprite_node
+from ..app.impostor import (ImpostorAtlas, view_buckets, view_direction,
+                            HEADINGS, PITCHES, VIEWS)
+from ..app.workers import WorkerBase
+
+STARFISH_PATH = Path("data/starfish.json")
+
+
+class TestViews:
+
+    def test_bucket_centres(self):
+        for heading in range(HEADINGS):
+            for pitch in range(PITCHES):
+                direction = tuple(view_direction(heading, pitch))
+                headings, pitches = view_buckets([direction])
+                assert (headings[0], pitches[0]) == (heading, pitch)
+
+    def test_buckets(self):
+        directions = [(1, 0.1, 0), (-1, -0.1, 0), (0, 0, 1), (1, 0, -1)]
+        headings, pitches = view_buckets(directions)
+        assert headings.tolist() == [0, HEADINGS // 2, 0, 0]
+        assert pitches.tolist() == [0, 0, PITCHES - 1, 0]
+
+
+class TestSprites:
+
+    def test_sprite_node(self):
+        centers = [(0, 0, 0), (10, 0, 5)]
+        node = sprite_node("sprites", centers, [1, 2], (1, 0, 0), (0, 0, 1),
+                           [(0, 0), (0.5, 0.5)], (0.5, 0.5))
+        geom = node.getGeom(0)
+        assert geom.getVertexData().getNumRows() == 2 * 4
+        assert geom.getPrimitive(0).getNumVertices() == 2 * 6
+
+        start, end = NodePath(node).getTightBounds()
+        assert start.almostEqual((-1, 0, -1))
+        assert end.almostEqual((12, 0, 7))
+
+
+class TestImpostorAtlas:
+
+    def test_no_window(self, tmp_path):
+        with STARFISH_PATH.open() as f:
+            robot = Robot(json.load(f), None)
+        base = WorkerBase(tmp_path)
+        base.win = None
+        prototype = BodyBuilder(base, robot).build()
+        atlas = ImpostorAtlas(base, {0: prototype})
+
+        assert atlas.index == {}
+        assert not atlas.texture.hasRamImage()
+
+    def test_uvs(self):
+        atlas = ImpostorAtlas.__new__(ImpostorAtlas)
+        atlas.columns, atlas.rows = 16, 8
+
+        # The second body, seen from above at heading 0
+        uvs = atlas.uvs([1], [(1, 0, 10)])
+        tile = VIEWS + (PITCHES - 1) * HEADINGS
+        expected = (tile % 16 / 16, tile // 16 / 8)
+        assert np.allclose(uvs[0], expected)
@@ -0,0 +1,93 @@
+import json
+import pytest
+from pathlib import Path
+from panda3d.core import NodePath
+
+from ..blueprint import Blueprint
+from ..robot import Robot
+from ..app.builder import BodyBuilder, SCALE
+from ..app.workers import WorkerBase
+from ..app.layout import Layout, SLOT_HEADINGS, SLOT_OFFSET, TOLERANCE
+from ..app.metrics import MetricsTable
+
+DATA_PATH = Path("data")
+ROBOT_PATHS = [DATA_PATH / "starfish.json", DATA_PATH / "cart.json",
+               DATA_PATH / "tank.json", DATA_PATH / "robot.json",
+               DATA_PATH / "minSensors.json"]
+
+# Metrics of every component type are stored, so no models are loaded
+metrics = MetricsTable(None, SCALE)
+
+
+def nested(blueprint):
+    """Reference layout: nested slot and component nodes (as previously
+    built), with panda3d composing the transforms"""
+    root = NodePath("body")
+    nodes, models, sizes = [], [], []
+    for i in range(blueprint.size):
+        component = blueprint.component_type(i)
+        size = metrics.get(component.name).size
+        node = NodePath(blueprint.ids[i])
+        parent = blueprint.parents[i]
+
+        if parent < 0:
+            node.reparentTo(root)
+        else:
+            parent_type = blueprint.component_type(parent)
+            slot = root.attachNewNode("slot")
+            slot.reparentTo(nodes[parent])
+            if parent_type.is_one_way:
+                slot.setH(0)
+            else:
+                slot.setH(SLOT_HEADINGS[blueprint.slots[i]] +
+                          blueprint.orientations[parent])
+
+            difference = (sizes[parent].x - size.x) / 2 - TOLERANCE
+            x = sizes[parent].x - difference
+            if (parent_type.has_slot and component.slots_in) or \
+                    (parent_type.slots_in and component.has_slot):
+                x -= SLOT_OFFSET
+            node.setX(x)
+            node.reparentTo(slot)
+
+        model = node.attachNewNode("model")
+        if not component.is_one_way:
+            model.setH(blueprint.orientations[i])
+
+        nodes.append(node)
+        models.append(model)
+        sizes.append(size)
+
+    return root, models
+
+
+class TestLayout:
+
+    @pytest.mark.parametrize("path", ROBOT_PATHS)
+    def test_matches_scene_graph(self, path):
+        with path.open() as f:
+            blueprint = Blueprint(json.load(f)["body"])
+        layout = Layout(blueprint, metrics)
+        root, models = nested(blueprint)
+
+        for i, model in enumerate(models):
+            node = NodePath("flat")
+            node.setPos(*layout.positions[i])
+            node.setH(layout.model_headings[i])
+
+            expected = model.getMat(root)
+            assert node.getMat().almostEqual(expected, 1e-4)
+
+    def test_empty(self):
+        layout = Layout(Blueprint({"part": [], "connection": []}), metrics)
+        assert layout.positions.shape == (0, 3)
+
+    @pytest.mark.parametrize("path", ROBOT_PATHS)
+    def test_bounds(self, path, tmp_path):
+        with path.open() as f:
+            robot = Robot(json.load(f), None)
+        prototype = BodyBuilder(WorkerBase(tmp_path), robot).build()
+
+        start, end = prototype.path.getTightBounds()
+        assert prototype.bounds[0].almostEqual(start, 1e-4)
+        assert prototype.bounds[1].almostEqual(end, 1e-4)
@@ -0,0 +1,94 @@
+import json
+import numpy as np
+from pathlib import Path
+from panda3d.core import NodePath
+
+from ..robot import Robot
+from ..app.builder import BodyBuilder
+from ..app.geometry import box_node, FACES, NORMALS
+from ..app.lod import LevelOfDetail, LEVELS
+from ..app.workers import WorkerBase
+
+STARFISH_PATH = Path("data/starfish.json")
+
+
+def faces(path):
+    """Counts the triangles drawn under a node"""
+    paths = [path] + list(path.findAllMatches("**/+GeomNode"))
+    return sum(geom.getPrimitive(0).getNumFaces()
+               for p in paths if p.node().isGeomNode()
+               for geom in p.node().getGeoms())
+
+
+class TestBoxGeometry:
+
+    def test_faces_outward(self):
+        for face, normal in zip(FACES, NORMALS[::4]):
+            assert np.array_equal(np.cross(face[1] - face[0],
+                                           face[2] - face[0]), normal)
+
+    def test_bounds(self):
+        boxes = [[(0, 0, 0), (1, 2, 3)], [(-5, 4, 1), (-4, 6, 2)]]
+        path = NodePath(box_node("boxes", boxes))
+        start, end = path.getTightBounds()
+
+        assert tuple(start) == (-5, 0, 0)
+        assert tuple(end) == (1, 6, 3)
+        assert path.node().getNumGeoms() == 1
+
+        geom = path.node().getGeom(0)
+        assert geom.getVertexData().getNumRows() == 2 * 24
+        assert geom.getPrimitive(0).getNumVertices() == 2 * 36
+
+
+class TestLevelOfDetail:
+
+    def test_levels(self):
+        detail = LevelOfDetail(10, 50, 100, 1000)
+        levels = detail.levels([0, 9.9, 10, 49, 50, 99, 100, 1000])
+        assert levels.tolist() == [0, 0, 1, 1, 2, 2, 3, 3]
+        assert detail.counts([5, 20, 60, 500, 5000]).tolist() == \
+            [1, 1, 1, 2, 0]
+
+    def test_impostor_levels(self):
+        detail = LevelOfDetail(10, 50, 100, 1000)
+        distances = [5, 500, 5000, 5000]
+        assert detail.levels(distances, True).tolist() == [0, 3, 4, 4]
+
+        tiled = [True, True, True, False]
+        assert detail.counts(distances, tiled).tolist() == [1, 0, 0, 2, 1]
+
+    def test_apply(self):
+        node = LevelOfDetail().make("lod")
+        detail = LevelOfDetail(20, 30, 40, 80)
+        detail.apply(node)
+
+        assert node.getNumSwitches() == len(LEVELS)
+        assert (node.getIn(1), node.getOut(1)) == (30, 20)
+        assert (node.getIn(2), node.getOut(2)) == (40, 30)
+        assert node.getOut(4) == node.getIn(4)  # Never switched in
+
+        detail.apply(node, impostor=True)
+        assert (node.getIn(3), node.getOut(3)) == (80, 40)
+        assert node.getOut(4) == 80
+
+    def test_body_levels(self, tmp_path):
+        with STARFISH_PATH.open() as f:
+            robot = Robot(json.load(f), None)
+        prototype = BodyBuilder(WorkerBase(tmp_path), robot).build()
+        full, decimated, boxes, box, impostor = prototype.levels
+
+        assert full.getNumChildren() == robot.blueprint.size
+        assert boxes.getNumChildren() == len(set(robot.blueprint.types))
+        assert impostor.getNumChildren() == 0
+        for level in (full, boxes, box):
+            start, end = level.getTightBounds()
+            assert start.almostEqual(prototype.bounds[0], 1e-4)
+            assert end.almostEqual(prototype.bounds[1], 1e-4)
+
+        # Decimated components lie within (and fill most of) the body
+        start, end = decimated.getTightBounds()
+        size = prototype.size.length()
+        assert (start - prototype.bounds[0]).length() < size / 10
+        assert (end - prototype.bounds[1]).length() < size / 10
+        assert faces(decimated) < faces(full) / 4
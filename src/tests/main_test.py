@@ -0,0 +1,189 @@
+import os
+import re
+import sys
+import subprocess
+import pytest
+from pathlib import Path
+
+from ..config import (EnvironmentConfig, data_dir, saved_environments,
+                      DATA_ENV, DIR_NAME, ENV_DIR)
+
+CONFIG_PATH = Path("config/100robots/config.txt")
+POSITION_PATH = Path("config/100robots/positions.txt")
+DATA_PATH = Path("data/Homogeneous-100bots.json")
+
+# Starts the app offscreen, then reports whether its UI was built
+APP_SCRIPT = """import argparse
+from panda3d.core import loadPrcFileData
+from src.app import App, HEADLESS_CONFIG
+loadPrcFileData('', HEADLESS_CONFIG)
+app = App(argparse.Namespace())
+print(app.ui._BaseUI__bar is None, app.ui._BaseUI__console is None)
+app.ui.refresh()
+print(app.ui._BaseUI__bar is None)
+"""
+
+# Builds an environment a robot per frame, cancelling it after ten frames
+BUILD_SCRIPT = """import argparse
+import sys
+from panda3d.core import loadPrcFileData
+from src.app import App, HEADLESS_CONFIG, environment
+loadPrcFileData('', HEADLESS_CONFIG)
+environment.FRAME_BUDGET = 0
+environment.INCREMENTAL_MIN_ROBOTS = 1
+app = App(argparse.Namespace())
+env = app.environment
+print(env.open(*sys.argv[1:]))
+for _ in range(10):
+    app.taskMgr.step()
+print(app.ui.console.output.getText())
+print(env.cancel())
+app.taskMgr.step()
+print(env.building, len(env.robots))
+print(env.cancel())
+"""
+
+# Batches an environment, then clears the region of its first robot
+CLEAR_SCRIPT = """import argparse
+import sys
+from panda3d.core import loadPrcFileData
+from src.app import App, HEADLESS_CONFIG
+loadPrcFileData('', HEADLESS_CONFIG)
+app = App(argparse.Namespace())
+env = app.environment
+env.batch('on')
+env.open(*sys.argv[1:])
+before = list(env.robots)
+position = before[0].position
+print(env.clear(str(position.x), str(position.y)))
+kept = {id(model) for model in env.robots}
+removed = [model for model in before if id(model) not in kept]
+found = [item for model in removed for item in env.grid.query(model.bounds)
+         if id(item) not in kept]
+print(len(before) - len(env.robots), len(removed), len(found))
+print(len(env.static_batch.robots) == len(env.impostors.positions) ==
+      len(env.robots), all(model.path.getTop() != app.render
+                           for model in removed))
+print(env.clear('x', 'y'))
+"""
+
+# Runs roboviz, then reports whether it imported panda3d's ShowBase
+SCRIPT = """import sys
+sys.argv[0] = 'roboviz'
+from src.main import run
+try:
+    run()
+finally:
+    print('direct.showbase' in sys.modules)
+"""
+
+
+def run_script(script, *args, home):
+    """Runs a script with the given arguments, returning its result"""
+    env = dict(os.environ, **{DATA_ENV: str(home)})
+    return subprocess.run([sys.executable, '-c', script, *map(str, args)],
+                          capture_output=True, text=True, env=env)
+
+
+def roboviz(*args, home):
+    """Runs roboviz with the given arguments, returning its result"""
+    return run_script(SCRIPT, *args, home=home)
+
+
+class TestMain:
+
+    def test_data_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(DATA_ENV, str(tmp_path))
+        assert data_dir(create=False) == tmp_path / DIR_NAME
+        assert not (tmp_path / DIR_NAME).exists()
+        assert data_dir().is_dir()
+
+    def test_list(self, tmp_path):
+        envs = tmp_path / DIR_NAME / ENV_DIR
+        envs.mkdir(parents=True)
+        (envs / 'swarm.pkl').touch()
+        assert saved_environments(tmp_path / DIR_NAME) == ['swarm']
+
+        result = roboviz('-l', home=tmp_path)
+        assert result.returncode == 0
+        assert result.stdout.split() == ['swarm', 'False']
+
+    def test_validate(self, tmp_path):
+        result = roboviz('-V', '-c', CONFIG_PATH, '-p', POSITION_PATH,
+                         '-d', DATA_PATH, home=tmp_path)
+        assert result.returncode == 0
+        assert result.stdout.startswith('Valid: 100 Robot(s)')
+        assert result.stdout.split()[-1] == 'False'
+
+    @pytest.mark.parametrize('robots, error', [
+        ('101', 'Position not-found/invalid [Robot ID: 100]'),
+        ('many', 'Invalid Environment Configuration')])
+    def test_validate_error(self, tmp_path, robots, error):
+        config = tmp_path / 'config.txt'
+        config.write_text(f'100\n100\n{robots}\n')
+        positions = tmp_path / 'positions.txt'
+        positions.write_text('0 0 0\n' * 100)
+
+        assert EnvironmentConfig(config).valid == (robots != 'many')
+
+        result = roboviz('-V', '-c', config, '-p', positions, '-d',
+                         DATA_PATH, home=tmp_path)
+        assert result.returncode == 1
+        assert error in result.stderr
+
+    def test_headless(self, tmp_path):
+        (tmp_path / DIR_NAME).mkdir()
+        result = roboviz('-H', '-c', CONFIG_PATH, '-p', POSITION_PATH,
+                         '-d', DATA_PATH, '-C', 'save swarm', '-C', 'list',
+                         home=tmp_path)
+        lines = result.stdout.split('\n')
+        assert result.returncode == 0
+        assert lines[0] == f'> open {CONFIG_PATH} {POSITION_PATH} ' \
+                           f'{DATA_PATH}'
+        assert lines[1].startswith('Added')
+        assert lines[3:5] == ['> save swarm', '"swarm" saved.']
+        assert lines[7] == 'Environments: swarm'
+
+        result = roboviz('-H', '-C', 'load swarm', '-C', 'load nothing',
+                         home=tmp_path)
+        assert result.returncode == 1
+        assert 'ERROR: Environment "nothing" not found.' in result.stdout
+
+    def test_lazy_ui(self, tmp_path):
+        result = run_script(APP_SCRIPT, home=tmp_path)
+        assert result.returncode == 0
+        assert result.stdout.split()[-3:] == ['True', 'True', 'True']
+
+    def test_clear_region(self, tmp_path):
+        (tmp_path / DIR_NAME).mkdir()
+        result = run_script(CLEAR_SCRIPT, CONFIG_PATH, POSITION_PATH,
+                            DATA_PATH, home=tmp_path)
+        assert result.returncode == 0
+
+        cleared, counts, rebuilt, invalid = result.stdout.strip().split('\n')
+        count = int(re.search(r'\[(\d+) Robot', cleared).group(1))
+        assert cleared.startswith('Region (') and count > 0
+
+        # Removed robots are no longer in the grid, batch or impostors
+        assert counts.split() == [str(count), str(count), '0']
+        assert rebuilt == 'True True'
+        assert invalid == 'ERROR: Invalid point "x y"'
+
+    def test_cancel_build(self, tmp_path):
+        (tmp_path / DIR_NAME).mkdir()
+        result = run_script(BUILD_SCRIPT, CONFIG_PATH, POSITION_PATH,
+                            DATA_PATH, home=tmp_path)
+        assert result.returncode == 0
+
+        started, progress, summary, state, again = \
+            result.stdout.strip().split('\n')
+        assert started.startswith('Building 100 Robot(s)')
+        assert progress.startswith('Building Robots [10/100]')
+
+        # Robots built before cancelling are kept (and no more are built)
+        added = int(re.search(r'Added (\d+) Robot', summary).group(1))
+        errors = re.search(r'(\d+) Errors', summary)
+        assert summary.startswith('Build Cancelled. Added')
+        assert added + (int(errors.group(1)) if errors else 0) == 10
+        assert state == f'False {added}'
+        assert again == 'ERROR: No build in progress.'
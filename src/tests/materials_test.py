@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+
+from ..robot import Robot
+from ..component import MaterialRegistry, PassiveHinge, TouchSensor
+
+STARFISH_PATH = Path("data/starfish.json")
+GREEN = (50, 168, 68, 100)
+RED = (168, 60, 50, 100)
+
+
+def components(data, id):
+    """Returns the components of a new robot, by type"""
+    robot = Robot(dict(data, id=id), None)
+    found = {}
+    for component, _, _ in robot.components.get():
+        found.setdefault(type(component).__name__, []).append(component)
+
+    return found
+
+
+class TestMaterialRegistry:
+
+    def test_shared_across_robots(self):
+        with STARFISH_PATH.open() as f:
+            data = json.load(f)
+        first, second = components(data, '0'), components(data, '1')
+        assert set(first) == set(second)
+
+        # Wrappers differ, so Materials and states are compared by address
+        for name in first:
+            built = first[name] + second[name]
+            assert len({c.get_material(None).this for c in built}) == 1
+            assert len({c.state.this for c in built}) == 1
+
+        core, brick = first['CoreComponent'][0], first['FixedBrick'][0]
+        assert core.color != brick.color
+        assert core.get_material(None).this != brick.get_material(None).this
+        assert core.state.this != brick.state.this
+
+    def test_colours(self):
+        registry = MaterialRegistry()
+        green = registry.get('CoreComponent', GREEN)
+        assert registry.get('CoreComponent', list(GREEN)).this == green.this
+        assert registry.state('CoreComponent', GREEN).this == \
+            registry.state('CoreComponent', GREEN).this
+
+        assert registry.get('CoreComponent', RED).this != green.this
+        assert registry.state('CoreComponent', RED).this != \
+            registry.state('CoreComponent', GREEN).this
+
+        # Types of the same colour share one Material by value
+        hinge = PassiveHinge({'id': 'hinge', 'root': False,
+                              'orientation': 0}, None)
+        sensor = TouchSensor({'id': 'sensor', 'root': False,
+                              'orientation': 0}, None)
+        assert hinge.color == sensor.color
+        assert registry.get('PassiveHinge', hinge.color).this == \
+            registry.get('TouchSensor', sensor.color).this
+        assert len(registry.materials) == 4 and len(registry.shared) == 3
@@ -0,0 +1,103 @@
+import numpy as np
+from pathlib import Path
+
+from ..app.geometry import mesh_node
+from ..app.mesh import decimate, plane_quadrics, read_stl, weld, STL_TRIANGLE
+
+STL_DIR = Path("assets/models/components/.robogen-stl")
+
+
+def grid_mesh(n):
+    """A flat square of 2 * n * n triangles"""
+    x, y = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing="ij")
+    vertices = np.column_stack([x.ravel(), y.ravel(), np.zeros(x.size)])
+    corner = (np.arange(n)[:, None] * (n + 1) + np.arange(n)).ravel()
+    triangles = np.concatenate([
+        np.column_stack([corner, corner + n + 1, corner + n + 2]),
+        np.column_stack([corner, corner + n + 2, corner + 1])])
+    return vertices, triangles
+
+
+class TestReadStl:
+
+    def test_binary(self, tmp_path):
+        triangles = np.zeros(2, dtype=STL_TRIANGLE)
+        triangles["vertices"][0] = [(0, 0, 0), (1, 0, 0), (0, 1, 0)]
+        triangles["vertices"][1] = [(1, 0, 0), (1, 1, 0), (0, 1, 0)]
+        path = tmp_path / "quad.stl"
+        path.write_bytes(bytes(80) + (2).to_bytes(4, "little") +
+                         triangles.tobytes())
+
+        vertices, indices = read_stl(path)
+        assert len(vertices) == 4 and indices.shape == (2, 3)
+        assert np.array_equal(vertices[indices], triangles["vertices"])
+
+    def test_ascii(self, tmp_path):
+        path = tmp_path / "triangle.stl"
+        path.write_text("solid t\nfacet normal 0 0 1\nouter loop\n"
+                        "vertex 0 0 0\nvertex 1 0 0\nvertex 0 1 0\n"
+                        "endloop\nendfacet\nendsolid t\n")
+
+        vertices, indices = read_stl(path)
+        assert len(vertices) == 3 and indices.shape == (1, 3)
+
+    def test_robogen(self):
+        vertices, triangles = read_stl(STL_DIR / "IrSensor.stl")
+        assert len(triangles) == 552
+        assert len(vertices) == len(np.unique(vertices, axis=0))
+
+
+class TestDecimate:
+
+    def test_weld(self):
+        vertices, indices = weld([[(0, 0, 0), (1, 0, 0), (0, 1, 0)],
+                                  [(1, 0, 0), (0, 1, 0), (1, 1, 0)]])
+        assert len(vertices) == 4
+        assert indices[0, 1] == indices[1, 0]
+
+    def test_plane_quadrics(self):
+        vertices, triangles = grid_mesh(1)
+        quadrics = plane_quadrics(vertices.astype(float), triangles)
+
+        # Points on the plane have no error, points off it the squared
+        # distance (weighted by area)
+        for point, error in (((5, 5, 0), 0), ((0, 0, 2), 4 * 0.5)):
+            p = np.append(point, 1)
+            assert np.allclose(p @ quadrics[0] @ p, error)
+
+    def test_flat_mesh(self):
+        vertices, triangles = grid_mesh(24)
+        new_vertices, new_triangles = decimate(vertices, triangles, 4)
+
+        assert 0 < len(new_triangles) < len(triangles) / 10
+        assert np.allclose(new_vertices[:, 2], 0)
+        assert new_triangles.max() < len(new_vertices)
+
+    def test_robogen(self):
+        vertices, triangles = read_stl(STL_DIR / "CoreComponent.stl")
+        new_vertices, new_triangles = decimate(vertices, triangles)
+
+        assert len(new_triangles) < len(triangles) / 10
+        size = np.ptp(vertices, axis=0)
+        assert np.allclose(new_vertices.min(axis=0), vertices.min(axis=0),
+                           atol=size.max() / 20)
+        assert np.allclose(new_vertices.max(axis=0), vertices.max(axis=0),
+                           atol=size.max() / 20)
+
+    def test_empty(self):
+        vertices, triangles = decimate(np.zeros((0, 3)), np.zeros((0, 3)))
+        assert len(triangles) == 0
+
+
+class TestMeshNode:
+
+    def test_flat_shaded(self):
+        vertices, triangles = grid_mesh(2)
+        geom = mesh_node("grid", vertices, triangles).getGeom(0)
+
+        # Coplanar triangles share their corners
+        assert geom.getVertexData().getNumRows() == len(vertices)
+        assert geom.getPrimitive(0).getNumFaces() == len(triangles)
+        rows = np.frombuffer(memoryview(geom.getVertexData().getArray(0)),
+                             np.float32).reshape(-1, 6)
+        assert np.allclose(rows[:, 3:], (0, 0, 1))
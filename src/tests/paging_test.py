@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+from panda3d.core import NodePath, Point3
+
+from ..app.spatial import SpatialGrid, ScenePartition
+from ..app.paging import Pager, RobotRecord, ROBOT_MEMORY
+
+
+def record(x, y):
+    position = Point3(x, y, 0)
+    return RobotRecord(f'robot-{x}-{y}', position, 0, (position, position))
+
+
+def build(record):
+    """Stands in for building a RobotModel"""
+    return SimpleNamespace(id=record.id, position=record.position,
+                           path=NodePath(record.id))
+
+
+def make_pager(radius=1000, robots=1000):
+    partition = ScenePartition(SpatialGrid(1000, 1000, 100),
+                               NodePath('render'), divisions=8)
+    budget = robots * ROBOT_MEMORY / (1024 * 1024)
+    pager = Pager(partition, build, radius, budget)
+    for x in (-900, -400, 0, 700):
+        for i in range(5):
+            pager.register(record(x + i, 0))
+
+    return pager
+
+
+class TestPager:
+
+    def test_register(self):
+        pager = make_pager()
+        assert pager.count == 20
+        assert len(pager.pages) == 4
+        assert pager.size == 0 and pager.models == []
+
+    def test_step_in_range(self):
+        pager = make_pager(radius=100)
+        pager.step(Point3(0, 0, 0), float('inf'))
+
+        key = pager.partition.region(0, 0)
+        assert list(pager.loaded) == [key]
+        assert pager.size == 5 and pager.changed
+        assert all(m.path.getParent() == pager.partition.node(key)
+                   for m in pager.models)
+
+    def test_step_until(self):
+        pager = make_pager()
+        pager.step(Point3(0, 0, 0), 0)
+        assert pager.size == 0
+
+        pager.step(Point3(0, 0, 0), float('inf'))
+        assert pager.size == pager.count
+
+    def test_evict_least_recent(self):
+        pager = make_pager(radius=100, robots=10)
+        first = pager.partition.region(-900, 0)
+        second = pager.partition.region(-400, 0)
+        pager.step(Point3(-900, 0, 0), float('inf'))
+        pager.step(Point3(-400, 0, 0), float('inf'))
+        assert list(pager.loaded) == [first, second]
+
+        # The least recently used page is evicted to stay in the budget
+        pager.step(Point3(700, 0, 0), float('inf'))
+        assert first not in pager.loaded and second in pager.loaded
+        assert pager.size == 10 and not pager.full
+
+    def test_budget_full(self):
+        pager = make_pager(robots=10)
+        pager.step(Point3(0, 0, 0), float('inf'))
+        assert pager.size <= 10 and pager.full
+
+    def test_clear(self):
+        pager = make_pager()
+        pager.step(Point3(0, 0, 0), float('inf'))
+        models = pager.models
+        pager.clear()
+
+        assert pager.size == 0 and pager.loaded == {}
+        assert all(m.path.isEmpty() for m in models)
+
+    def test_remove(self):
+        pager = make_pager()
+        pager.step(Point3(0, 0, 0), float('inf'))
+        key = pager.partition.region(0, 0)
+        models = pager.loaded[key]
+        records = pager.remove(key)
+
+        assert [r.id for r in records] == [m.id for m in models]
+        assert pager.count == 15 and pager.size == 15
+        assert key not in pager.pages and key not in pager.loaded
+        assert all(m.path.isEmpty() for m in models)
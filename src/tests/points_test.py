@@ -0,0 +1,37 @@
+import numpy as np
+from panda3d.core import NodePath
+
+from ..app.points import PointCloud, points_node, robot_colors, PALETTE
+
+
+class TestPoints:
+
+    def test_points_node(self):
+        positions = np.array([(0, 0, 0), (1, 2, 3), (-4, 5, 6)],
+                             dtype=np.float32)
+        colors = PALETTE[[0, 1, 2]]
+        node = points_node("points", positions, colors)
+
+        assert node.getNumGeoms() == 1
+        geom = node.getGeom(0)
+        assert geom.getPrimitive(0).getNumVertices() == 3
+
+        data = geom.getVertexData()
+        stored = np.frombuffer(memoryview(data.getArray(0)), np.float32)
+        assert np.array_equal(stored.reshape(-1, 3), positions)
+        stored = np.frombuffer(memoryview(data.getArray(1)), np.uint8)
+        assert np.array_equal(stored.reshape(-1, 4), colors)
+
+    def test_robot_colors(self):
+        colors = robot_colors(100, np.random.default_rng(0))
+        assert colors.shape == (100, 4)
+        assert all(tuple(c) in set(map(tuple, PALETTE)) for c in colors)
+
+    def test_point_cloud(self):
+        root = NodePath("root")
+        cloud = PointCloud(root, np.zeros((10, 3), dtype=np.float32))
+        assert cloud.size == 10
+        assert root.getNumChildren() == 1
+
+        cloud.remove()
+        assert root.getNumChildren() == 0
@@ -0,0 +1,87 @@
+import numpy as np
+from pathlib import Path
+
+from .. import positions
+from ..robot import RobotData
+
+POSITION_PATH = Path("config/100robots/positions.txt")
+DATA_PATH = Path("data/Homogeneous-100bots.json")
+
+
+class TestPositions:
+
+    def test_text_floats(self, tmp_path):
+        path = tmp_path / "positions.txt"
+        path.write_text("1 2 3\n1.5 -2.25 0\ninvalid\n\n4 5\n")
+
+        expected = [[1, 2, 3], [1.5, -2.25, 0]]
+        assert positions.load(path).tolist() == expected
+
+    def test_convert(self, tmp_path):
+        output = positions.convert(POSITION_PATH, tmp_path / "positions.bin")
+        binary = positions.load(output)
+        text = positions.load_text(POSITION_PATH)
+
+        assert isinstance(binary, np.memmap)
+        assert np.array_equal(binary, text)
+
+        with open(output, 'rb') as f:
+            magic, count, x0, y0, x1, y1 = positions.HEADER.unpack(
+                f.read(positions.HEADER.size))
+        assert (magic, count) == (positions.MAGIC, len(text))
+        assert (x0, y0) == tuple(text[:, :2].min(axis=0))
+        assert (x1, y1) == tuple(text[:, :2].max(axis=0))
+
+    def test_headerless(self, tmp_path):
+        path = tmp_path / "raw.bin"
+        data = np.arange(12, dtype=np.float32).reshape(4, 3)
+        path.write_bytes(data.tobytes())
+
+        assert positions.is_binary(path)
+        assert np.array_equal(positions.load(path), data)
+
+    def test_detect_content(self, tmp_path):
+        # Formats are told apart by content, whatever the file is named
+        binary = tmp_path / "positions.txt"
+        positions.convert(POSITION_PATH, binary)
+        text = tmp_path / "positions.bin"
+        text.write_text("1 2 3\n4 5 6\n")
+        raw = tmp_path / "raw"
+        raw.write_bytes(np.full((4, 3), 0.5, dtype=np.float32).tobytes())
+
+        assert positions.is_binary(binary) and positions.is_binary(raw)
+        assert not positions.is_binary(text)
+        assert np.array_equal(positions.load(binary),
+                              positions.load_text(POSITION_PATH))
+        assert positions.load(text).tolist() == [[1, 2, 3], [4, 5, 6]]
+        assert positions.load(raw).shape == (4, 3)
+
+    def test_undecodable(self, tmp_path):
+        path = tmp_path / "positions.txt"
+        path.write_bytes(b"1 2 3\n" * 1000 + b"\xff\xfe 4 5 6\n")
+        assert not positions.is_binary(path)
+        assert positions.load(path) is None
+
+    def test_truncated(self, tmp_path):
+        path = tmp_path / "truncated.bin"
+        positions.save_binary(np.ones((4, 3)), path)
+        path.write_bytes(path.read_bytes()[:-1])
+
+        assert positions.load(path) is None
+        data = RobotData(DATA_PATH, path)
+        assert data.positions is None
+        assert next(data.records(1))[1] is None
+
+    def test_empty(self, tmp_path):
+        path = tmp_path / "empty.bin"
+        positions.save_binary([], path)
+        assert positions.load(path).shape == (0, 3)
+
+    def test_robot_data(self, tmp_path):
+        output = positions.convert(POSITION_PATH, tmp_path / "positions.bin")
+        text = RobotData(DATA_PATH, POSITION_PATH)
+        binary = RobotData(DATA_PATH, output)
+
+        assert [p for _, p, _ in binary.records(150)] == \
+            [p for _, p, _ in text.records(150)]
+        assert binary[3] == text[3]
@@ -0,0 +1,57 @@
+import json
+
+from ..app import profiler as profiler_module
+from ..app.profiler import Profiler, BUILD
+
+
+class TestProfiler:
+
+    def test_phases(self):
+        profiler = Profiler()
+        profiler.add('Collision', 1.0, 1.5)
+        profiler.add('Parse', 0.0, 0.25)
+        profiler.add('Load', 0.0, 0.5)
+        profiler.add('Collision', 2.0, 2.25)
+        profiler.add('Custom', 3.0, 4.0)
+        profiler.add(BUILD, 0.0, 4.0)
+
+        # Known phases in order, then any others (but not the build)
+        assert profiler.phases == [('Load', 0.5, 1),
+                                   ('Parse', 0.25, 1),
+                                   ('Collision', 0.75, 2),
+                                   ('Custom', 1.0, 1)]
+        assert profiler.events == []
+
+        profiler.reset()
+        assert profiler.phases == []
+
+    def test_mark(self):
+        profiler = Profiler()
+        start = profiler.origin
+        end = profiler.mark('Robot', start)
+        assert end >= start
+        assert profiler.mark('Fetch', end) >= end
+        assert [phase for phase, _, _ in profiler.phases] == ['Robot',
+                                                              'Fetch']
+
+    def test_trace(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(profiler_module, 'MAX_EVENTS', 2)
+        profiler = Profiler()
+        profiler.tracing = True
+        profiler.reset(origin=10.0)
+        profiler.add('Robot', 10.5, 10.75, id='7')
+        profiler.add(BUILD, 10.0, 11.0)
+        profiler.add('Finish', 10.75, 11.0)  # Over the limit
+
+        assert profiler.dropped == 1
+        assert profiler.totals['Finish'] == 0.25
+
+        path = tmp_path / 'trace.json'
+        profiler.write(path)
+        trace = json.loads(path.read_text())
+        robot, build = trace['traceEvents']
+        assert robot['name'] == 'Robot' and robot['ph'] == 'X'
+        assert (robot['ts'], robot['dur']) == (500000, 250000)
+        assert robot['args'] == {'robot': '7'}
+        assert 'args' not in build
+        assert trace['otherData'] == {'dropped': 1}
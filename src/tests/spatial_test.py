@@ -0,0 +1,137 @@
+import random
+from types import SimpleNamespace
+from panda3d.core import NodePath, Point3
+from ..app.spatial import SpatialGrid, ScenePartition
+
+
+def overlap(a, b):
+    """Same AABB test as RobotModel.collides (edges touching overlap)"""
+    (a_start, a_end), (b_start, b_end) = a, b
+    x = a_end.x >= b_start.x and b_end.x >= a_start.x
+    y = a_end.y >= b_start.y and b_end.y >= a_start.y
+    return x and y
+
+
+def box(x, y, w, h):
+    return (Point3(x, y, 0), Point3(x + w, y + h, 1))
+
+
+class TestSpatialGrid:
+
+    def test_matches_brute_force(self):
+        random.seed(1)
+        grid = SpatialGrid(500, 500, 200)
+        placed = []
+
+        for i in range(400):
+            b = box(random.uniform(-550, 500), random.uniform(-550, 500),
+                    random.uniform(1, 60), random.uniform(1, 60))
+            expected = any(overlap(b, other) for other in placed)
+            found = any(overlap(b, other) for other in grid.query(b))
+            assert expected == found
+
+            if not expected:
+                placed.append(b)
+                grid.insert(b, b)
+
+    def test_touching_edges(self):
+        grid = SpatialGrid(100, 100, 4)
+        a = box(0, 0, grid.size, 10)
+        grid.insert(a, a)
+
+        b = box(grid.size, 0, 10, 10)
+        assert a in grid.query(b)
+
+    def test_query_unique(self):
+        grid = SpatialGrid(100, 100, 100)
+        a = box(-90, -90, 180, 180)
+        grid.insert(a, a)
+        assert grid.query(a) == [a]
+
+    def test_remove(self):
+        grid = SpatialGrid(100, 100, 10)
+        a = box(0, 0, 10, 10)
+        grid.insert(a, a)
+        grid.remove(a, a)
+        assert grid.query(a) == []
+
+
+class TestScenePartition:
+
+    def robot(self, x, y):
+        """Stands in for a RobotModel"""
+        return SimpleNamespace(position=Point3(x, y, 0),
+                               path=NodePath(f'robot-{x}-{y}'))
+
+    def test_regions(self):
+        grid = SpatialGrid(500, 500, 10000)
+        partition = ScenePartition(grid, NodePath('render'), divisions=16)
+
+        # Regions are whole blocks of grid cells
+        assert partition.size >= 1000 / 16
+        assert partition.size % grid.size == 0
+        for _ in range(100):
+            x, y = random.uniform(-500, 500), random.uniform(-500, 500)
+            i, j = grid.cell(x, y)
+            assert partition.region(x, y) == \
+                (i // partition.cells, j // partition.cells)
+
+    def test_add(self):
+        render = NodePath('render')
+        partition = ScenePartition(SpatialGrid(100, 100, 100), render)
+        robots = [self.robot(-90, -90), self.robot(-89, -89),
+                  self.robot(90, 90)]
+        for robot in robots:
+            partition.add(robot)
+
+        assert len(partition.regions) == 2
+        assert robots[0].path.getParent() == robots[1].path.getParent()
+        assert robots[0].path.getParent() != robots[2].path.getParent()
+
+    def test_hide_show(self):
+        partition = ScenePartition(SpatialGrid(100, 100, 100),
+                                   NodePath('render'))
+        near, far = self.robot(-90, -90), self.robot(90, 90)
+        partition.add(near)
+        partition.add(far)
+
+        partition.hide(partition.region(-90, -90))
+        assert near.path.isHidden() and not far.path.isHidden()
+
+        partition.show()
+        assert not near.path.isHidden()
+
+    def test_remove(self):
+        render = NodePath('render')
+        partition = ScenePartition(SpatialGrid(100, 100, 100), render)
+        near, far = self.robot(-90, -90), self.robot(90, 90)
+        partition.add(near)
+        partition.add(far)
+
+        # A region is removed with its robots, leaving the others
+        partition.remove(partition.region(-90, -90))
+        assert near.path.getTop() != render and far.path.getTop() == render
+        assert list(partition.regions) == [partition.region(90, 90)]
+
+        partition.remove()
+
+        assert render.getNumChildren() == 0
+        assert partition.regions == {}
+
+    def test_within(self):
+        partition = ScenePartition(SpatialGrid(100, 100, 100),
+                                   NodePath('render'), divisions=4)
+        for x in (-90, -40, 10, 60):
+            partition.add(self.robot(x, 10))
+
+        near = partition.region(10, 10)
+        (x_start, y_start), (x_end, y_end) = partition.bounds(near)
+        assert x_start <= 10 <= x_end and y_start <= 10 <= y_end
+
+        # Nearest first, and only regions which exist
+        regions = partition.within(10, 10, partition.size / 2)
+        assert regions[0] == near
+        assert set(regions) <= set(partition.regions)
+        assert partition.region(-90, 10) not in regions
+        assert partition.within(10, 10, 1000) and \
+            len(partition.within(10, 10, 1000)) == len(partition.regions)
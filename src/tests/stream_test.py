@@ -0,0 +1,59 @@
+import json
+import pytest
+from pathlib import Path
+from json import JSONDecodeError
+
+from .. import robot
+from ..robot import RobotData, SwarmStream
+
+DATA_PATH = Path("data")
+POSITION_PATH = Path("config/100robots/positions.txt")
+SWARM_PATHS = [DATA_PATH / "Homogeneous-100bots.json",
+               DATA_PATH / "Hetro-60robots.json",
+               DATA_PATH / "minimal/multiple-minimal.json"]
+
+
+class TestSwarmStream:
+
+    @pytest.mark.parametrize("path", SWARM_PATHS)
+    def test_matches_json(self, path, monkeypatch):
+        # Small chunks force records to be split across reads
+        monkeypatch.setattr(robot, "CHUNK_SIZE", 97)
+        with path.open() as f:
+            expected = json.load(f)["swarm"]
+
+        assert list(SwarmStream(path)) == expected
+
+    def test_no_swarm(self):
+        with pytest.raises(JSONDecodeError):
+            list(SwarmStream(DATA_PATH / "cart.json"))
+
+    def test_truncated(self, tmp_path):
+        path = tmp_path / "truncated.json"
+        text = (DATA_PATH / "minimal/multiple-minimal.json").read_text()
+        path.write_text(text[:len(text) // 2])
+
+        with pytest.raises(JSONDecodeError):
+            list(SwarmStream(path))
+
+
+class TestRobotDataStream:
+
+    @pytest.mark.parametrize("path", SWARM_PATHS)
+    def test_records_match(self, path):
+        loaded = RobotData(path, POSITION_PATH, stream=False)
+        streamed = RobotData(path, POSITION_PATH, stream=True)
+        assert streamed.stream and not loaded.stream
+
+        count = 150  # More robots than data, so records repeat
+        assert list(streamed.records(count)) == list(loaded.records(count))
+
+    def test_getitem(self):
+        path = SWARM_PATHS[1]
+        loaded = RobotData(path, POSITION_PATH, stream=False)
+        streamed = RobotData(path, POSITION_PATH, stream=True)
+        assert streamed[75] == loaded[75]
+
+    def test_single_not_streamed(self):
+        data = RobotData(DATA_PATH / "cart.json", POSITION_PATH, stream=True)
+        assert not data.stream
@@ -1,36 +1,105 @@
-from direct.showbase.ShowBase import ShowBase
-from panda3d.core import AntialiasAttrib
-from .ui.base import BaseUI
+import os
+import numpy as np
+import pytest
 
-from .app import App
+from .. import benchmark
+from ..benchmark import (cases, compare, grid_positions, measure,
+                         parse_output, scaling, report, GRID_SPACING)
+from ..positions import load_text
 
 
-class App(ShowBase):
+def result(size, time, rss=100.0, suite='single', robots=None):
+    """Returns a benchmark result of a size"""
+    return {'suite': suite, 'size': size, 'robots': robots or size,
+            'errors': 0, 'status': 0, 'times': [time], 'time': time,
+            'process': time + 0.25, 'rss': rss}
 
-    def __init__(self):
 
-        super().__init__(self)
-        self.bindings = Keybindings(self)
-        self.lights = Lights(self)
-        self.ui = BaseUI(self)
-        self.environment = Environment(self, self.ui)
-        self.camera = Camera(self)
+class TestBenchmark:
 
+    def test_cases(self):
+        found = cases(['single', 'multiple'])
+        assert ('multiple', 4) in [case[:2] for case in found]
+        assert [case[:2] for case in found] == \
+            sorted(case[:2] for case in found)
 
-        self.environment.load("../../config/stress/config100.txt",
-                              "../../config/stress/positions100.txt",
-                              "../../data/starfish.json")
-        print(self.environment.render_time)
-        self.environment.clear()
+        for suite, size, config, positions, data in found:
+            assert config.is_file()
+            assert positions is None or positions.is_file()
+            assert data == benchmark.SUITES[suite]
 
-        # Set defaults
-        self.__set_defaults()
+        # Sizes without a positions file are still run
+        assert ('single', 90000, None) in [case[:2] + case[3:4]
+                                           for case in found]
+        assert [case[1] for case in cases(['single'], [900, 7])] == [900]
 
-        # Set Keybindings
-        self.bindings.set(self.environment, self.camera, self.ui)
+    def test_grid_positions(self):
+        for suite, size, _, positions, _ in cases(['single', 'multiple'],
+                                                  [4, 100, 900]):
+            grid = grid_positions(size, GRID_SPACING[suite])
+            assert np.array_equal(grid, load_text(positions))
 
-    # Sets some defaults
-    def __set_defaults(self):
-        self.setBackgroundColor(0.9, 0.9, 0.9)
-        self.render.setShaderAuto()
-        self.render.setAntialias(AntialiasAttrib.MLine)  # Not sure
+        grid = grid_positions(10, 40)
+        assert len(grid) == 10 and len(np.unique(grid, axis=0)) == 10
+
+    def test_never_points(self):
+        # Even if points are asked for at a single robot
+        _, size, config, positions, data = cases(['multiple'], [4])[0]
+        output, _, _, status = measure(config, positions, data, '-n', '1')
+        assert status == 0
+        assert 'as Points' not in output
+        assert parse_output(output)[0] == size
+
+    def test_measure_without_wait4(self, monkeypatch):
+        monkeypatch.delattr(os, 'wait4', raising=False)
+        _, size, config, positions, data = cases(['multiple'], [4])[0]
+        output, seconds, rss, status = measure(config, positions, data)
+        assert status == 0 and rss is None
+        assert parse_output(output)[0] == size
+        assert seconds > 0
+
+    def test_parse_output(self):
+        output = ('> open config.txt positions.txt data.json\n'
+                  'Added 46 Robot(s) in 0.333s [54 Errors: View Log]\n'
+                  '[0.391s]\n')
+        assert parse_output(output) == (46, 54, 0.391)
+        assert parse_output('') == (0, 0, None)
+
+        # Only the open command is timed
+        assert parse_output('> points off\nPoints Off\n[0.004s]\n' +
+                            output) == (46, 54, 0.391)
+
+    def test_compare(self):
+        baseline = [result(100, 1.0), result(900, 2.0, rss=200)]
+        assert compare([result(100, 1.1), result(900, 2.0)], baseline) == []
+
+        flags = compare([result(100, 1.5), result(900, 2.0, rss=300),
+                         result(10000, 9.0)], baseline)
+        assert len(flags) == 2
+        assert flags[0].startswith('single 100: time 1.000s -> 1.500s')
+        assert flags[1].startswith('single 900: rss 200.000 MB')
+
+        # Failed runs (and sizes not in the baseline) are not compared
+        failed = dict(result(100, 1.0), time=None, rss=None, status=1)
+        assert compare([failed], baseline) == []
+
+        # Peak memory is unknown where it can't be measured
+        unmeasured = result(900, 2.0, rss=None)
+        assert compare([unmeasured], baseline) == []
+        assert report(unmeasured).endswith('Peak RSS: n/a')
+        assert compare([result(100, 1.5)], baseline, tolerance=1) == []
+
+    @pytest.mark.parametrize('times, flagged', [
+        ((0.1, 0.9, 10), 0),  # Linear
+        ((0.1, 0.2, 30), 1),  # Quadratic from 900 to 10000
+        ((0.01, 0.9, 10), 0),  # Too fast to tell from noise
+    ])
+    def test_scaling(self, times, flagged):
+        results = [result(size, time)
+                   for size, time in zip((100, 900, 10000), times)]
+        results.append(result(4, 0.001, suite='multiple'))
+
+        flags = scaling(results)
+        assert len(flags) == flagged
+        if flagged:
+            assert flags[0].startswith('single 900 -> 10000')
@@ -0,0 +1,80 @@
+import json
+import pytest
+from pathlib import Path
+from panda3d.core import MaterialAttrib
+
+from ..robot import Robot
+from ..component import MATERIALS
+from ..app.builder import BodyBuilder
+from ..app.workers import WorkerBase, WorkerPool
+
+ROBOT_PATHS = [Path("data/starfish.json"), Path("data/cart.json")]
+
+
+def materials(path):
+    """Returns the Materials used under a node, by node and Geom states
+    (compare them by .this, the address of the Material)"""
+    found = []
+    for node in [path] + list(path.findAllMatches("**")):
+        state = node.getState()
+        if state.hasAttrib(MaterialAttrib):
+            found.append(state.getAttrib(MaterialAttrib).getMaterial())
+
+        if node.node().isGeomNode():
+            geom_node = node.node()
+            for i in range(geom_node.getNumGeoms()):
+                state = geom_node.getGeomState(i)
+                if state.hasAttrib(MaterialAttrib):
+                    found.append(state.getAttrib(MaterialAttrib)
+                                 .getMaterial())
+
+    return found
+
+
+@pytest.fixture(scope="module")
+def pool(tmp_path_factory):
+    pool = WorkerPool(1, tmp_path_factory.mktemp("cache"))
+    yield pool
+    pool.close()
+
+
+class TestWorkerPool:
+
+    def test_matches_serial(self, pool, tmp_path):
+        bodies = {}
+        for i, path in enumerate(ROBOT_PATHS):
+            with path.open() as f:
+                bodies[i] = json.load(f)
+
+        built = pool.build(bodies)
+        base = WorkerBase(tmp_path)
+        for key, data in bodies.items():
+            serial = BodyBuilder(base, Robot(data, None)).build()
+            worker = built[key]
+
+            assert [tuple(p) for p in worker.bounds] == \
+                [tuple(p) for p in serial.bounds]
+            for level, expected in zip(worker.levels, serial.levels):
+                assert level.getName() == expected.getName()
+                assert level.getMat().almostEqual(expected.getMat(), 1e-5)
+
+                nodes = level.findAllMatches("**")
+                expected_nodes = expected.findAllMatches("**")
+                assert len(nodes) == len(expected_nodes)
+                for node, other in zip(nodes, expected_nodes):
+                    assert node.getName() == other.getName()
+                    assert node.getMat(level).almostEqual(
+                        other.getMat(expected), 1e-5)
+
+                if expected.getNumChildren():
+                    bounds = level.getTightBounds()
+                    expected_bounds = expected.getTightBounds()
+                    for point, other in zip(bounds, expected_bounds):
+                        assert point.almostEqual(other, 1e-4)
+
+                # Decoded Materials are replaced by the shared ones
+                shared = {m.this for m in materials(expected)}
+                assert {m.this for m in materials(level)} == shared
+
+            registered = {m.this for m in MATERIALS.shared.values()}
+            assert {m.this for m in materials(worker.path)} <= registered
@@ -1,6 +1,7 @@
 """Utils class for error handling and colour handling within models"""
 
 import sys
+import hashlib
 
 __author__ = "Jonty Doyle & Hamza Amir"
 __email__ = "dyljon001@myuct.ac.za"
@@ -13,6 +14,16 @@ def print_err(string):
     sys.exit(1)
 
 
+def file_hash(path):
+    """Returns a hex digest of a file's contents (to detect changes)"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
 class Color:
     """
     Helper Class to manipulate RGBA colors.